@@ -1,3 +1,4 @@
 from .ad import AD
 from .forwardmode import ForwardMode
 from .reversemode import ReverseMode
+from .trace import trace
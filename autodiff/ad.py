@@ -1,7 +1,11 @@
 # File       : ad.py
 # Description: Parent class AD that stores the function passed in by the user
 #              to perform automatic differentiation on
+import copy
 import inspect
+import time
+from collections import OrderedDict
+
 import numpy as np
 
 class AD:
@@ -11,7 +15,7 @@ class AD:
     _supported_scalars = (int, float)
     _supported_vectors = (np.ndarray, list)
 
-    def __init__(self, f, inputs=[]):
+    def __init__(self, f, inputs=[], cache_size=32):
         """
         Initialize the function of which the derivative will be calculated based on input 'f'.
 
@@ -22,10 +26,16 @@ class AD:
 
         inputs : array-like
             List of input variables.
+
+        cache_size : integer
+            Number of points whose results are memoized by get_f, get_f_prime and value_and_grad.
+            A cache size of 0 disables memoization.
         """
         self.f = f
         self.inputs = inputs
         self.jacobian = False
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
         
         # check if user passed in a list-type of functions, if True, set jacobian to true
         if isinstance(self.f, self._supported_vectors):
@@ -58,19 +68,70 @@ class AD:
             if type(i) != str:
                 raise TypeError(f"Unsupported type '{type(i)}' for input elements.")
 
+        # inspect the arguments of every function once, so that evaluations do not pay for reflection
+        functions = list(self.f) if self.jacobian else [self.f]
+        self._function_args = [inspect.getfullargspec(f)[0] for f in functions]
+
         # check if every argument in the function(s) are present in the input
-        if isinstance(self.f, self._supported_vectors):
-            for f in list(self.f):
-                function_args = inspect.getfullargspec(f)[0]
-                for arg in function_args:
-                    if arg not in self.inputs:
-                        raise ValueError(f"Argument '{arg}' is not in '{self.inputs}'.")
-        else:
-            function_args = inspect.getfullargspec(self.f)[0]
+        input_set = set(self.inputs)
+        for function_args in self._function_args:
             for arg in function_args:
-                if arg not in self.inputs:
+                if arg not in input_set:
                     raise ValueError(f"Argument '{arg}' is not in '{self.inputs}'.")
 
+        # store, for every function, the positions of the inputs passed to it as arguments
+        self._columns = []
+        for function_args in self._function_args:
+            arg_set = set(function_args)
+            self._columns.append([i for i, input in enumerate(self.inputs) if input in arg_set])
+
+    @staticmethod
+    def auto(f, inputs=[], x=None, cache_size=32):
+        """
+        Create the forward or reverse mode engine that computes the derivative(s) of 'f' most cheaply.
+
+        Parameters
+        ----------
+        f : array-like
+            Input with one or multiple functions.
+
+        inputs : array-like
+            List of input variables.
+
+        x : Vector, optional
+            If given, both engines are timed on a trial evaluation at 'x' and the faster one is returned.
+            Otherwise the engine is chosen from the shape of the Jacobian: forward mode propagates one
+            tangent per input and reverse mode sweeps back once per function, so forward mode is chosen
+            when there are at most as many inputs as functions.
+
+        cache_size : integer
+            Number of points whose results are memoized by the engine.
+
+        Returns
+        -------
+        ForwardMode or ReverseMode
+            The method returns the engine initialized with 'f' and 'inputs'.
+
+        """
+        # imported here as both engines are subclasses of AD
+        from autodiff.forwardmode import ForwardMode
+        from autodiff.reversemode import ReverseMode
+
+        forward = ForwardMode(f, inputs, cache_size)
+        reverse = ReverseMode(f, inputs, cache_size)
+
+        if x is None:
+            m = len(f) if forward.jacobian else 1
+            return forward if forward.n <= m else reverse
+
+        # time a trial evaluation of both engines; the results stay in their caches
+        timings = []
+        for engine in [forward, reverse]:
+            start = time.perf_counter()
+            engine._get_cached_results(x)
+            timings.append(time.perf_counter() - start)
+        return forward if timings[0] <= timings[1] else reverse
+
     def get_function(self):
         """
         Get the function.
@@ -106,7 +167,7 @@ class AD:
             This method also raises a `ValueError` if the dimension of input 'x' is not matched with the function(s).
 
         """
-        return self.get_results(x)[0]
+        return self._get_values(x)
     
     def get_f_prime(self, x):
         """
@@ -131,7 +192,181 @@ class AD:
             This method also raises a `ValueError` if the dimension of input 'x' is not matched with the function(s).
             
         """
-        return self.get_results(x)[1]
+        return self._get_cached_results(x)[1]
+
+    def get_results_batch_parallel(self, X, executor=None, chunks=None):
+        """
+        Compute the value(s) and the derivative(s) of the function(s) at every row of input 'X' on worker processes.
+
+        The points and the results are held in shared memory: every task evaluates a chunk of rows with
+        get_results_batch and writes its values and derivatives in place, so no result array is pickled.
+
+        Parameters
+        ----------
+        X : Matrix.
+            Array of shape (m, n) holding the m points at which the value(s) and derivative(s) of the function(s) are evaluated.
+
+        executor : concurrent.futures.Executor, optional
+            Executor running the tasks. Defaults to a ProcessPoolExecutor created for this call.
+            The engine is pickled to the workers, so the function(s) must be defined at the top level of a module.
+
+        chunks : integer, optional
+            Number of tasks the rows are split into. Defaults to four tasks per processor.
+
+        Returns
+        -------
+        f(X) and f'(X)
+            The method returns the results of get_results_batch for the whole batch.
+            
+        Raises
+        ------
+        TypeError
+            This method raises a `TypeError` if the type of input 'X' is not supported.
+            
+        ValueError
+            This method also raises a `ValueError` if input 'X' is not 2-dimensional.
+            
+        """
+        # worker processes are only needed for parallel batches
+        from concurrent.futures import ProcessPoolExecutor
+        from multiprocessing import shared_memory
+        
+        from autodiff.parallel import _default_workers, _evaluate_batch_chunk
+        
+        # check that X is of supported type
+        if not isinstance(X, self._supported_vectors):
+            raise TypeError(f"Unsupported type '{type(X)}'")
+            
+        # check that X is 2-dimensional
+        if len(np.shape(X)) != 2:
+            raise ValueError(f"Input variables should be 2-dimensional.")
+        
+        X = np.asarray(X, dtype = float)
+        m, n = X.shape
+        k = (len(self.f),) if self.jacobian else ()
+        shapes = [(m, n), (m, *k), (m, *k, n)]
+        
+        chunks = chunks or 4 * _default_workers()
+        bounds = np.linspace(0, m, min(chunks, m) + 1).astype(int)
+        
+        blocks = [shared_memory.SharedMemory(create = True, size = max(1, 8 * int(np.prod(shape)))) for shape in shapes]
+        arrays = [np.ndarray(shape, dtype = float, buffer = block.buf) for shape, block in zip(shapes, blocks)]
+        own_executor = executor is None
+        try:
+            arrays[0][:] = X
+            if own_executor:
+                executor = ProcessPoolExecutor()
+            names = [block.name for block in blocks]
+            futures = [executor.submit(_evaluate_batch_chunk, self, names, shapes, start, stop) for start, stop in zip(bounds[:-1], bounds[1:])]
+            for future in futures:
+                future.result()
+            vals, gradients = arrays[1].copy(), arrays[2].copy()
+        finally:
+            if own_executor and executor is not None:
+                executor.shutdown()
+            # release the views before closing the blocks they point into
+            arrays.clear()
+            for block in blocks:
+                block.close()
+                block.unlink()
+        
+        return vals, gradients
+
+    def __getstate__(self):
+        """
+        Drop the memoized results when the engine is pickled, e.g. to be sent to worker processes.
+        """
+        state = self.__dict__.copy()
+        state["_cache"] = OrderedDict()
+        return state
+
+    def value_and_grad(self, x):
+        """
+        Returns the value(s) and the derivative(s) of the function(s) at input 'x' as float arrays.
+
+        Parameters
+        ----------
+        x : Scalar, Vector. 
+            The point at which the value(s) and derivative(s) of the function(s) are evaluated. 
+
+        Returns
+        -------
+        f(x) and f'(x)
+            For one function, the method returns the value as a float and the gradient as an array of shape (n,).
+            For k functions, the method returns the values as an array of shape (k,) and the Jacobian as an array of shape (k, n).
+
+        Raises
+        ------
+        TypeError
+            This method raises a `TypeError` if the type of input 'x' is not supported.
+            
+        ValueError
+            This method also raises a `ValueError` if the dimension of input 'x' is not matched with the function(s).
+            
+        """
+        vals, gradients = self._get_cached_results(x)
+        if self.jacobian:
+            return np.array(list(vals), dtype = float), np.array(list(gradients), dtype = float)
+        return np.float64(vals), np.array(gradients, dtype = float)
+
+    def clear_cache(self):
+        """
+        Discard the memoized results, e.g. after the function(s) changed their behavior.
+        """
+        self._cache.clear()
+
+    def _get_cached_results(self, x):
+        """
+        Returns the results of get_results at input 'x', reusing the results of recently evaluated points.
+        """
+        # let get_results raise the errors for unsupported inputs
+        if self.cache_size <= 0 or not isinstance(x, self._supported_vectors) or len(np.shape(x)) != 1:
+            return self.get_results(x)
+
+        key = self._cache_key(x)
+        if key is None:
+            return self.get_results(x)
+        # points whose values are memoized without their derivatives are evaluated again
+        if key in self._cache and self._cache[key][1] is not None:
+            self._cache.move_to_end(key)
+            # callers own the arrays they receive, so changing them does not change the memoized results
+            return copy.deepcopy(self._cache[key])
+
+        results = self.get_results(x)
+        self._memoize(key, results)
+        return copy.deepcopy(results)
+
+    @staticmethod
+    def _cache_key(x):
+        """
+        Hashable key of the point 'x', or None if its elements are not real numbers.
+
+        The elements are converted to floats, so that e.g. 0-dimensional arrays give the same key as numbers.
+        """
+        try:
+            return tuple(np.asarray(x, dtype = float).tolist())
+        except (TypeError, ValueError):
+            return None
+
+    def _memoize(self, key, results):
+        """
+        Memoize the results at the point 'key', evicting the least recently used point.
+
+        The results are a pair of values and derivatives, where the derivatives are None if only the
+        values were evaluated.
+        """
+        self._cache[key] = results
+        self._cache.move_to_end(key)
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last = False)
+
+    def _get_values(self, x):
+        """
+        Returns the value(s) of the function(s) at input 'x'.
+
+        Engines that can evaluate the functions without differentiating them override this method.
+        """
+        return self._get_cached_results(x)[0]
 
     ### Square Root Function ###
     def sqrt(self):
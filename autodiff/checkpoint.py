@@ -0,0 +1,198 @@
+# File       : checkpoint.py
+# Description: Checkpointed segments of reverse mode graphs, which only keep the
+#              values at their boundaries and recompute their internal nodes
+#              when the backward sweep reaches them
+import weakref
+from math import comb
+
+from autodiff.node import Node
+from autodiff.static import StaticNode
+from autodiff.tape import TapeNode
+
+class Segment:
+    """Part of a computation whose nodes are discarded after the forward pass and rebuilt for the backward sweep."""
+
+    def __init__(self, fn, args):
+        """
+        Evaluate 'fn' on 'args' without keeping its graph.
+
+        Parameters
+        ----------
+        fn : function
+            Function of the segment returning a node or a tuple of nodes.
+
+        args : tuple
+            Nodes and constants the segment is applied to.
+
+        Raises
+        ------
+        TypeError
+            This method raises a `TypeError` if an argument is recorded on a tape or a static graph,
+            as their operations cannot be recomputed.
+
+        """
+        # check that the graph can be rebuilt from the values of the arguments
+        for arg in args:
+            if isinstance(arg, (StaticNode, TapeNode)):
+                raise TypeError(f"Unsupported type '{type(arg)}': segments can only be checkpointed on nodes.")
+
+        self.fn = fn
+        self.args = args
+        self.inputs = tuple(arg for arg in args if isinstance(arg, Node))
+
+        # the nodes built by fn are only referenced until their values are read
+        values = fn(*self._leaves())
+        self.single = not isinstance(values, (tuple, list))
+        values = [values] if self.single else values
+        outputs = [CheckpointNode(value.val if isinstance(value, Node) else value, None, None, self.inputs, self)
+            for value in values]
+
+        # the outputs reference the segment, so the segment only holds weak references back
+        self._outputs = [weakref.ref(output) for output in outputs]
+        self.outputs = outputs[0] if self.single else tuple(outputs)
+
+    def _leaves(self):
+        """
+        Create new leaves holding the values of the arguments of the segment.
+        """
+        return [Node(arg.val) if isinstance(arg, Node) else arg for arg in self.args]
+
+    def differentiate(self):
+        """
+        Rebuild the graph of the segment and set the local gradients of its outputs with respect to its inputs.
+        """
+        # imported here as reverse mode exposes the checkpoints
+        from autodiff.reversemode import ReverseMode
+
+        args = self._leaves()
+        leaves = [arg for arg in args if isinstance(arg, Node)]
+        values = self.fn(*args)
+        values = [values] if self.single else values
+
+        # the graphs of all outputs are ordered once and swept once per output
+        order = ReverseMode.topological_order(*[value for value in values if isinstance(value, Node)])
+        for output, value in zip(self._outputs, values):
+            output = output()
+            # outputs that are no longer referenced do not need gradients
+            if output is None:
+                continue
+            if not isinstance(value, Node):
+                output._gradients = ()
+                continue
+
+            gradients = {value: 1}
+            for parent in order:
+                v = gradients.get(parent)
+                # skip the nodes this output does not depend on
+                if v is None:
+                    continue
+                for child, gradient in parent.gradients:
+                    gradients[child] = gradients.get(child, 0) + v * gradient
+            output._gradients = tuple((node, gradients.get(leaf, 0)) for node, leaf in zip(self.inputs, leaves))
+
+
+class CheckpointNode(Node):
+    """Output of a checkpointed segment whose local gradients are computed by recomputing the segment.
+
+    Operations on the outputs of a segment create nodes of the same class without a segment.
+    """
+
+    __slots__ = ("segment", "__weakref__")
+
+    def __init__(self, val, gradients=(), op=None, operands=(), segment=None):
+        """
+        Initialize an output of a segment, or a node computed from outputs of segments.
+
+        Parameters
+        ----------
+        val : integer, float or numpy.ndarray
+            Value of the node.
+
+        gradients : tuple or None
+            Local gradients of the node.
+            Consists of tuples of (`child node`, `local gradient value`)
+            If None, they are computed from the segment or from `op` and `operands` when they are first needed.
+
+        op : string
+            Name of the operation that produced the node, or None for a leaf or an output of a segment.
+
+        operands : tuple
+            Nodes and constants the operation was applied to, or the inputs of the segment.
+
+        segment : Segment
+            Segment computing the node, or None if the node is computed by an operation.
+
+        """
+        super().__init__(val, gradients, op, operands)
+        self.segment = segment
+
+    @property
+    def gradients(self):
+        """
+        Local gradients of the output with respect to the inputs of its segment.
+
+        The segment is recomputed and differentiated when they are first needed.
+        """
+        gradients = self._gradients
+        if gradients is None:
+            # operations on the outputs of a segment are differentiated as usual
+            if self.segment is None:
+                return Node.gradients.fget(self)
+            self.segment.differentiate()
+            gradients = self._gradients
+        return gradients
+
+
+def checkpoint(fn):
+    """
+    Wrap 'fn' so that every call to it is evaluated as a checkpointed segment.
+    """
+    def checkpointed(*args):
+        return Segment(fn, args).outputs
+    return checkpointed
+
+
+def checkpoint_loop(step, steps, snapshots):
+    """
+    Build a function applying 'step' 'steps' times with a binomial checkpointing schedule.
+
+    With 's' snapshots and 't' recomputations of every step, up to C(s + t, s) steps can be
+    differentiated, so the smallest 't' reaching 'steps' is used.
+    """
+    repetitions = 0
+    while comb(snapshots + repetitions, snapshots) < steps:
+        repetitions += 1
+
+    def loop(*state):
+        single = len(state) == 1
+        state = _schedule(step, steps, snapshots, repetitions)(*state)
+        return state[0] if single else state
+    return loop
+
+
+def _schedule(step, steps, snapshots, repetitions):
+    """
+    Build a function applying 'step' 'steps' times, where 'steps' is at most C(snapshots + repetitions, snapshots).
+
+    Every snapshot checkpoints the longest first part that can be reversed with one repetition less,
+    and the remaining steps are scheduled with one snapshot less, as in the revolve algorithm.
+    """
+    def run(*state):
+        n, s, t = steps, snapshots, repetitions
+        # with a single repetition left, checkpointing every step would keep as many states as running them
+        while n > 1 and s > 0 and t > 1:
+            m = min(n - 1, comb(s + t - 1, s))
+            state = _as_tuple(checkpoint(_schedule(step, m, s, t - 1))(*state))
+            n -= m
+            s -= 1
+        for _ in range(n):
+            state = _as_tuple(step(*state))
+        return state
+    return run
+
+
+def _as_tuple(state):
+    """
+    Return the state returned by a step as a tuple.
+    """
+    return tuple(state) if isinstance(state, (tuple, list)) else (state,)
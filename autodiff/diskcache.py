@@ -0,0 +1,282 @@
+# File       : diskcache.py
+# Description: Persistent cache of compiled derivative kernels, shared by
+#              processes through a directory on disk
+import hashlib
+import os
+import sys
+import tempfile
+import types
+from contextlib import contextmanager
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:
+    # file locking is only available on POSIX systems; elsewhere writes are still atomic
+    fcntl = None
+
+# version of the format of the cached kernels, part of every key
+_FORMAT = 3
+
+class KernelCache:
+    """Directory of compiled kernels keyed by a hash of the function(s) and inputs they were traced from."""
+
+    def __init__(self, directory, max_bytes=64 * 2 ** 20):
+        """
+        Initialize a cache stored in 'directory', creating the directory if needed.
+
+        Parameters
+        ----------
+        directory : string
+            Directory holding one file per kernel.
+
+        max_bytes : integer
+            Total size of the kernels kept in the cache. The least recently used kernels are evicted
+            when a new kernel would exceed it.
+
+        Raises
+        ------
+        ValueError
+            This method raises a `ValueError` if 'max_bytes' is negative.
+
+        """
+        # check that the size is well defined
+        if max_bytes < 0:
+            raise ValueError("The size of the cache cannot be negative.")
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok = True)
+
+    def _path(self, key):
+        """
+        Path of the file holding the kernel with key 'key'.
+        """
+        return os.path.join(self.directory, f"kernel_{key}")
+
+    @contextmanager
+    def _lock(self):
+        """
+        Hold an exclusive lock on the cache, so that concurrent writers do not evict each other's kernels.
+        """
+        with open(os.path.join(self.directory, ".lock"), "a") as file:
+            if fcntl is not None:
+                fcntl.flock(file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(file, fcntl.LOCK_UN)
+
+    def get(self, key):
+        """
+        Read the kernel with key 'key'.
+
+        Returns
+        -------
+        bytes or None
+            The method returns the serialized kernel, or None if it is not cached.
+
+        """
+        path = self._path(key)
+        try:
+            with open(path, "rb") as file:
+                data = file.read()
+            # mark the kernel as recently used
+            os.utime(path)
+        except FileNotFoundError:
+            # the kernel was never written or has just been evicted
+            return None
+        return data
+
+    def put(self, key, data):
+        """
+        Store the serialized kernel 'data' with key 'key' and evict the least recently used kernels.
+
+        The kernel is written to a temporary file and renamed, so readers never see a partial kernel.
+        """
+        descriptor, temporary = tempfile.mkstemp(suffix = ".tmp", dir = self.directory)
+        try:
+            with os.fdopen(descriptor, "wb") as file:
+                file.write(data)
+            with self._lock():
+                os.replace(temporary, self._path(key))
+                self._evict()
+        except BaseException:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+            raise
+
+    def _evict(self):
+        """
+        Remove the least recently used kernels until the cache fits in 'max_bytes'.
+        """
+        kernels = []
+        for entry in os.scandir(self.directory):
+            if entry.name.startswith("kernel_"):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                kernels.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total = sum(size for _, size, _ in kernels)
+        for _, size, path in sorted(kernels):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+def kernel_key(f, inputs):
+    """
+    Hash the function(s) 'f' and the list of inputs into the key of their kernel.
+
+    The hash covers the bytecode, constants and argument names of every function and of the functions it
+    uses, the values captured by their closures and defaults, the global values they read, the source of autodiff
+    (including the rules of the tracing compiler), and the versions of NumPy and of Python, whose
+    bytecode differs between releases.
+
+    Only values whose content can be hashed in full are accepted: numbers, strings, arrays, containers of
+    such values, functions, and the modules, classes and functions of autodiff, NumPy and the standard
+    math and builtins modules. Any other value, e.g. an object or a user module, may change without
+    changing its name, so the function(s) cannot be cached.
+
+    Returns
+    -------
+    string or None
+        The function returns the hexadecimal SHA-256 digest of the function(s) and inputs, or None if
+        they cannot be cached.
+
+    """
+    digest = hashlib.sha256()
+    digest.update(f"{_FORMAT}:{sys.version_info[:2]}:{np.__version__}:{_library_digest()}".encode())
+    if not _hash_object(digest, list(inputs), set()):
+        return None
+    functions = f if isinstance(f, (list, tuple)) else [f]
+    visited = set()
+    for function in functions:
+        if not isinstance(function, types.FunctionType) or not _hash_object(digest, function, visited):
+            return None
+    return digest.hexdigest()
+
+def _library_digest():
+    """
+    Hash of the source of autodiff, including the rules of the tracing compiler, so that kernels
+    emitted by other versions are not reused.
+    """
+    global _LIBRARY_DIGEST
+    if _LIBRARY_DIGEST is None:
+        digest = hashlib.sha256()
+        directory = os.path.dirname(os.path.abspath(__file__))
+        for name in sorted(os.listdir(directory)):
+            if name.endswith(".py"):
+                digest.update(name.encode())
+                with open(os.path.join(directory, name), "rb") as file:
+                    digest.update(file.read())
+        _LIBRARY_DIGEST = digest.hexdigest()
+    return _LIBRARY_DIGEST
+
+_LIBRARY_DIGEST = None
+
+# modules whose modules, classes and functions are hashed by their name
+_NAMED_MODULES = ("autodiff", "numpy", "math", "builtins")
+
+def _is_named(obj):
+    """
+    Check whether 'obj' is a module, class or function of a module in `_NAMED_MODULES`.
+    """
+    if isinstance(obj, types.ModuleType):
+        name = obj.__name__
+    elif isinstance(obj, (type, types.BuiltinFunctionType, types.FunctionType, np.ufunc)):
+        name = getattr(obj, "__module__", None) or ""
+    else:
+        return False
+    return name.split(".")[0] in _NAMED_MODULES
+
+def _hash_object(digest, obj, visited):
+    """
+    Add the full content of 'obj' to 'digest', following the functions it refers to.
+
+    Returns
+    -------
+    boolean
+        The function returns False if 'obj' has no stable content to hash.
+
+    """
+    if obj is None or isinstance(obj, (bool, int, float, complex, str, bytes)):
+        digest.update(f"{type(obj).__name__}:{obj!r};".encode())
+    elif isinstance(obj, (np.ndarray, np.generic)):
+        # the repr of large arrays is truncated, so their buffer is hashed
+        if obj.dtype.hasobject:
+            return False
+        obj = np.ascontiguousarray(obj)
+        digest.update(f"ndarray:{obj.dtype.str}:{obj.shape};".encode())
+        digest.update(obj.tobytes())
+    elif isinstance(obj, (tuple, list, dict)):
+        # containers holding themselves have no finite content
+        if id(obj) in visited:
+            return False
+        visited.add(id(obj))
+        items = [item for pair in obj.items() for item in pair] if isinstance(obj, dict) else obj
+        digest.update(f"{type(obj).__name__}:{len(obj)};".encode())
+        hashed = all(_hash_object(digest, item, visited) for item in items)
+        visited.discard(id(obj))
+        return hashed
+    elif _is_named(obj):
+        digest.update(f"<{getattr(obj, '__module__', None)}.{getattr(obj, '__qualname__', obj.__name__)}>;".encode())
+    elif isinstance(obj, types.FunctionType):
+        if id(obj) in visited:
+            digest.update(b"<recursive>;")
+            return True
+        visited.add(id(obj))
+        _hash_code(digest, obj.__code__)
+        for value in obj.__defaults__ or ():
+            if not _hash_object(digest, value, visited):
+                return False
+        if not _hash_object(digest, obj.__kwdefaults__ or {}, visited):
+            return False
+        for cell in obj.__closure__ or ():
+            try:
+                contents = cell.cell_contents
+            except ValueError:
+                # the cell of a variable that is not assigned yet
+                digest.update(b"<empty>;")
+                continue
+            if not _hash_object(digest, contents, visited):
+                return False
+        # global values read by the function, e.g. module level constants and helpers
+        for name in _global_names(obj.__code__):
+            if name in obj.__globals__:
+                digest.update(f"{name}=".encode())
+                if not _hash_object(digest, obj.__globals__[name], visited):
+                    return False
+    else:
+        return False
+    return True
+
+def _hash_code(digest, code):
+    """
+    Add the bytecode, constants, names and arguments of a code object and of its nested code objects to 'digest'.
+    """
+    digest.update(code.co_code)
+    digest.update(repr(code.co_names).encode())
+    # the names of the arguments decide which inputs a function receives
+    digest.update(f"{code.co_argcount}:{code.co_kwonlyargcount}:{code.co_flags}:{code.co_varnames!r};".encode())
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            _hash_code(digest, const)
+        else:
+            digest.update(repr(const).encode())
+
+def _global_names(code):
+    """
+    Names read by a code object and its nested code objects, which may be global.
+    """
+    names = list(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            names.extend(_global_names(const))
+    return names
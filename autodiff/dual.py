@@ -6,6 +6,8 @@ import numpy as np
 class Dual():
     """Dual number implementation to perform basic arithmetic and geometric operations."""
     
+    __slots__ = ("real", "dual")
+
     _supported_scalars = (int, float)
     
     def __init__(self, real, dual = 1.0):
@@ -14,16 +16,29 @@ class Dual():
 
         Parameters
         ----------
-        real : integer or float
+        real : integer, float or numpy.ndarray
             Input number to initialize the real part of a dual number.
+            An array of values evaluates a batch of points at once.
             
-        dual : integer or float
+        dual : integer, float or numpy.ndarray
             Input number to initialize the dual part of a dual number.
+            A vector of tangents may be passed to propagate several directional
+            derivatives (e.g. a full gradient) through a single evaluation.
 
         """
         self.real = real
         self.dual = dual
     
+    @staticmethod
+    def _any(condition):
+        """
+        Check whether a condition on the real part holds, for a scalar or for any element of a batch.
+        """
+        # avoid the overhead of np.any for the common scalar case
+        if isinstance(condition, np.ndarray):
+            return condition.any()
+        return bool(condition)
+
     ### Elementary Functions ###
     def __add__(self, other):
         """
@@ -45,15 +60,14 @@ class Dual():
             This method raises a `TypeError` if the type of input number 'other' is not supported.
 
         """
-        # check if other is of a supported type
-        if not isinstance(other, (*self._supported_scalars, Dual)):
-            raise TypeError(f"Unsupported type '{type(other)}'")
-        if isinstance(other, self._supported_scalars):
-            # scalar
-            return Dual(other + self.real, self.dual)
-        else:
+        if isinstance(other, Dual):
             # dual
             return Dual(self.real + other.real, self.dual + other.dual)
+        # check if other is of a supported type
+        if not isinstance(other, self._supported_scalars):
+            raise TypeError(f"Unsupported type '{type(other)}'")
+        # scalar
+        return Dual(other + self.real, self.dual)
         
     def __radd__(self, other):
         """
@@ -92,15 +106,14 @@ class Dual():
             This method raises a `TypeError` if the type of input number other is not supported.
 
         """
-        # check if other is of a supported type
-        if not isinstance(other, (*self._supported_scalars, Dual)):
-            raise TypeError(f"Unsupported type '{type(other)}'")
-        if isinstance(other, self._supported_scalars):
-            # scalar
-            return Dual(self.real - other, self.dual)
-        else:
+        if isinstance(other, Dual):
             # dual
             return Dual(self.real - other.real, self.dual - other.dual)
+        # check if other is of a supported type
+        if not isinstance(other, self._supported_scalars):
+            raise TypeError(f"Unsupported type '{type(other)}'")
+        # scalar
+        return Dual(self.real - other, self.dual)
         
     def __rsub__(self, other):
         """
@@ -139,17 +152,16 @@ class Dual():
             This method raises a `TypeError` if the type of input number other is not supported.
 
         """
-        # check if other is of a supported type
-        if not isinstance(other, (*self._supported_scalars, Dual)):
-            raise TypeError(f"Unsupported type '{type(other)}'")
-        if isinstance(other, self._supported_scalars):
-            # scalar
-            return Dual(other * self.real, other * self.dual)
-        else:
+        if isinstance(other, Dual):
             # dual
             real = self.real * other.real
             dual = self.real * other.dual + self.dual * other.real
             return Dual(real, dual)
+        # check if other is of a supported type
+        if not isinstance(other, self._supported_scalars):
+            raise TypeError(f"Unsupported type '{type(other)}'")
+        # scalar
+        return Dual(other * self.real, other * self.dual)
         
     def __rmul__(self, other):
         """
@@ -234,19 +246,18 @@ class Dual():
             This method raises a `TypeError` if the type of input exponent other is not supported.
 
         """
-        # check if other is of supported type
-        if not isinstance(other, (*self._supported_scalars, Dual)):
-            raise TypeError(f"Unsupported type '{type(other)}'")
-        if isinstance(other, self._supported_scalars):
-            # scalar
-            real = self.real ** other
-            dual = self.dual * other * (self.real ** (other - 1))
-            return Dual(real, dual)
-        else:
+        if isinstance(other, Dual):
             # dual
             real = self.real ** other.real
             dual = other.real * self.dual * self.real ** (other.real - 1) + np.log(self.real) * other.dual * self.real ** other.real
             return Dual(real, dual)
+        # check if other is of supported type
+        if not isinstance(other, self._supported_scalars):
+            raise TypeError(f"Unsupported type '{type(other)}'")
+        # scalar
+        real = self.real ** other
+        dual = self.dual * other * (self.real ** (other - 1))
+        return Dual(real, dual)
         
     def __rpow__(self, other):
         """
@@ -276,6 +287,83 @@ class Dual():
         dual = (other ** self.real) * np.log(other) * self.dual
         return Dual(real, dual)
     
+    ### Comparison Operators ###
+    def __lt__(self, other):
+        """
+        Compare whether the real part of a dual number is less than a real number or the real part of another dual number.
+
+        Parameters
+        ----------
+        other : Dual, Scalar
+            Input number which is compared to a dual number.
+
+        Returns
+        -------
+        bool
+            The method returns the result of the comparison of the real parts.
+
+        """
+        if isinstance(other, Dual):
+            return self.real < other.real
+        return self.real < other
+
+    def __le__(self, other):
+        """
+        Compare whether the real part of a dual number is less than or equal to a real number or the real part of another dual number.
+
+        Parameters
+        ----------
+        other : Dual, Scalar
+            Input number which is compared to a dual number.
+
+        Returns
+        -------
+        bool
+            The method returns the result of the comparison of the real parts.
+
+        """
+        if isinstance(other, Dual):
+            return self.real <= other.real
+        return self.real <= other
+
+    def __gt__(self, other):
+        """
+        Compare whether the real part of a dual number is greater than a real number or the real part of another dual number.
+
+        Parameters
+        ----------
+        other : Dual, Scalar
+            Input number which is compared to a dual number.
+
+        Returns
+        -------
+        bool
+            The method returns the result of the comparison of the real parts.
+
+        """
+        if isinstance(other, Dual):
+            return self.real > other.real
+        return self.real > other
+
+    def __ge__(self, other):
+        """
+        Compare whether the real part of a dual number is greater than or equal to a real number or the real part of another dual number.
+
+        Parameters
+        ----------
+        other : Dual, Scalar
+            Input number which is compared to a dual number.
+
+        Returns
+        -------
+        bool
+            The method returns the result of the comparison of the real parts.
+
+        """
+        if isinstance(other, Dual):
+            return self.real >= other.real
+        return self.real >= other
+
     ### Square Root Function ###
     def sqrt(self):
         """
@@ -293,7 +381,7 @@ class Dual():
 
         """
         # check that the real component of the dual number is greater than or equal to 0.
-        if self.real < 0:
+        if self._any(self.real < 0):
             raise ValueError("Cannot square root: real part of dual number is lesser than 0.")
         return Dual(self.real ** (1/2), self.dual * ((1/2) * (self.real ** (-1/2))))
     
@@ -311,7 +399,7 @@ class Dual():
         return Dual(np.exp(self.real), np.exp(self.real) * self.dual)
     
     ### Logarithmic Function ###
-    def log(self, base):
+    def log(self, base=np.e):
         """
         Compute the logarithm to find the power to which the input base must be raised to yield the given dual number.
 
@@ -319,6 +407,7 @@ class Dual():
         ----------
         base : Dual, Scalar
             Input base which is raised to yield a given dual number.
+            Defaults to the natural logarithm, which is what np.log calls on a dual number.
 
         Returns
         -------
@@ -341,7 +430,7 @@ class Dual():
         if base <= 0:
             raise ValueError("Cannot log: Base is lesser than or equal to 0.")
         # check that the real component of the dual number is above 0.
-        if self.real <= 0:
+        if self._any(self.real <= 0):
             raise ValueError("Cannot log: Real part of the dual number is lesser than or equal to 0.")
         return Dual(np.log(self.real) / np.log(base), 1 / (np.log(base) * self.real) * self.dual)
     
@@ -412,7 +501,7 @@ class Dual():
 
         """
         # check that the real component of the dual number is between -1 and 1.
-        if self.real >= 1 or self.real <= -1:
+        if self._any((self.real >= 1) | (self.real <= -1)):
             raise ValueError("Cannot arcsin: Real part of dual number is not between -1 and 1.")
         return Dual(np.arcsin(self.real), self.dual / np.sqrt(1 - self.real ** 2))
     
@@ -432,7 +521,7 @@ class Dual():
 
         """
         # check that the real component of the dual number is between -1 and 1.
-        if self.real >= 1 or self.real <= -1:
+        if self._any((self.real >= 1) | (self.real <= -1)):
             raise ValueError("Cannot arccos: Real part of dual number is not between -1 and 1.")
         return Dual(np.arccos(self.real), - self.dual / np.sqrt(1 - self.real ** 2))
     
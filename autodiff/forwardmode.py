@@ -3,15 +3,69 @@
 #              uses the properties of dual numbers to return the value of
 #              f(x) and f'(x)
 
-import inspect
+from itertools import repeat
+
 import numpy as np
 
 from autodiff.ad import AD
 from autodiff.dual import Dual
+from autodiff.parallel import _default_workers, _evaluate_block
+from autodiff.taylor import Taylor
 
 class ForwardMode(AD):
     """Forward mode implementation based on dual number data structure."""
     
+    def __init__(self, f, inputs=[], cache_size=32, executor=None, workers=None):
+        """
+        Initialize the function of which the derivative will be calculated based on input 'f'.
+
+        Parameters
+        ----------
+        f : array-like
+            Input with one or multiple functions.
+
+        inputs : array-like
+            List of input variables.
+
+        cache_size : integer
+            Number of points whose results are memoized by get_f, get_f_prime and value_and_grad.
+            A cache size of 0 disables memoization.
+
+        executor : concurrent.futures.Executor, optional
+            If given, get_results distributes the functions, or blocks of input directions of a single
+            function, over the workers of the executor. With a ProcessPoolExecutor, the function(s) must
+            be picklable, i.e. defined with `def` at the top level of a module rather than as lambdas.
+
+        workers : integer, optional
+            Number of workers of the executor, which sets the number of tasks a single function is split
+            into. Defaults to the number of processors, `os.cpu_count()`.
+
+        Raises
+        ------
+        TypeError
+            This method raises a `TypeError` if the type of input 'workers' is not supported.
+
+        ValueError
+            This method raises a `ValueError` if 'workers' is smaller than 1.
+        """
+        super().__init__(f, inputs, cache_size)
+        # check that the number of workers is well defined
+        if workers is not None:
+            if not isinstance(workers, int):
+                raise TypeError(f"Unsupported type '{type(workers)}'")
+            if workers < 1:
+                raise ValueError("The number of workers should be at least 1.")
+        self.executor = executor
+        self.workers = _default_workers(workers)
+
+    def __getstate__(self):
+        """
+        Drop the executor when the engine is pickled, as executors cannot be sent to worker processes.
+        """
+        state = super().__getstate__()
+        state["executor"] = None
+        return state
+
     def get_results(self, x):
         """
         Compute the value(s) and the derivative(s) of the function(s) based on input 'x'.
@@ -49,80 +103,401 @@ class ForwardMode(AD):
         # convert x to a list
         x = list(x)
         
+        # distribute the evaluation over the workers of the executor
+        if self.executor is not None:
+            return self._get_results_parallel(x)
+        
+        # seed every input with its own unit tangent vector so that a single
+        # evaluation of a function carries its whole gradient in the dual part
+        seeds = np.eye(len(x))
+        
         # if there are multiple functions
         if self.jacobian:
-            for f in self.f:
-                # initialize arguments list
-                args = []
-                fduals = []
-                
-                # get the number of arguments
-                n = len(inspect.getfullargspec(f)[0])
-                        
-                # if the number of arguments is lesser than the number of inputs
-                if n < self.n:
-                    # get the function arguments
-                    function_args = inspect.getfullargspec(f)[0]
-                    
-                    # if the function argument is an input, add it to the arguments list
-                    for i in self.inputs:
-                        if i in function_args:
-                            args.append(x[self.inputs.index(i)])
-                    
-                    # convert every element in args to a dual number with dual component 0 except for the target
-                    for i in range(len(args)):
-                        target_i = [Dual(arg, 0) for arg in args]
-                        target_i[i] = Dual(args[i])
-                        z = f(*target_i)
-                        fduals.append(z.dual)
-                    
-                    # insert zeros for variables that are not present in the function
-                    for i in self.inputs:
-                        if i not in function_args:
-                            fduals.insert(self.inputs.index(i), 0)
-                            
-                    duals.append(np.array(fduals))
-                            
-                # if the number of arguments is equal to the number of inputs
-                else:
-                    # set the arguments to be the inputs
-                    args = x
-                    
-                    # convert every element in args to a dual number with dual component 0 except for the target
-                    for i in range(len(args)):
-                        target_i = [Dual(arg, 0) for arg in args]
-                        target_i[i] = Dual(args[i])
-                        z = f(*target_i)
-                        fduals.append(z.dual)
-
-                    duals.append(np.array(fduals))
-
-                # convert every element in args to a dual number with dual component 1
-                args = [Dual(arg) for arg in args]
+            for f, columns in zip(self.f, self._columns):
+                # if the function argument is an input, add it to the arguments list;
+                # inputs that are not present in the function keep a zero in the gradient
+                args = [Dual(x[i], seeds[i]) for i in columns]
                 
                 # unpack args and pass into f
                 z = f(*args)
                 reals.append(z.real)
+                duals.append(z.dual)
                 
             return np.array([np.array(reals), duals], dtype = object)
                     
         # if there is one function
         else:   
-            # get the number of arguments
-            n = len(inspect.getfullargspec(self.f)[0])
+            # convert every element in args to a dual number seeded with a unit vector
+            args = [Dual(x[i], seeds[i]) for i in range(len(x))]
+            
+            # unpack args and pass into f
+            z = self.f(*args)
+            
+            return np.array([z.real, z.dual], dtype = object)
+
+    def _get_results_parallel(self, x):
+        """
+        Compute the value(s) and the derivative(s) of the function(s) at 'x' on the workers of the executor.
+
+        Every function is evaluated by one task. A single function with more inputs than there are
+        workers is split into one task per worker, each computing a block of input directions; as every
+        task evaluates the whole function again, a function with fewer inputs is evaluated at once.
+
+        Parameters
+        ----------
+        x : list
+            The point at which the value(s) and derivative(s) of the function(s) are evaluated.
+
+        Returns
+        -------
+        f(x) and f'(x)
+            The method returns both the value(s) and the derivative(s) of the function(s) at 'x', as get_results does.
+
+        """
+        workers = self.workers
+        
+        # if there are multiple functions
+        if self.jacobian:
+            args = [[x[i] for i in columns] for columns in self._columns]
+            blocks = [np.arange(len(columns)) for columns in self._columns]
+            chunksize = max(1, len(self.f) // (4 * workers))
+            reals = []
+            duals = []
+            for columns, (real, dual) in zip(self._columns, self.executor.map(_evaluate_block, self.f, args, blocks, chunksize = chunksize)):
+                reals.append(real)
+                # insert zeros for variables that are not present in the function
+                row = np.zeros(self.n)
+                row[columns] = dual
+                duals.append(row)
+            return np.array([np.array(reals), duals], dtype = object)
+        
+        # if there is one function
+        else:
+            # a single block is evaluated here rather than shipped to one worker
+            if len(x) <= workers:
+                real, dual = _evaluate_block(self.f, x, np.arange(len(x)))
+                return np.array([real, dual], dtype = object)
+            blocks = np.array_split(np.arange(len(x)), workers)
+            results = list(self.executor.map(_evaluate_block, repeat(self.f), repeat(x), blocks))
+            return np.array([results[0][0], np.concatenate([dual for _, dual in results])], dtype = object)
+
+    def get_results_batch(self, X):
+        """
+        Compute the value(s) and the derivative(s) of the function(s) at every row of input 'X'.
+
+        Parameters
+        ----------
+        X : Matrix.
+            Array of shape (m, n) holding the m points at which the value(s) and derivative(s) of the function(s) are evaluated.
+
+        Returns
+        -------
+        f(X) and f'(X)
+            The method returns the values of shape (m,) and the derivatives of shape (m, n) of the function at every point.
+            For multiple functions, the values have shape (m, k) and the derivatives have shape (m, k, n).
             
-            # convert every element in args to a dual numebr with dual component 0 except for the target
-            for i in range(len(x)):
-                target_i = [Dual(arg, 0) for arg in x]
-                target_i[i] = Dual(x[i])
-                z = self.f(*target_i)
-                duals.append(z.dual) 
+        Raises
+        ------
+        TypeError
+            This method raises a `TypeError` if the type of input 'X' is not supported.
             
-            # convert every element in args to a dual number with dual component 1
-            args = [Dual(arg) for arg in x]
+        ValueError
+            This method also raises a `ValueError` if input 'X' is not 2-dimensional.
+            
+        """
+        # check that X is of supported type
+        if not isinstance(X, self._supported_vectors):
+            raise TypeError(f"Unsupported type '{type(X)}'")
+            
+        # check that X is 2-dimensional
+        if len(np.shape(X)) != 2:
+            raise ValueError(f"Input variables should be 2-dimensional.")
+            
+        # convert X to a float array so that negative powers of the batch are defined
+        X = np.asarray(X, dtype = float)
+        m, n = X.shape
+        
+        # seed every input with a unit tangent column that broadcasts over the batch
+        seeds = np.eye(n)[:, :, np.newaxis]
+        
+        # if there are multiple functions
+        if self.jacobian:
+            reals = np.empty((m, len(self.f)))
+            duals = np.empty((m, len(self.f), n))
+            for k, (f, columns) in enumerate(zip(self.f, self._columns)):
+                # if the function argument is an input, add its column to the arguments list
+                args = [Dual(X[:, i], seeds[i]) for i in columns]
+                
+                # unpack args and pass into f
+                z = f(*args)
+                reals[:, k] = z.real
+                duals[:, k, :] = np.broadcast_to(z.dual, (n, m)).T
+                
+            return reals, duals
+        
+        # if there is one function
+        else:
+            # convert every column of X to a dual number seeded with a unit vector
+            args = [Dual(X[:, i], seeds[i]) for i in range(n)]
             
             # unpack args and pass into f
             z = self.f(*args)
-            reals = z.real  
             
-            return np.array([reals, np.array(duals)], dtype = object)
+            return np.broadcast_to(z.real, (m,)).copy(), np.broadcast_to(z.dual, (n, m)).T.copy()
+
+    def get_derivatives(self, x, order, direction=None):
+        """
+        Compute the derivatives of order 0 to 'order' of the function(s) at input 'x' along 'direction'.
+
+        The inputs are truncated Taylor polynomials, so a single evaluation of every function yields
+        all of its derivatives along the line x + t * direction.
+
+        Parameters
+        ----------
+        x : Vector.
+            The point at which the derivatives of the function(s) are evaluated.
+
+        order : integer
+            Highest order of the derivatives.
+
+        direction : Vector.
+            Direction of the derivatives. Defaults to 1 for a function of one input.
+
+        Returns
+        -------
+        numpy.ndarray
+            The method returns the value and the derivatives of order 1 to 'order' as an array of shape (order + 1,)
+            for one function, or of shape (k, order + 1) for k functions.
+
+        Raises
+        ------
+        TypeError
+            This method raises a `TypeError` if the type of input 'x', 'direction' or 'order' is not supported.
+            
+        ValueError
+            This method also raises a `ValueError` if the dimension of input 'x' or 'direction' is not matched with the inputs,
+            if 'order' is negative, or if no direction is given for multiple inputs.
+            
+        """
+        # check that x is of supported type
+        if not isinstance(x, self._supported_vectors):
+            raise TypeError(f"Unsupported type '{type(x)}'")
+            
+        # check that x has one value per input
+        if np.shape(x) != (self.n,):
+            raise ValueError(f"Input variables should be a 1-dimensional vector of length {self.n}.")
+
+        # the derivatives of a function of one input are taken along its axis
+        if direction is None:
+            if self.n != 1:
+                raise ValueError("A direction is needed for the derivatives of a function of multiple inputs.")
+            direction = [1.0]
+        if not isinstance(direction, self._supported_vectors):
+            raise TypeError(f"Unsupported type '{type(direction)}'")
+        if np.shape(direction) != (self.n,):
+            raise ValueError(f"The direction should be a 1-dimensional vector of length {self.n}.")
+
+        args = [Taylor(x[i], order, direction[i]) for i in range(self.n)]
+        functions = self.f if self.jacobian else [self.f]
+        columns = self._columns if self.jacobian else [list(range(self.n))]
+        derivatives = np.zeros((len(functions), order + 1))
+        for k, (f, function_columns) in enumerate(zip(functions, columns)):
+            z = f(*[args[i] for i in function_columns])
+            # functions that do not depend on their inputs only have a value
+            if isinstance(z, Taylor):
+                derivatives[k] = z.derivatives()
+            else:
+                derivatives[k, 0] = z
+
+        return derivatives if self.jacobian else derivatives[0]
+
+    def iter_jacobian(self, x, block_size=1):
+        """
+        Compute the columns of the Jacobian of the function(s) at input 'x' one block at a time.
+
+        Every block of inputs is seeded with unit tangent vectors of the size of the block, so one
+        evaluation of every function computes the block of columns, and only that block is held in memory.
+        Functions that do not depend on any input of a block are not evaluated for it.
+
+        Parameters
+        ----------
+        x : Vector.
+            The point at which the Jacobian is evaluated.
+
+        block_size : integer
+            Number of columns computed by every evaluation.
+
+        Yields
+        ------
+        tuple
+            The position of the first column of the block and the block of columns as an array of shape
+            (k, block size) for k functions, or of shape (block size,) for one function.
+
+        Raises
+        ------
+        TypeError
+            This method raises a `TypeError` if the type of input 'x' or 'block_size' is not supported.
+            
+        ValueError
+            This method also raises a `ValueError` if the dimension of input 'x' is not matched with the inputs
+            or 'block_size' is smaller than 1.
+            
+        """
+        # check that x is of supported type and has one value per input
+        if not isinstance(x, self._supported_vectors):
+            raise TypeError(f"Unsupported type '{type(x)}'")
+        if np.shape(x) != (self.n,):
+            raise ValueError(f"Input variables should be a 1-dimensional vector of length {self.n}.")
+
+        # check that the blocks are well defined
+        if not isinstance(block_size, int):
+            raise TypeError(f"Unsupported type '{type(block_size)}'")
+        if block_size < 1:
+            raise ValueError("The block size should be at least 1.")
+
+        functions = self.f if self.jacobian else [self.f]
+        columns = self._columns if self.jacobian else [list(range(self.n))]
+
+        for start in range(0, self.n, block_size):
+            stop = min(start + block_size, self.n)
+            # seed the inputs of the block with unit vectors and the other inputs with zeros
+            seeds = np.zeros((self.n, stop - start))
+            seeds[start:stop] = np.eye(stop - start)
+            args = [Dual(x[i], seeds[i]) for i in range(self.n)]
+
+            block = np.zeros((len(functions), stop - start))
+            for k, (f, function_columns) in enumerate(zip(functions, columns)):
+                # the columns of functions that do not use the inputs of the block are zero
+                if not any(start <= i < stop for i in function_columns):
+                    continue
+                z = f(*[args[i] for i in function_columns])
+                if isinstance(z, Dual):
+                    block[k] = z.dual
+
+            yield start, (block if self.jacobian else block[0])
+
+    def jvp(self, x, v):
+        """
+        Compute the value(s) of the function(s) and the product of their Jacobian at input 'x' with the vector 'v'.
+
+        Every input is a dual number seeded with its component of 'v', so a single evaluation of every
+        function yields its directional derivative without forming the Jacobian.
+
+        Parameters
+        ----------
+        x : Vector.
+            The point at which the function(s) are evaluated.
+
+        v : Vector.
+            The direction multiplied by the Jacobian, with one component per input.
+
+        Returns
+        -------
+        f(x) and J(x)v
+            The method returns the value and the directional derivative as floats for one function,
+            or as arrays of shape (k,) for k functions.
+
+        Raises
+        ------
+        TypeError
+            This method raises a `TypeError` if the type of input 'x' or 'v', or of one of their elements, is not supported.
+            
+        ValueError
+            This method also raises a `ValueError` if the dimension of input 'x' or 'v' is not matched with the inputs.
+            
+        """
+        # check that x and v are of supported type and have one value per input
+        for vector in (x, v):
+            if not isinstance(vector, self._supported_vectors):
+                raise TypeError(f"Unsupported type '{type(vector)}'")
+            if np.shape(vector) != (self.n,):
+                raise ValueError(f"Input variables should be a 1-dimensional vector of length {self.n}.")
+            # check that every element is a real number
+            for value in vector:
+                if not isinstance(value, (*self._supported_scalars, np.number)):
+                    raise TypeError(f"Unsupported type '{type(value)}' for input elements.")
+
+        args = [Dual(x[i], v[i]) for i in range(self.n)]
+        functions = self.f if self.jacobian else [self.f]
+        columns = self._columns if self.jacobian else [list(range(self.n))]
+        vals = np.zeros(len(functions))
+        tangents = np.zeros(len(functions))
+        for k, (f, function_columns) in enumerate(zip(functions, columns)):
+            z = f(*[args[i] for i in function_columns])
+            # functions that do not depend on their inputs only have a value
+            if isinstance(z, Dual):
+                vals[k] = z.real
+                tangents[k] = z.dual
+            else:
+                vals[k] = z
+
+        if self.jacobian:
+            return vals, tangents
+        return vals[0], tangents[0]
+
+    def get_sparse_results(self, x):
+        """
+        Compute the value(s) of the function(s) and their Jacobian as a sparse matrix based on input 'x'.
+
+        Every function is evaluated once with its own arguments seeded with unit vectors, so the tangents
+        carried through it have as many components as it has arguments instead of inputs, and only the
+        entries of its sparsity pattern are computed.
+
+        Parameters
+        ----------
+        x : Scalar, Vector. 
+            The point at which the value(s) and derivative(s) of the function(s) are evaluated. 
+
+        Returns
+        -------
+        f(x) and f'(x)
+            The method returns the values as an array of shape (k,) and the Jacobian as a
+            scipy.sparse.csr_array of shape (k, n) holding the entries of its sparsity pattern.
+            
+        Raises
+        ------
+        ImportError
+            This method raises an `ImportError` if scipy is not installed.
+            
+        TypeError
+            This method raises a `TypeError` if the type of input 'x' is not supported.
+            
+        ValueError
+            This method also raises a `ValueError` if the dimension of input 'x' is not matched with the inputs.
+            
+        """
+        # scipy is only needed for sparse Jacobians
+        from scipy.sparse import csr_array
+        
+        # check that x is of supported type
+        if not isinstance(x, self._supported_vectors):
+            raise TypeError(f"Unsupported type '{type(x)}'")
+            
+        # check that x is 1-dimensional and has one value per input
+        if np.shape(x) != (self.n,):
+            raise ValueError(f"Input variables should be a 1-dimensional vector of length {self.n}.")
+            
+        # convert x to a list
+        x = list(x)
+        
+        functions = self.f if self.jacobian else [self.f]
+        columns = self._columns if self.jacobian else [list(range(self.n))]
+        reals = np.empty(len(functions))
+        data = []
+        indptr = [0]
+        for k, (f, function_columns) in enumerate(zip(functions, columns)):
+            # seed every argument with a unit vector
+            seeds = np.eye(len(function_columns))
+            z = f(*[Dual(x[j], seed) for j, seed in zip(function_columns, seeds)])
+            # functions that do not depend on their inputs have zero derivatives
+            if isinstance(z, Dual):
+                reals[k] = z.real
+                data.append(np.broadcast_to(z.dual, len(seeds)))
+            else:
+                reals[k] = z
+                data.append(np.zeros(len(seeds)))
+            indptr.append(indptr[-1] + len(function_columns))
+            
+        indices = [j for function_columns in columns for j in function_columns]
+        jacobian = csr_array((np.concatenate(data).astype(float), np.array(indices), np.array(indptr)), shape = (len(functions), self.n))
+        return reals, jacobian
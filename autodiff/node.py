@@ -3,24 +3,84 @@ import numpy as np
 class Node:
     """Node implementation for reversed mode."""
 
+    __slots__ = ("val", "op", "operands", "_gradients")
+
     _supported_scalars = (int, float)
 
-    def __init__(self, val, gradients=()) -> None:
+    def __init__(self, val, gradients=(), op=None, operands=()) -> None:
         """
         Initialize a node with its value and local gradients.
 
         Parameters
         ----------
-        val : integer or float
+        val : integer, float or numpy.ndarray
             Value of a node.
+            An array of values evaluates a batch of points at once.
             
-        gradients : tuple
+        gradients : tuple or None
             Local gradients of a node.
             Consists of 1 or 2 tuples of (`child node`, `local gradient value`)
+            If None, they are computed from `op` and `operands` when they are first needed.
+
+        op : string
+            Name of the operation that produced the node in `_RULES`, or None for a leaf.
+
+        operands : tuple
+            Nodes and constants the operation was applied to.
 
         """
         self.val = val
-        self.gradients = gradients
+        self.op = op
+        self.operands = operands
+        self._gradients = gradients
+
+    @property
+    def gradients(self):
+        """
+        Local gradients of a node.
+
+        The local partials of an operation are only computed when the backward sweep reaches
+        the node, so values that are never differentiated do not pay for them.
+        """
+        gradients = self._gradients
+        if gradients is not None:
+            return gradients
+
+        gradients = self._gradients = self._local_gradients(self.val, self.op, self.operands)
+        return gradients
+
+    @staticmethod
+    def _local_gradients(val, op, operands):
+        """
+        Compute the local gradients of the operation 'op' with value 'val' applied to 'operands'.
+
+        Returns
+        -------
+        tuple
+            The method returns a tuple of (`child node`, `local gradient value`) for every node in 'operands'.
+
+        """
+        partials = _RULES[op][1]
+        if len(operands) == 1:
+            a = operands[0]
+            return ((a, partials[0](val, a.val)),)
+
+        a, b = operands
+        if isinstance(a, Node):
+            if isinstance(b, Node):
+                return ((a, partials[0](val, a.val, b.val)), (b, partials[1](val, a.val, b.val)))
+            return ((a, partials[0](val, a.val, b)),)
+        return ((b, partials[1](val, a, b.val)),)
+
+    @staticmethod
+    def _any(condition):
+        """
+        Check whether a condition on the value of a node holds, for a scalar or for any element of a batch.
+        """
+        # avoid the overhead of np.any for the common scalar case
+        if isinstance(condition, np.ndarray):
+            return condition.any()
+        return bool(condition)
 
     ### Elementary Functions ###
     def __add__(self, other):
@@ -43,16 +103,14 @@ class Node:
             This method raises a `TypeError` if the type of input number other is not supported.
 
         """
+        if isinstance(other, Node):
+            # node
+            return self.__class__(self.val + other.val, None, "add", (self, other))
         # check if other is of a supported type
-        if not isinstance(other, (*self._supported_scalars, Node)):
+        if not isinstance(other, self._supported_scalars):
             raise TypeError(f"Unsupported type '{type(other)}'")
-
-        if isinstance(other, self._supported_scalars):
-            # scalar
-            return Node(other + self.val, ((self, 1),))
-        else:
-            # node
-            return Node(self.val + other.val, ((self, 1),(other, 1)))
+        # scalar
+        return self.__class__(other + self.val, None, "add", (self, other))
 
     def __neg__(self):
         """
@@ -64,7 +122,7 @@ class Node:
             The method returns a new node initialized with its value and gradients resulting from the negation.
 
         """
-        return Node(-self.val, ((self, -1),))
+        return self.__class__(-self.val, None, "neg", (self,))
 
     def __radd__(self, other):
         """
@@ -99,16 +157,14 @@ class Node:
             The method returns a new node initialized with its value and gradients resulting from the subtraction.
 
         """
+        if isinstance(other, Node):
+            # node
+            return self.__class__(self.val - other.val, None, "sub", (self, other))
         # check if other is of a supported type
-        if not isinstance(other, (*self._supported_scalars, Node)):
+        if not isinstance(other, self._supported_scalars):
             raise TypeError(f"Unsupported type '{type(other)}'")
-
-        if isinstance(other, self._supported_scalars):
-            # scalar
-            return Node(self.val - other, ((self, 1),))
-        else:
-            # node
-            return Node(self.val - other.val, ((self, 1),(other, -1)))
+        # scalar
+        return self.__class__(self.val - other, None, "sub", (self, other))
 
     
     def __rsub__(self, other):
@@ -127,10 +183,10 @@ class Node:
 
         """
         # check if other is of a supported type
-        if not isinstance(other, (*self._supported_scalars, Node)):
+        if not isinstance(other, self._supported_operands):
             raise TypeError(f"Unsupported type '{type(other)}'")
 
-        return Node(other - self.val, ((self, -1),))
+        return self.__class__(other - self.val, None, "sub", (other, self))
 
     def __mul__(self, other):
         """
@@ -152,15 +208,14 @@ class Node:
             This method raises a `TypeError` if the type of input number other is not supported.
 
         """
+        if isinstance(other, Node):
+            # node
+            return self.__class__(self.val * other.val, None, "mul", (self, other))
         # check if other is of a supported type
-        if not isinstance(other, (*self._supported_scalars, Node)):
+        if not isinstance(other, self._supported_scalars):
             raise TypeError(f"Unsupported type '{type(other)}'")
-        if isinstance(other, self._supported_scalars):
-            # scalar
-            return Node(other * self.val, ((self, other),))
-        else:
-            # node
-            return Node(self.val * other.val, ((self, other.val),(other, self.val)))
+        # scalar
+        return self.__class__(other * self.val, None, "mul", (self, other))
         
     def __rmul__(self, other):
         """
@@ -194,15 +249,14 @@ class Node:
             The method returns a new node initialized with its value and gradients resulting from the division.
 
         """
+        if isinstance(other, Node):
+            # node
+            return self.__class__(self.val/other.val, None, "truediv", (self, other))
         # check if other is of a supported type
-        if not isinstance(other, (*self._supported_scalars, Node)):
+        if not isinstance(other, self._supported_scalars):
             raise TypeError(f"Unsupported type '{type(other)}'")
-        if isinstance(other, self._supported_scalars):
-            # scalar
-            return Node(self.val/other, ((self, 1/other),))
-        else:
-            # node
-            return Node(self.val/other.val, ((self, 1/other.val),(other, -self.val*other.val**-2)))
+        # scalar
+        return self.__class__(self.val/other, None, "truediv", (self, other))
     
     def __rtruediv__(self, other):
         """
@@ -220,9 +274,9 @@ class Node:
 
         """
         # check if other is of a supported type
-        if not isinstance(other, (*self._supported_scalars, Node)):
+        if not isinstance(other, self._supported_operands):
             raise TypeError(f"Unsupported type '{type(other)}'")
-        return Node(other/self.val, ((self, -other*self.val**-2),))    
+        return self.__class__(other/self.val, None, "truediv", (other, self))
     
     def __pow__(self, other):
         """
@@ -244,16 +298,14 @@ class Node:
             This method raises a `TypeError` if the type of input number other is not supported.
 
         """
+        if isinstance(other, Node):
+            # node
+            return self.__class__(self.val**other.val, None, "pow", (self, other))
         # check if other is of supported type
-        if not isinstance(other, (*self._supported_scalars, Node)):
+        if not isinstance(other, self._supported_scalars):
             raise TypeError(f"Unsupported type '{type(other)}'")
-        if isinstance(other, self._supported_scalars):
-            # scalar
-            return Node(self.val**other, ((self, other*self.val**(other-1)),))
-        else:
-            # node
-            return Node(self.val**other.val, ((self, other.val*self.val**(other.val-1)), 
-                (other, self.val**other.val*np.log(self.val))))
+        # scalar
+        return self.__class__(self.val**other, None, "pow", (self, other))
 
     def __rpow__(self, other):
         """
@@ -276,9 +328,9 @@ class Node:
 
         """
         # check if other is of supported type
-        if not isinstance(other, (*self._supported_scalars, Node)):
+        if not isinstance(other, self._supported_operands):
             raise TypeError(f"Unsupported type '{type(other)}'")
-        return Node(other**self.val, ((self, other**self.val*np.log(other)),))   
+        return self.__class__(other**self.val, None, "pow", (other, self))
 
     ### Square Root Function ###
     def sqrt(self):
@@ -296,9 +348,9 @@ class Node:
             This method raises a `ValueError` if the value of input node value is less than zero.
 
         """
-        if self.val < 0:
+        if self._any(self.val < 0):
             raise ValueError("Cannot square root: value of node is less than 0.")
-        return Node(self.val ** (1/2), ((self, 1/2*(self.val**(-1/2))),))
+        return self.__class__(self.val ** (1/2), None, "sqrt", (self,))
     
     ### Exponential Function ###
     def exp(self):
@@ -311,7 +363,7 @@ class Node:
             The method returns a new node initialized with its value and gradients resulting from the exponentiation.
 
         """
-        return Node(np.exp(self.val), ((self, np.exp(self.val)),))
+        return self.__class__(np.exp(self.val), None, "exp", (self,))
 
     ### Logarithmic Function ###
     def log(self, base):
@@ -344,9 +396,9 @@ class Node:
         if base <= 0:
             raise ValueError("Cannot log: Base is less than or equal to 0.")
         # check that the value of the node is greater than 0.
-        if self.val <= 0:
+        if self._any(self.val <= 0):
             raise ValueError("Cannot log: Value of node is less than or equal to 0.")
-        return Node(np.log(self.val)/np.log(base), ((self, 1 / (np.log(base)*self.val)),))
+        return self.__class__(np.log(self.val)/np.log(base), None, "log", (self, base))
  
     ### Logistic Function ###
     def standard_logistic(self):
@@ -359,7 +411,7 @@ class Node:
             The method returns the value of the standard logistic function with the given node as input.
 
         """
-        return Node(1 / (1 + np.exp(-self.val)),((self, 1/(1+np.exp(-self.val)) * (1-1/(1+np.exp(-self.val)))),))
+        return self.__class__(1 / (1 + np.exp(-self.val)), None, "standard_logistic", (self,))
 
     ### Trigonometric Functions ### 
     def sin(self):
@@ -372,7 +424,7 @@ class Node:
             The method returns The method returns a new node initialized with its value and gradients resulting from the sine.
 
         """
-        return Node(np.sin(self.val), ((self, np.cos(self.val)),))
+        return self.__class__(np.sin(self.val), None, "sin", (self,))
     
     def cos(self):
         """
@@ -384,7 +436,7 @@ class Node:
             The method returns a new node initialized with its value and gradients resulting from the cosine.
             
         """
-        return Node(np.cos(self.val), ((self, -np.sin(self.val)),))
+        return self.__class__(np.cos(self.val), None, "cos", (self,))
             
     def tan(self):
         """
@@ -396,7 +448,7 @@ class Node:
             The method returns a new node initialized with its value and gradients resulting from the tangent.
             
         """
-        return Node(np.tan(self.val), ((self, 1 / (np.cos(self.val) ** 2)),))
+        return self.__class__(np.tan(self.val), None, "tan", (self,))
 
     ### Inverse Trigonometric Functions ###
     def arcsin(self):
@@ -414,9 +466,9 @@ class Node:
             This method raises a `ValueError` if the value of the node is smaller than -1 or greater than 1.
 
         """
-        if self.val >= 1 or self.val <= -1:
+        if self._any((self.val >= 1) | (self.val <= -1)):
             raise ValueError("Value of node is not between -1 and 1.")
-        return Node(np.arcsin(self.val), ((self, 1 / np.sqrt(1 - self.val ** 2)),))
+        return self.__class__(np.arcsin(self.val), None, "arcsin", (self,))
     
     def arccos(self):
         """
@@ -433,9 +485,9 @@ class Node:
             This method raises a `ValueError` if the value of the node is smaller than -1 or greater than 1.
 
         """
-        if self.val >= 1 or self.val <= -1:
+        if self._any((self.val >= 1) | (self.val <= -1)):
             raise ValueError("Value of node is not between -1 and 1.")
-        return Node(np.arccos(self.val), ((self, - 1 / np.sqrt(1 - self.val ** 2)),))
+        return self.__class__(np.arccos(self.val), None, "arccos", (self,))
     
     def arctan(self):
         """
@@ -447,7 +499,7 @@ class Node:
             The method returns a new node initialized with its value and gradients resulting from the arctangent.
 
         """
-        return Node(np.arctan(self.val), ((self, 1 / ((self.val ** 2) + 1)),))
+        return self.__class__(np.arctan(self.val), None, "arctan", (self,))
     
     ### Hyperbolic Functions ###
     def sinh(self):
@@ -460,7 +512,7 @@ class Node:
             The method returns a new node initialized with its value and gradients resulting from the hyperbolic sine.
 
         """
-        return Node(np.sinh(self.val), ((self, np.cosh(self.val)),))
+        return self.__class__(np.sinh(self.val), None, "sinh", (self,))
     
     def cosh(self):
         """
@@ -472,7 +524,7 @@ class Node:
             The method returns a new node initialized with its value and gradients resulting from the hyperbolic cosine.
 
         """
-        return Node(np.cosh(self.val), ((self, np.sinh(self.val)),))
+        return self.__class__(np.cosh(self.val), None, "cosh", (self,))
 
     def tanh(self):
         """
@@ -484,4 +536,41 @@ class Node:
             The method returns a new node initialized with its value and gradients resulting from the hyperbolic tangent.
 
         """
-        return Node(np.tanh(self.val), ((self, 1/np.cosh(self.val)**2),))
+        return self.__class__(np.tanh(self.val), None, "tanh", (self,))
+
+# operand types accepted by the reflected operators, built once instead of on every call
+Node._supported_operands = (*Node._supported_scalars, Node)
+
+# Value and local partials of every operation recorded by a node, in terms of the values of its operands.
+# The partials take the value 'r' of the operation first and are listed in the order of the operands;
+# constant operands such as the base of a logarithm have no partial.
+_RULES = {
+    "add": (lambda a, b: a + b, (lambda r, a, b: 1, lambda r, a, b: 1)),
+    "neg": (lambda a: -a, (lambda r, a: -1,)),
+    "sub": (lambda a, b: a - b, (lambda r, a, b: 1, lambda r, a, b: -1)),
+    "mul": (lambda a, b: a * b, (lambda r, a, b: b, lambda r, a, b: a)),
+    "truediv": (lambda a, b: a / b, (lambda r, a, b: 1 / b, lambda r, a, b: -a * b**-2)),
+    "pow": (lambda a, b: a**b, (lambda r, a, b: b * a**(b - 1), lambda r, a, b: r * np.log(a))),
+    "sqrt": (lambda a: a ** (1/2), (lambda r, a: 1/2 * (a**(-1/2)),)),
+    "exp": (np.exp, (lambda r, a: r,)),
+    "log": (lambda a, base: np.log(a) / np.log(base), (lambda r, a, base: 1 / (np.log(base) * a),)),
+    "standard_logistic": (lambda a: 1 / (1 + np.exp(-a)), (lambda r, a: r * (1 - r),)),
+    "sin": (np.sin, (lambda r, a: np.cos(a),)),
+    "cos": (np.cos, (lambda r, a: -np.sin(a),)),
+    "tan": (np.tan, (lambda r, a: 1 / (np.cos(a) ** 2),)),
+    "arcsin": (np.arcsin, (lambda r, a: 1 / np.sqrt(1 - a ** 2),)),
+    "arccos": (np.arccos, (lambda r, a: - 1 / np.sqrt(1 - a ** 2),)),
+    "arctan": (np.arctan, (lambda r, a: 1 / ((a ** 2) + 1),)),
+    "sinh": (np.sinh, (lambda r, a: np.cosh(a),)),
+    "cosh": (np.cosh, (lambda r, a: np.sinh(a),)),
+    "tanh": (np.tanh, (lambda r, a: 1 / np.cosh(a)**2,)),
+}
+
+# Domain of the operations that are not defined everywhere, as a condition on the value of the first
+# operand under which the operation raises a ValueError, and the message of the error.
+_DOMAINS = {
+    "sqrt": (lambda a: a < 0, "Cannot square root: value of node is less than 0."),
+    "log": (lambda a: a <= 0, "Cannot log: Value of node is less than or equal to 0."),
+    "arcsin": (lambda a: (a >= 1) | (a <= -1), "Value of node is not between -1 and 1."),
+    "arccos": (lambda a: (a >= 1) | (a <= -1), "Value of node is not between -1 and 1."),
+}
@@ -0,0 +1,75 @@
+# File       : parallel.py
+# Description: Module-level helpers evaluated by worker processes, so that
+#              they can be pickled by concurrent.futures executors
+import os
+
+import numpy as np
+
+from autodiff.dual import Dual
+
+def _default_workers(workers=None):
+    """
+    Number of workers 'workers', defaulting to the number of processors.
+    """
+    return workers or os.cpu_count() or 1
+
+def _evaluate_block(f, x, block):
+    """
+    Evaluate 'f' at 'x' with tangents seeded only on the inputs in 'block'.
+
+    Parameters
+    ----------
+    f : function
+        Function to evaluate. It must be picklable, i.e. defined at the top level of a module.
+
+    x : list
+        Values of the arguments of 'f'.
+
+    block : array-like
+        Positions of the arguments whose derivatives are computed.
+
+    Returns
+    -------
+    f(x) and f'(x)
+        The function returns the value of 'f' and its derivatives with respect to the arguments in 'block'.
+
+    """
+    seeds = np.zeros((len(x), len(block)))
+    seeds[block, np.arange(len(block))] = 1
+    z = f(*[Dual(arg, seed) for arg, seed in zip(x, seeds)])
+    return z.real, np.broadcast_to(z.dual, (len(block),)).copy()
+
+def _evaluate_batch_chunk(engine, names, shapes, start, stop):
+    """
+    Evaluate rows 'start' to 'stop' of a batch held in shared memory and write the results in place.
+
+    Parameters
+    ----------
+    engine : ForwardMode or ReverseMode
+        Engine whose get_results_batch evaluates the chunk.
+
+    names : list
+        Names of the shared memory blocks holding the points, the values and the derivatives.
+
+    shapes : list
+        Shapes of the arrays held by the shared memory blocks.
+
+    start, stop : integer
+        Rows of the batch evaluated by this task.
+
+    """
+    from multiprocessing import shared_memory
+    
+    # the workers share the resource tracker of the parent, which unlinks the blocks
+    blocks = [shared_memory.SharedMemory(name = name) for name in names]
+    arrays = [np.ndarray(shape, dtype = float, buffer = block.buf) for shape, block in zip(shapes, blocks)]
+    try:
+        # copy the chunk, so that no view into the shared memory outlives this function
+        vals, gradients = engine.get_results_batch(arrays[0][start:stop].copy())
+        arrays[1][start:stop] = vals
+        arrays[2][start:stop] = gradients
+    finally:
+        # release the views before closing the blocks they point into
+        arrays.clear()
+        for block in blocks:
+            block.close()
@@ -1,12 +1,244 @@
-import inspect
+import copy
+import os
+import tempfile
+
 import numpy as np
 
+from autodiff import checkpoint as checkpointing
 from autodiff.ad import AD
+from autodiff.dual import Dual
 from autodiff.node import Node
+from autodiff.static import StaticGraph
+from autodiff.tape import Tape
+from autodiff.tensor import Tensor
+from autodiff.trace import trace
 
 class ReverseMode(AD):
     """Reverse mode implementation based on nodes."""
 
+    def __init__(self, f, inputs=[], cache_size=32, tape=False, fused=False, static=False):
+        """
+        Initialize the function of which the derivative will be calculated based on input 'f'.
+
+        Parameters
+        ----------
+        f : array-like
+            Input with one or multiple functions.
+
+        inputs : array-like
+            List of input variables.
+
+        cache_size : integer
+            Number of points whose results are memoized by get_f, get_f_prime and value_and_grad.
+            A cache size of 0 disables memoization.
+
+        tape : boolean
+            If True, operations are recorded on a compact array-backed Tape instead of
+            a graph of Node objects, which reduces memory use for long computations.
+
+        fused : boolean
+            If True, multiple functions are evaluated on shared input nodes and differentiated by a
+            single backward sweep propagating one adjoint per function as a vector.
+
+        static : boolean
+            If True, the graph of every function is built at the first point and re-evaluated in place
+            at later points, so repeated calls do not allocate new nodes. Only valid for functions whose
+            control flow does not depend on the values of their arguments.
+
+        Raises
+        ------
+        ValueError
+            This method raises a `ValueError` if a static graph is combined with a tape or a fused evaluation.
+        """
+        super().__init__(f, inputs, cache_size)
+        # a static graph is made of nodes and differentiates every function on its own
+        if static and (tape or fused):
+            raise ValueError("A static graph cannot be combined with a tape or a fused evaluation.")
+        self.tape = tape
+        self.fused = fused
+        self.static = static
+        self._graphs = {}
+
+    def clear_cache(self):
+        """
+        Discard the memoized results and graphs, e.g. after the function(s) changed their behavior.
+        """
+        super().clear_cache()
+        self._graphs = {}
+
+    def __getstate__(self):
+        """
+        Drop the static graphs when the engine is pickled, as their steps hold the rules of the operations.
+        """
+        state = super().__getstate__()
+        state["_graphs"] = {}
+        return state
+
+    @staticmethod
+    def topological_order(*nodes):
+        """
+        Order the nodes of the graph rooted at `nodes` so that every node comes before its children.
+
+        The graph is walked iteratively, so the depth of the graph is not bounded by the recursion limit
+        and every node is visited exactly once no matter how many paths lead to it.
+
+        Returns
+        -------
+        list
+            The method returns the nodes reachable from `nodes` (including `nodes`) in topological order.
+            
+        """
+        order = []
+        visited = set()
+        
+        for node in nodes:
+            if node in visited:
+                continue
+            visited.add(node)
+            stack = [(node, iter(node.gradients))]
+            
+            while stack:
+                parent, children = stack[-1]
+                for child, _ in children:
+                    # descend into the first child that has not been visited yet
+                    if child not in visited:
+                        visited.add(child)
+                        stack.append((child, iter(child.gradients)))
+                        break
+                else:
+                    # all children are done, so the node can be emitted in post-order
+                    stack.pop()
+                    order.append(parent)
+        
+        order.reverse()
+        return order
+
+    @staticmethod
+    def checkpoint(segment):
+        """
+        Checkpoint a segment of a computation so that its nodes are not kept for the backward sweep.
+
+        Calling the returned function evaluates 'segment' and only keeps the values of its outputs.
+        When the backward sweep reaches the outputs, the segment is evaluated again from the values of
+        its arguments and differentiated, and its nodes are discarded again.
+
+        Parameters
+        ----------
+        segment : function
+            Function of nodes returning a node or a tuple of nodes.
+
+        Returns
+        -------
+        function
+            The method returns a function with the same arguments and outputs as 'segment'.
+
+        Examples
+        --------
+        >>> step = ReverseMode.checkpoint(lambda x, v: (x + 0.1 * v, v - 0.1 * AD.sin(x)))
+
+        """
+        return checkpointing.checkpoint(segment)
+
+    @staticmethod
+    def checkpoint_loop(step, steps, snapshots=8):
+        """
+        Apply 'step' 'steps' times, keeping at most 'snapshots' checkpointed states per level of recomputation.
+
+        The steps are split with the binomial (revolve) schedule: with 's' snapshots and 't' recomputations
+        of every step, C(s + t, s) steps can be reversed, and the smallest 't' covering 'steps' is used.
+        More snapshots use more memory and recompute fewer steps.
+
+        Parameters
+        ----------
+        step : function
+            Function taking the state as arguments and returning the next state as a node or a tuple of nodes.
+
+        steps : integer
+            Number of times 'step' is applied.
+
+        snapshots : integer
+            Number of states checkpointed at every level of the schedule.
+
+        Returns
+        -------
+        function
+            The method returns a function taking the initial state and returning the final state.
+
+        Raises
+        ------
+        ValueError
+            This method raises a `ValueError` if 'steps' is negative or 'snapshots' is smaller than 1.
+
+        """
+        # check that the schedule is well defined
+        if steps < 0:
+            raise ValueError("The number of steps cannot be negative.")
+        if snapshots < 1:
+            raise ValueError("At least one snapshot is needed.")
+        return checkpointing.checkpoint_loop(step, steps, snapshots)
+
+    @staticmethod
+    def codegen(f, inputs=[], path=None, name="value_and_grad"):
+        """
+        Generate the source code of a standalone NumPy module computing the value(s) and derivative(s) of 'f'.
+
+        The operations of 'f' are traced once (see `autodiff.trace`) and emitted as straight-line code
+        followed by the backward sweep, so the generated function has no operator overloading overhead
+        and does not depend on autodiff.
+
+        Parameters
+        ----------
+        f : array-like
+            Input with one or multiple functions, whose control flow must not depend on the values of the inputs.
+
+        inputs : array-like
+            List of input variables.
+
+        path : string or None
+            If given, the module is written to this file. The file is replaced atomically, so concurrent
+            readers never import a partially written module.
+
+        name : string
+            Name of the generated function, which takes a vector of inputs and returns the value(s) and
+            the gradient (or Jacobian) as `compiled` functions do.
+
+        Returns
+        -------
+        string
+            The method returns the source code of the module.
+
+        Raises
+        ------
+        TypeError
+            This method raises a `TypeError` if 'f' or 'inputs' are not supported.
+
+        ValueError
+            This method raises a `ValueError` if an argument of 'f' is not in 'inputs' or 'name' is not a valid name.
+
+        Examples
+        --------
+        >>> ReverseMode.codegen(lambda x, y: AD.sin(x) * y, ["x", "y"], path = "kernel.py")
+
+        """
+        # traced kernels are keyed by the content of 'f', so the module holds the current values of its constants
+        source = trace(f, inputs).module_source(name, inputs)
+        if path is not None:
+            directory = os.path.dirname(os.path.abspath(path))
+            descriptor, temporary = tempfile.mkstemp(suffix = ".py", dir = directory)
+            try:
+                with os.fdopen(descriptor, "w") as file:
+                    file.write(source)
+                # temporary files are only readable by their owner, while the module is shipped to other users
+                umask = os.umask(0)
+                os.umask(umask)
+                os.chmod(temporary, 0o666 & ~umask)
+                os.replace(temporary, path)
+            except BaseException:
+                os.remove(temporary)
+                raise
+        return source
+
+    @staticmethod
     def get_gradients(node):
         """ 
         Compute the derivatives of `node` with respect to child nodes.
@@ -17,15 +249,15 @@ class ReverseMode(AD):
             The method returns the derivative(s) of `node` with respect to child nodes.
             
         """
-        gradients = {}
+        gradients = {node: 1}
         
-        def compute_gradients(node, v):
-            for child, gradient in node.gradients:
-                v_child = v * gradient
-                gradients[child] = gradients.get(child, 0) + v_child
-                compute_gradients(child, v_child)
+        # every node is reached after all of its parents, so its adjoint is complete
+        # when its local gradients are propagated to its children
+        for parent in ReverseMode.topological_order(node):
+            v = gradients[parent]
+            for child, gradient in parent.gradients:
+                gradients[child] = gradients.get(child, 0) + v * gradient
         
-        compute_gradients(node, 1)
         return gradients
     
     def get_results(self, x):
@@ -62,50 +294,549 @@ class ReverseMode(AD):
         # convert x to a list
         x = list(x)
         
+        # if there are multiple functions sharing one graph
+        if self.jacobian and self.fused:
+            vals, jacobian = self._evaluate_fused(x)
+            return np.array([vals, list(jacobian)], dtype = object)
+        
         # if there are multiple functions
         if self.jacobian:
             jacobian = []
             vals = []
-            for f in self.f:
-                # initialize arguments list
-                args = []
-                nodes = []
-
-                # get the function arguments
-                function_args = inspect.getfullargspec(f)[0]
-                  
+            for k, (f, columns) in enumerate(zip(self.f, self._columns)):
                 # if the function argument is an input, add it to the arguments list
-                for i, input in enumerate(self.inputs):
-                    if input in function_args:
-                        node = Node(x[i])
-                        args.append(node)
-                        nodes.append(node)
-                    # pad with 0 when the variable is not used in the function
-                    else:
-                        nodes.append(0)
-
-                # unpack args and pass into f
-                z = f(*args)
-                gradients = ReverseMode.get_gradients(z)
-                vals.append(z.val)
-                j = []
+                args = [x[i] for i in columns]
+
+                # evaluate f and differentiate it with respect to its arguments
+                if self.static:
+                    val, gradients = self._evaluate_static(k, f, args)
+                else:
+                    val, gradients = self._evaluate(f, args, self.tape)
+                vals.append(val)
                 
-                # fill jacobian with results
-                for i, input in enumerate(self.inputs):
-                    if input in function_args:
-                        j.append(gradients[nodes[i]])
-                    else:
-                        j.append(0)
+                # fill jacobian with results, padding with 0 when the variable is not used in the function
+                j = [0] * self.n
+                for i, gradient in zip(columns, gradients):
+                    j[i] = gradient
                 jacobian.append(np.array(j))
                 
             return np.array([np.array(vals), jacobian], dtype = object)
                     
         # if there is one function
         else:   
-            # convert every element in args to a node
-            args = [Node(arg) for arg in x]
+            if self.static:
+                val, gradients = self._evaluate_static(0, self.f, x)
+            else:
+                val, gradients = self._evaluate(self.f, x, self.tape)
+            return np.array([val, np.array(gradients)], dtype = object)
+
+    def get_results_batch(self, X):
+        """
+        Compute the value(s) and the derivative(s) of the function(s) at every row of input 'X'.
+
+        Parameters
+        ----------
+        X : Matrix.
+            Array of shape (m, n) holding the m points at which the value(s) and derivative(s) of the function(s) are evaluated.
+
+        Returns
+        -------
+        f(X) and f'(X)
+            The method returns the values of shape (m,) and the derivatives of shape (m, n) of the function at every point.
+            For multiple functions, the values have shape (m, k) and the derivatives have shape (m, k, n).
+            
+        Raises
+        ------
+        TypeError
+            This method raises a `TypeError` if the type of input 'X' is not supported.
+            
+        ValueError
+            This method also raises a `ValueError` if input 'X' is not 2-dimensional.
+            
+        """
+        # check that X is of supported type
+        if not isinstance(X, self._supported_vectors):
+            raise TypeError(f"Unsupported type '{type(X)}'")
+            
+        # check that X is 2-dimensional
+        if len(np.shape(X)) != 2:
+            raise ValueError(f"Input variables should be 2-dimensional.")
+            
+        # convert X to a float array so that negative powers of the batch are defined
+        X = np.asarray(X, dtype = float)
+        m, n = X.shape
+        
+        # if there are multiple functions
+        if self.jacobian:
+            vals = np.empty((m, len(self.f)))
+            jacobian = np.zeros((m, len(self.f), n))
+            for k, (f, columns) in enumerate(zip(self.f, self._columns)):
+                # evaluate f and differentiate it with respect to its arguments
+                val, gradients = self._evaluate(f, [X[:, i] for i in columns], tape = False)
+                vals[:, k] = val
+                for i, gradient in zip(columns, gradients):
+                    jacobian[:, k, i] = gradient
+                    
+            return vals, jacobian
+        
+        # if there is one function
+        else:
+            vals = np.empty(m)
+            gradients = np.empty((m, n))
+            
+            # the tape only stores scalars, so batches are always evaluated on nodes
+            val, columns = self._evaluate(self.f, list(X.T), tape = False)
+            vals[:] = val
+            for i, gradient in enumerate(columns):
+                gradients[:, i] = gradient
+                
+            return vals, gradients
+
+    def get_results_tensor(self, x):
+        """
+        Compute the value(s) and the gradient(s) of the function(s) for array-valued inputs.
+
+        Every input is a single tensor node holding an array, so a function of vectors or matrices is
+        differentiated through a handful of array operations instead of a node per element.
+
+        Parameters
+        ----------
+        x : list
+            List holding the value of every input, each of which can be a scalar or an array of any shape.
+
+        Returns
+        -------
+        f(x) and f'(x)
+            The method returns the value of the function and a list with the gradient of the function with respect
+            to every input, of the shape of that input. For multiple functions, it returns a list of values and a
+            list of lists of gradients.
+            Functions whose value is an array are differentiated as the sum of its elements.
+
+        Raises
+        ------
+        TypeError
+            This method raises a `TypeError` if the type of input x is not supported.
+
+        ValueError
+            This method also raises a `ValueError` if input x does not hold one value per input.
+
+        """
+        # check that x is of supported type
+        if not isinstance(x, (list, tuple)):
+            raise TypeError(f"Unsupported type '{type(x)}'")
+
+        # check that x holds one value per input
+        if len(x) != self.n:
+            raise ValueError(f"Input variables should hold {self.n} values.")
+
+        x = [np.asarray(arg, dtype = float) for arg in x]
+        functions = zip(self.f, self._columns) if self.jacobian else [(self.f, range(self.n))]
+
+        vals = []
+        gradients = []
+        for f, columns in functions:
+            args = [Tensor(x[i]) for i in columns]
+            val, partials = self._differentiate(f(*args), args)
+            vals.append(val)
+
+            # pad with zeros when the variable is not used in the function
+            g = [np.zeros_like(arg) for arg in x]
+            for i, partial in zip(columns, partials):
+                g[i] = g[i] + partial
+            gradients.append(g)
+
+        if self.jacobian:
+            return vals, gradients
+        return vals[0], gradients[0]
+
+    def vjp(self, x, u):
+        """
+        Compute the value(s) of the function(s) and the product of the vector 'u' with their Jacobian at input 'x'.
+
+        All functions are evaluated on shared input nodes, and the adjoint of every output is seeded
+        with its component of 'u', so a single backward sweep yields u^T J without forming the Jacobian.
+
+        Parameters
+        ----------
+        x : Vector.
+            The point at which the function(s) are evaluated.
+
+        u : Vector.
+            The vector multiplied with the Jacobian, with one component per function.
+
+        Returns
+        -------
+        f(x) and u^T J(x)
+            The method returns the value(s) as a float for one function or as an array of shape (k,)
+            for k functions, and the product as an array of shape (n,).
+
+        Raises
+        ------
+        TypeError
+            This method raises a `TypeError` if the type of input 'x' or 'u', or of one of their elements, is not supported.
+            
+        ValueError
+            This method also raises a `ValueError` if the dimension of input 'x' is not matched with the inputs
+            or the dimension of 'u' with the functions.
+            
+        """
+        x = self._check_point(x)
+        functions = self.f if self.jacobian else [self.f]
+        columns = self._columns if self.jacobian else [list(range(self.n))]
+
+        # check that u is of supported type and has one value per function
+        if not isinstance(u, self._supported_vectors):
+            raise TypeError(f"Unsupported type '{type(u)}'")
+        if np.shape(u) != (len(functions),):
+            raise ValueError(f"The vector should be a 1-dimensional vector of length {len(functions)}.")
+        for weight in u:
+            if not isinstance(weight, (*self._supported_scalars, np.number)):
+                raise TypeError(f"Unsupported type '{type(weight)}' for input elements.")
+
+        nodes = [Node(arg) for arg in x]
+        outputs = [f(*[nodes[i] for i in function_columns]) for f, function_columns in zip(functions, columns)]
+
+        # seed the adjoint of every output with its component of u;
+        # functions that do not depend on their inputs have no graph
+        adjoints = {}
+        for output, weight in zip(outputs, u):
+            if isinstance(output, Node):
+                adjoints[output] = adjoints.get(output, 0) + weight
+
+        # a single sweep over the union of the graphs propagates the weighted adjoints
+        for parent in ReverseMode.topological_order(*adjoints):
+            v = adjoints[parent]
+            for child, gradient in parent.gradients:
+                adjoints[child] = adjoints.get(child, 0) + v * gradient
+
+        vals = np.array([output.val if isinstance(output, Node) else output for output in outputs], dtype = float)
+        product = np.array([adjoints.get(node, 0) for node in nodes], dtype = float)
+        return (vals if self.jacobian else vals[0]), product
+
+    def iter_jacobian(self, x, block_size=1):
+        """
+        Compute the rows of the Jacobian of the function(s) at input 'x' one block at a time.
+
+        Every block of functions is evaluated on shared input nodes and differentiated by one backward
+        sweep, and its graph is released before the next block is evaluated, so only one block of rows
+        and its graph are held in memory at a time.
+
+        Parameters
+        ----------
+        x : Vector.
+            The point at which the Jacobian is evaluated.
+
+        block_size : integer
+            Number of rows computed by every backward sweep.
+
+        Yields
+        ------
+        tuple
+            The position of the first row of the block and the block of rows as an array of shape
+            (block size, n). One function yields its gradient as a single row of shape (n,).
+
+        Raises
+        ------
+        TypeError
+            This method raises a `TypeError` if the type of input 'x' or 'block_size' is not supported.
+            
+        ValueError
+            This method also raises a `ValueError` if the dimension of input 'x' is not matched with the inputs
+            or 'block_size' is smaller than 1.
+            
+        """
+        x = self._check_point(x)
+
+        # check that the blocks are well defined
+        if not isinstance(block_size, int):
+            raise TypeError(f"Unsupported type '{type(block_size)}'")
+        if block_size < 1:
+            raise ValueError("The block size should be at least 1.")
+
+        # if there is one function
+        if not self.jacobian:
+            _, gradients = self._evaluate(self.f, x, self.tape)
+            yield 0, np.array(gradients, dtype = float)
+            return
+
+        for start in range(0, len(self.f), block_size):
+            _, rows = self._evaluate_fused(x, range(start, min(start + block_size, len(self.f))))
+            yield start, rows
+
+    def hvp(self, x, v):
+        """
+        Compute the product of the Hessian(s) of the function(s) at input 'x' with the vector 'v'.
+
+        The inputs are nodes holding dual numbers seeded with 'v', so one forward pass and one
+        backward sweep (forward-over-reverse) differentiate the gradient in the direction 'v'
+        without forming the Hessian.
+
+        Parameters
+        ----------
+        x : Vector.
+            The point at which the Hessian(s) of the function(s) are evaluated.
+
+        v : Vector.
+            The vector multiplied by the Hessian(s).
+
+        Returns
+        -------
+        H(x)v
+            The method returns an array of shape (n,) for one function, or of shape (k, n) for k functions.
+
+        Raises
+        ------
+        TypeError
+            This method raises a `TypeError` if the type of input 'x' or 'v' is not supported.
+            
+        ValueError
+            This method also raises a `ValueError` if the dimension of input 'x' or 'v' is not matched with the inputs.
+            
+        """
+        x = self._check_point(x)
+        v = self._check_point(v)
+        return self._differentiate_gradients(x, v)
+
+    def hessian(self, x):
+        """
+        Compute the Hessian(s) of the function(s) at input 'x'.
+
+        The dual part of every input is seeded with a unit vector, so a single forward pass and
+        backward sweep yield the whole Hessian.
+
+        Parameters
+        ----------
+        x : Vector.
+            The point at which the Hessian(s) of the function(s) are evaluated.
+
+        Returns
+        -------
+        H(x)
+            The method returns an array of shape (n, n) for one function, or of shape (k, n, n) for k functions.
+
+        Raises
+        ------
+        TypeError
+            This method raises a `TypeError` if the type of input 'x' is not supported.
+            
+        ValueError
+            This method also raises a `ValueError` if the dimension of input 'x' is not matched with the inputs.
+            
+        """
+        x = self._check_point(x)
+        return self._differentiate_gradients(x, np.eye(self.n))
+
+    def _check_point(self, x):
+        """
+        Check that 'x' holds one value per input and convert it to a list.
+        """
+        # check that x is of supported type
+        if not isinstance(x, self._supported_vectors):
+            raise TypeError(f"Unsupported type '{type(x)}'")
+            
+        # check that x is 1-dimensional and has one value per input
+        if np.shape(x) != (self.n,):
+            raise ValueError(f"Input variables should be a 1-dimensional vector of length {self.n}.")
+            
+        # check that every element is a real number
+        for value in x:
+            if not isinstance(value, (*self._supported_scalars, np.number)):
+                raise TypeError(f"Unsupported type '{type(value)}' for input elements.")
+            
+        return list(x)
+
+    def _differentiate_gradients(self, x, tangents):
+        """
+        Compute the directional derivative(s) of the gradient(s) of the function(s) at 'x' along 'tangents'.
 
-            # unpack args and pass into f
-            z = self.f(*args)
-            gradients = ReverseMode.get_gradients(z)
-            return np.array([z.val, np.array([gradients[node] for node in args])], dtype = object)
\ No newline at end of file
+        Parameters
+        ----------
+        x : list
+            The point at which the gradient(s) are differentiated.
+
+        tangents : array-like
+            Tangent of every input, either a scalar or a vector of directions.
+
+        Returns
+        -------
+        numpy.ndarray
+            The method returns the derivative of every gradient component along the tangents.
+
+        """
+        functions = self.f if self.jacobian else [self.f]
+        columns = self._columns if self.jacobian else [list(range(self.n))]
+        results = []
+        
+        for f, function_columns in zip(functions, columns):
+            # the tape only stores scalars, so the dual numbers are carried by nodes
+            _, gradients = self._evaluate(f, [Dual(x[i], tangents[i]) for i in function_columns], tape = False)
+            
+            # gradient components that do not depend on the inputs have no dual part
+            result = np.zeros((self.n,) + np.shape(tangents[0]))
+            for i, gradient in zip(function_columns, gradients):
+                if isinstance(gradient, Dual):
+                    result[i] = gradient.dual
+            results.append(result)
+            
+        return np.array(results) if self.jacobian else results[0]
+
+    def _evaluate_fused(self, x, rows=None):
+        """
+        Evaluate every function on shared input nodes and differentiate them in one backward sweep.
+
+        Parameters
+        ----------
+        x : list
+            The point at which the functions are evaluated.
+
+        rows : range or None
+            Positions of the functions to evaluate. Defaults to all of them.
+
+        Returns
+        -------
+        f(x) and f'(x)
+            The method returns the values as an array of shape (k,) and the Jacobian as an array of shape (k, n).
+
+        """
+        rows = range(len(self.f)) if rows is None else rows
+        nodes = [Node(arg) for arg in x]
+        outputs = [self.f[k](*[nodes[i] for i in self._columns[k]]) for k in rows]
+        
+        # seed the adjoint of every output with its own unit vector;
+        # functions that do not depend on their inputs have no graph
+        m = len(outputs)
+        seeds = np.eye(m)
+        adjoints = {}
+        for k, output in enumerate(outputs):
+            if isinstance(output, Node):
+                adjoints[output] = adjoints.get(output, 0) + seeds[k]
+        
+        # a single sweep over the union of the graphs propagates the adjoints of all outputs
+        for parent in ReverseMode.topological_order(*adjoints):
+            v = adjoints[parent]
+            for child, gradient in parent.gradients:
+                adjoints[child] = adjoints.get(child, 0) + v * gradient
+        
+        vals = np.array([output.val if isinstance(output, Node) else output for output in outputs])
+        jacobian = np.zeros((m, self.n))
+        for i, node in enumerate(nodes):
+            jacobian[:, i] = adjoints.get(node, 0)
+        return vals, jacobian
+
+    def _get_values(self, x):
+        """
+        Evaluate the value(s) of the function(s) at 'x' without the backward sweep.
+
+        The local gradients of nodes are computed lazily, so no derivative is computed. Only the values
+        are memoized, so differentiating the same point next evaluates the function(s) again.
+        """
+        # reuse the memoized values or results of x
+        memoize = self.cache_size > 0 and isinstance(x, self._supported_vectors) and len(np.shape(x)) == 1
+        key = self._cache_key(x) if memoize else None
+        if key is not None and key in self._cache:
+            self._cache.move_to_end(key)
+            return copy.deepcopy(self._cache[key][0])
+
+        # check that x is of supported type
+        if not isinstance(x, self._supported_vectors):
+            raise TypeError(f"Unsupported type '{type(x)}'")
+            
+        # check that x is 1-dimensional
+        if len(np.shape(x)) != 1:
+            raise ValueError(f"Input variables should be a 1-dimensional.")
+
+        x = list(x)
+        functions = self.f if self.jacobian else [self.f]
+        columns = self._columns if self.jacobian else [list(range(len(x)))]
+        vals = []
+        for k, (f, function_columns) in enumerate(zip(functions, columns)):
+            args = [x[i] for i in function_columns]
+            if self.static:
+                # the static graph is rebound and its local gradients wait for the next sweep
+                graph = self._graphs.get(k)
+                if graph is None:
+                    graph = self._graphs[k] = StaticGraph(f, args)
+                else:
+                    graph.evaluate(args)
+                vals.append(graph.output.val)
+            else:
+                vals.append(f(*[Node(arg) for arg in args]).val)
+
+        vals = np.array(vals) if self.jacobian else vals[0]
+        # the graphs are released, and the derivatives are computed when they are asked for
+        if key is not None:
+            self._memoize(key, (vals, None))
+        return copy.deepcopy(vals)
+
+    def _evaluate_static(self, k, f, x):
+        """
+        Evaluate the k-th function on its static graph and differentiate it, building the graph at the first call.
+
+        Parameters
+        ----------
+        k : integer
+            Index of the function.
+
+        f : function
+            Function to evaluate.
+
+        x : list
+            Values of the arguments of 'f'.
+
+        Returns
+        -------
+        f(x) and f'(x)
+            The method returns the value of 'f' and a list of its derivatives with respect to every argument.
+
+        """
+        graph = self._graphs.get(k)
+        if graph is None:
+            graph = self._graphs[k] = StaticGraph(f, x)
+        else:
+            graph.evaluate(x)
+        return graph.output.val, graph.get_gradients()
+
+    def _evaluate(self, f, x, tape):
+        """
+        Evaluate 'f' on new leaves initialized with the values in 'x' and differentiate it.
+
+        Parameters
+        ----------
+        f : function
+            Function to evaluate.
+
+        x : list
+            Values of the arguments of 'f'.
+
+        tape : boolean
+            If True, the operations are recorded on a Tape instead of a graph of nodes.
+
+        Returns
+        -------
+        f(x) and f'(x)
+            The method returns the value of 'f' and a list of its derivatives with respect to every argument.
+
+        """
+        if tape:
+            tape = Tape()
+            args = [tape.variable(arg) for arg in x]
+            z = f(*args)
+            adjoints = tape.get_gradients(z)
+            return z.val, [adjoints[arg.index] for arg in args]
+
+        args = [Node(arg) for arg in x]
+        return ReverseMode._differentiate(f(*args), args)
+
+    @staticmethod
+    def _differentiate(z, args):
+        """
+        Differentiate the node 'z' with respect to the nodes in 'args'.
+
+        Returns
+        -------
+        f(x) and f'(x)
+            The method returns the value of 'z' and a list of its derivatives with respect to every node in 'args'.
+
+        """
+        gradients = ReverseMode.get_gradients(z)
+        return z.val, [gradients.get(arg, 0) for arg in args]
@@ -0,0 +1,242 @@
+# File       : static.py
+# Description: Reverse mode graph of nodes that is built once and re-evaluated in place
+#              when its leaves are bound to new values
+from autodiff.node import Node, _RULES, _DOMAINS
+
+class StaticGraph:
+    """Graph of the operations of a function, recorded once and replayed at every new point."""
+
+    def __init__(self, f, x, optimize=True):
+        """
+        Record the graph of 'f' evaluated at 'x'.
+
+        The graph is only valid for points at which 'f' performs the same operations, i.e. when the
+        control flow of 'f' does not depend on the values of its arguments.
+
+        Parameters
+        ----------
+        f : function
+            Function whose graph is recorded.
+
+        x : list
+            Values of the arguments of 'f' at which the graph is recorded.
+
+        optimize : boolean
+            If True, repeated operations are merged and operations simplified to constants are folded
+            before the graph is replayed, see `_optimize`.
+
+        """
+        self.nodes = []
+        self.leaves = [StaticNode(arg, graph=self) for arg in x]
+        self.output = f(*self.leaves)
+        if optimize:
+            self._optimize()
+        # a function returning a constant is held by a node without operations
+        if not isinstance(self.output, Node):
+            self.output = Node(self.output)
+        self._prune()
+
+    def _optimize(self):
+        """
+        Rewrite the recorded operations so that replaying and differentiating the graph does less work.
+
+        - Operations applying the same opcode to the same operands are merged into one node (hash-consing),
+          including the operands of additions and multiplications in swapped order.
+        - Multiplications by 0 are replaced by 0, and multiplications and divisions by 1 and additions
+          and subtractions of 0 by their other operand.
+        - Operations whose operands all became constants are folded into constants.
+
+        The merged and simplified nodes are dropped from the graph by `_prune`. Simplifying 'x * 0' to 0
+        assumes that 'x' is finite, and drops the domain checks of the operations only used through it.
+        """
+        replaced = {}
+        canonical = {}
+        for node in self.nodes:
+            operands = tuple(replaced.get(operand, operand) if isinstance(operand, Node) else operand
+                for operand in node.operands)
+            node.operands = operands
+
+            if not any(isinstance(operand, Node) for operand in operands):
+                # fold the operations whose operands are all constants
+                replaced[node] = _RULES[node.op][0](*operands)
+                continue
+
+            simplified = self._simplify(node.op, operands)
+            if simplified is not node.operands:
+                replaced[node] = simplified
+                continue
+
+            # merge the operation with an identical one recorded before it
+            keys = tuple((id(operand),) if isinstance(operand, Node) else (type(operand), operand)
+                for operand in operands)
+            if node.op in ("add", "mul"):
+                keys = tuple(sorted(keys, key = repr))
+            try:
+                key = (node.op, keys)
+                replaced[node] = canonical[key]
+            except KeyError:
+                canonical[key] = node
+            except TypeError:
+                # constants that cannot be hashed, e.g. arrays, are not merged
+                pass
+
+        if isinstance(self.output, Node):
+            self.output = replaced.get(self.output, self.output)
+
+    @staticmethod
+    def _simplify(op, operands):
+        """
+        Simplify an operation with a neutral or absorbing constant operand.
+
+        Returns
+        -------
+        Node, constant or tuple
+            The method returns the node or constant the operation is equal to, or 'operands' itself
+            if the operation cannot be simplified.
+
+        """
+        if len(operands) != 2:
+            return operands
+        a, b = operands
+        a_is_scalar = isinstance(a, Node._supported_scalars)
+        b_is_scalar = isinstance(b, Node._supported_scalars)
+        if op == "mul":
+            if (a_is_scalar and a == 0) or (b_is_scalar and b == 0):
+                return 0
+            if a_is_scalar and a == 1:
+                return b
+            if b_is_scalar and b == 1:
+                return a
+        elif op == "add":
+            if a_is_scalar and a == 0:
+                return b
+            if b_is_scalar and b == 0:
+                return a
+        elif op == "sub" or op == "truediv":
+            if b_is_scalar and b == (0 if op == "sub" else 1):
+                return a
+        return operands
+
+    def _prune(self):
+        """
+        Drop the operations that the output does not depend on.
+        """
+        reachable = {self.output}
+        nodes = []
+        # operations are recorded after their operands, so walking them backwards
+        # reaches every operation after all of the operations that use it
+        for node in reversed(self.nodes):
+            if node in reachable:
+                nodes.append(node)
+                reachable.update(operand for operand in node.operands if isinstance(operand, Node))
+        nodes.reverse()
+        self.nodes = nodes
+
+        # resolve the rules of every operation once; constant operands are held by nodes that are
+        # never rebound so that the values of all operands are read the same way
+        self._steps = []
+        for node in nodes:
+            operands = tuple(operand if isinstance(operand, Node) else Node(operand) for operand in node.operands)
+            self._steps.append((node, _RULES[node.op][0], operands, _DOMAINS.get(node.op)))
+
+    def record(self, node):
+        """
+        Append an operation to the graph.
+
+        Parameters
+        ----------
+        node : StaticNode
+            Node holding the operation. Leaves are not recorded.
+
+        """
+        if node.op is not None:
+            self.nodes.append(node)
+
+    def evaluate(self, x):
+        """
+        Bind the leaves to the values in 'x' and update the value of every operation in place.
+
+        The local gradients of the operations are reset and recomputed by the next backward sweep.
+
+        Parameters
+        ----------
+        x : list
+            New values of the arguments of the function.
+
+        Raises
+        ------
+        ValueError
+            This method raises a `ValueError` if an operation is evaluated outside of its domain.
+
+        """
+        for leaf, val in zip(self.leaves, x):
+            leaf.val = val
+
+        for node, value, operands, domain in self._steps:
+            # check that the operation is defined at the new values
+            if domain is not None and Node._any(domain[0](operands[0].val)):
+                raise ValueError(domain[1])
+            # unary operations, which make up most graphs, avoid packing their arguments
+            if len(operands) == 1:
+                node.val = value(operands[0].val)
+            else:
+                node.val = value(operands[0].val, operands[1].val)
+            # the local gradients are recomputed when the backward sweep reaches the node
+            node._gradients = None
+
+    def get_gradients(self):
+        """
+        Compute the derivatives of the output with respect to the leaves at their current values.
+
+        Returns
+        -------
+        list
+            The method returns the derivative of the output with respect to every leaf.
+
+        """
+        gradients = {self.output: 1}
+
+        # the operations are recorded in topological order, so sweeping them backwards
+        # visits every node after all of its parents
+        for parent in reversed(self.nodes):
+            v = gradients[parent]
+            for child, gradient in parent.gradients:
+                gradients[child] = gradients.get(child, 0) + v * gradient
+
+        return [gradients.get(leaf, 0) for leaf in self.leaves]
+
+
+class StaticNode(Node):
+    """Node that remembers its operation so that its graph can be re-evaluated."""
+
+    __slots__ = ("graph",)
+
+    def __init__(self, val, gradients=(), op=None, operands=(), graph=None):
+        """
+        Initialize a node and record its operation on a graph.
+
+        Parameters
+        ----------
+        val : integer or float
+            Value of the node.
+
+        gradients : tuple or None
+            Local gradients of the node.
+            Consists of 0 to 2 tuples of (`child node`, `local gradient value`)
+            If None, they are computed from `op` and `operands` when they are first needed.
+
+        op : string
+            Name of the operation that produced the node, or None for a leaf.
+
+        operands : tuple
+            Nodes and constants the operation was applied to.
+
+        graph : StaticGraph
+            Graph to record on. Defaults to the graph of the first operand that is a node.
+
+        """
+        super().__init__(val, gradients, op, operands)
+        if graph is None:
+            graph = next(operand for operand in operands if isinstance(operand, Node)).graph
+        self.graph = graph
+        graph.record(self)
@@ -0,0 +1,175 @@
+# File       : tape.py
+# Description: Array-backed Wengert list that records reverse mode operations
+#              into preallocated NumPy arrays instead of a graph of Node objects
+import numpy as np
+
+from autodiff.node import Node
+
+class Tape:
+    """Wengert list storing the values, parent indices and local partials of recorded operations."""
+
+    def __init__(self, capacity=1024):
+        """
+        Initialize an empty tape with room for 'capacity' operations.
+
+        Parameters
+        ----------
+        capacity : integer
+            Number of operations the tape can hold before its arrays are grown.
+
+        """
+        capacity = max(int(capacity), 1)
+        self.values = np.empty(capacity)
+        self.parents = np.full((capacity, 2), -1, dtype=np.int64)
+        self.partials = np.zeros((capacity, 2))
+        self.size = 0
+
+    def __len__(self):
+        """
+        Return the number of operations recorded on the tape.
+        """
+        return self.size
+
+    def _grow(self):
+        """
+        Double the capacity of the tape arrays.
+        """
+        capacity = 2 * len(self.values)
+        values = np.empty(capacity)
+        parents = np.full((capacity, 2), -1, dtype=np.int64)
+        partials = np.zeros((capacity, 2))
+        values[:self.size] = self.values[:self.size]
+        parents[:self.size] = self.parents[:self.size]
+        partials[:self.size] = self.partials[:self.size]
+        self.values, self.parents, self.partials = values, parents, partials
+
+    def record(self, val, gradients=()):
+        """
+        Append one operation to the tape.
+
+        Parameters
+        ----------
+        val : integer or float
+            Value of the operation.
+
+        gradients : tuple
+            Local gradients of the operation.
+            Consists of 0 to 2 tuples of (`child node`, `local gradient value`)
+
+        Returns
+        -------
+        integer
+            The method returns the index of the recorded operation on the tape.
+
+        """
+        if self.size == len(self.values):
+            self._grow()
+        index = self.size
+        self.values[index] = val
+        for k, (child, gradient) in enumerate(gradients):
+            self.parents[index, k] = child.index
+            self.partials[index, k] = gradient
+        self.size += 1
+        return index
+
+    def variable(self, val):
+        """
+        Record an independent variable on the tape.
+
+        Parameters
+        ----------
+        val : integer or float
+            Value of the variable.
+
+        Returns
+        -------
+        TapeNode
+            The method returns a handle to the variable.
+
+        """
+        return TapeNode(val, tape=self)
+
+    def get_gradients(self, node):
+        """
+        Compute the derivatives of `node` with respect to every operation recorded before it.
+
+        Parameters
+        ----------
+        node : TapeNode
+            Output whose derivatives are computed.
+
+        Returns
+        -------
+        numpy.ndarray
+            The method returns the adjoint of every operation on the tape, indexed by tape position.
+            Operations that `node` does not depend on have an adjoint of 0.
+
+        """
+        if not isinstance(node, TapeNode) or node.tape is not self:
+            raise TypeError(f"Unsupported type '{type(node)}'")
+
+        # operations are recorded after their children, so sweeping the tape
+        # backwards from the output visits every operation after all of its parents
+        adjoints = [None] * (node.index + 1)
+        adjoints[node.index] = 1.0
+        parents = self.parents[:node.index + 1].tolist()
+        partials = self.partials[:node.index + 1].tolist()
+        for i in range(node.index, -1, -1):
+            v = adjoints[i]
+            # skip operations the output does not depend on
+            if v is None:
+                continue
+            for child, gradient in zip(parents[i], partials[i]):
+                if child < 0:
+                    break
+                if adjoints[child] is None:
+                    adjoints[child] = v * gradient
+                else:
+                    adjoints[child] += v * gradient
+
+        gradients = np.zeros(self.size)
+        gradients[:node.index + 1] = [0.0 if v is None else v for v in adjoints]
+        return gradients
+
+class TapeNode(Node):
+    """Thin handle to an operation recorded on a Tape."""
+
+    __slots__ = ("tape", "index")
+
+    def __init__(self, val, gradients=(), op=None, operands=(), tape=None):
+        """
+        Record an operation on a tape and initialize a handle to it.
+
+        Parameters
+        ----------
+        val : integer or float
+            Value of the operation.
+
+        gradients : tuple or None
+            Local gradients of the operation.
+            Consists of 0 to 2 tuples of (`child node`, `local gradient value`)
+
+        op : string
+            Name of the operation, used to compute its local gradients if they are not given.
+
+        operands : tuple
+            Nodes and constants the operation was applied to.
+
+        tape : Tape
+            Tape to record on. Defaults to the tape of the first child node.
+
+        """
+        # the tape stores the local gradients of an operation as soon as it is recorded
+        if gradients is None:
+            gradients = self._local_gradients(val, op, operands)
+        if tape is None:
+            tape = gradients[0][0].tape
+        self.tape = tape
+        self.index = tape.record(val, gradients)
+
+    @property
+    def val(self):
+        """
+        Value of the operation, read from the tape.
+        """
+        return self.tape.values.item(self.index)
@@ -0,0 +1,782 @@
+# File       : taylor.py
+# Description: Truncated Taylor polynomial class that propagates the derivatives
+#              of any order through basic arithmetic and elementary functions
+import numpy as np
+from math import factorial
+
+class Taylor():
+    """Truncated Taylor polynomial implementation to compute higher order derivatives in a single evaluation.
+
+    The polynomial stores the normalized coefficients f(t), f'(t), f''(t)/2!, ..., f^(k)(t)/k! of a function
+    of one variable t, and every operation computes the coefficients of its result with the O(k^2)
+    recurrences of automatic differentiation instead of nesting k levels of dual numbers.
+    """
+
+    __slots__ = ("coefficients",)
+
+    _supported_scalars = (int, float)
+
+    def __init__(self, real, order = 1, tangent = 1.0):
+        """
+        Initialize a Taylor polynomial of the variable t evaluated at 'real' + 'tangent' * t.
+
+        Parameters
+        ----------
+        real : integer, float or numpy.ndarray
+            Value of the polynomial.
+            An array of values evaluates a batch of points at once.
+
+        order : integer
+            Highest order of the derivatives carried by the polynomial.
+
+        tangent : integer, float or numpy.ndarray
+            First order coefficient of the polynomial, i.e. the direction in which the derivatives are taken.
+
+        Raises
+        ------
+        TypeError
+            This method raises a `TypeError` if 'order' is not an integer.
+
+        ValueError
+            This method raises a `ValueError` if 'order' is negative.
+
+        """
+        # check that the order is a non-negative integer
+        if not isinstance(order, (int, np.integer)) or isinstance(order, bool):
+            raise TypeError(f"Unsupported order type '{type(order)}'")
+        if order < 0:
+            raise ValueError("The order of a Taylor polynomial cannot be negative.")
+
+        coefficients = np.zeros((order + 1,) + np.broadcast(real, tangent).shape)
+        coefficients[0] = real
+        if order > 0:
+            coefficients[1] = tangent
+        self.coefficients = coefficients
+
+    @staticmethod
+    def _new(coefficients):
+        """
+        Create a Taylor polynomial from its normalized coefficients.
+        """
+        taylor = Taylor.__new__(Taylor)
+        taylor.coefficients = coefficients
+        return taylor
+
+    @property
+    def real(self):
+        """
+        Value of the polynomial.
+        """
+        return self.coefficients[0]
+
+    @property
+    def order(self):
+        """
+        Highest order of the derivatives carried by the polynomial.
+        """
+        return len(self.coefficients) - 1
+
+    def derivatives(self):
+        """
+        Compute the derivatives of the polynomial from its normalized coefficients.
+
+        Returns
+        -------
+        numpy.ndarray
+            The method returns the value and the derivatives of order 1 to k as an array of length k + 1.
+
+        """
+        factorials = np.array([factorial(j) for j in range(self.order + 1)], dtype = float)
+        return self.coefficients * factorials.reshape((-1,) + (1,) * (self.coefficients.ndim - 1))
+
+    @staticmethod
+    def _any(condition):
+        """
+        Check whether a condition on the real part holds, for a scalar or for any element of a batch.
+        """
+        # avoid the overhead of np.any for the common scalar case
+        if isinstance(condition, np.ndarray):
+            return condition.any()
+        return bool(condition)
+
+    ### Recurrences on Normalized Coefficients ###
+    @staticmethod
+    def _align(a, b):
+        """
+        Truncate two coefficient arrays to the lower of their orders.
+        """
+        k = min(len(a), len(b))
+        return a[:k], b[:k]
+
+    @staticmethod
+    def _weights(i, a):
+        """
+        Shape the indices 'i' so that they broadcast against the coefficients of 'a'.
+        """
+        return i.reshape((-1,) + (1,) * (a.ndim - 1))
+
+    @staticmethod
+    def _constant(value, a):
+        """
+        Create the coefficients of a constant with the order of 'a'.
+        """
+        c = np.zeros(np.broadcast(a, value).shape)
+        c[0] = value
+        return c
+
+    @staticmethod
+    def _mul(a, b):
+        """
+        Compute the coefficients of the product of two polynomials: c_j = sum_i a_i b_(j-i).
+        """
+        a, b = Taylor._align(a, b)
+        c = np.zeros(np.broadcast(a, b).shape)
+        for j in range(len(c)):
+            c[j] = (a[:j + 1] * b[j::-1]).sum(axis = 0)
+        return c
+
+    @staticmethod
+    def _div(a, b):
+        """
+        Compute the coefficients of the quotient of two polynomials: c_j = (a_j - sum_(i>0) b_i c_(j-i)) / b_0.
+        """
+        a, b = Taylor._align(a, b)
+        c = np.zeros(np.broadcast(a, b).shape)
+        for j in range(len(c)):
+            i = np.arange(1, j + 1)
+            c[j] = (a[j] - (b[i] * c[j - i]).sum(axis = 0)) / b[0]
+        return c
+
+    @staticmethod
+    def _exp(a):
+        """
+        Compute the coefficients of exp(a): e_j = sum_(i>0) i a_i e_(j-i) / j.
+        """
+        e = np.zeros(a.shape)
+        e[0] = np.exp(a[0])
+        for j in range(1, len(a)):
+            i = np.arange(1, j + 1)
+            e[j] = (Taylor._weights(i, a) * a[i] * e[j - i]).sum(axis = 0) / j
+        return e
+
+    @staticmethod
+    def _log(a):
+        """
+        Compute the coefficients of the natural logarithm of a: l_j = (a_j - sum_(0<i<j) i l_i a_(j-i) / j) / a_0.
+        """
+        l = np.zeros(a.shape)
+        l[0] = np.log(a[0])
+        for j in range(1, len(a)):
+            i = np.arange(1, j)
+            l[j] = (a[j] - (Taylor._weights(i, a) * l[i] * a[j - i]).sum(axis = 0) / j) / a[0]
+        return l
+
+    @staticmethod
+    def _pow(a, r):
+        """
+        Compute the coefficients of a ** r for a real exponent r: p_j = sum_(i>0) ((r + 1) i - j) a_i p_(j-i) / (j a_0).
+        """
+        # integer powers are expanded into products, which are also defined when a_0 is 0
+        if isinstance(r, float) and r.is_integer():
+            r = int(r)
+        if isinstance(r, (int, np.integer)) and r >= 0:
+            p = Taylor._constant(1, a)
+            while r:
+                if r & 1:
+                    p = Taylor._mul(p, a)
+                a = Taylor._mul(a, a)
+                r >>= 1
+            return p
+
+        p = np.zeros(a.shape)
+        p[0] = a[0] ** r
+        for j in range(1, len(a)):
+            i = np.arange(1, j + 1)
+            p[j] = (((r + 1) * Taylor._weights(i, a) - j) * a[i] * p[j - i]).sum(axis = 0) / (j * a[0])
+        return p
+
+    @staticmethod
+    def _sin_cos(a, sign = -1):
+        """
+        Compute the coefficients of sin(a) and cos(a), or of sinh(a) and cosh(a) if 'sign' is 1:
+        s_j = sum_(i>0) i a_i c_(j-i) / j and c_j = sign * sum_(i>0) i a_i s_(j-i) / j.
+        """
+        s = np.zeros(a.shape)
+        c = np.zeros(a.shape)
+        s[0], c[0] = (np.sin(a[0]), np.cos(a[0])) if sign < 0 else (np.sinh(a[0]), np.cosh(a[0]))
+        for j in range(1, len(a)):
+            i = np.arange(1, j + 1)
+            w = Taylor._weights(i, a) * a[i]
+            s[j] = (w * c[j - i]).sum(axis = 0) / j
+            c[j] = sign * (w * s[j - i]).sum(axis = 0) / j
+        return s, c
+
+    @staticmethod
+    def _integrate(y0, a, q):
+        """
+        Compute the coefficients of the function with value 'y0' whose derivative is a' q.
+        """
+        # coefficients of the derivative of a, of one order less
+        i = np.arange(1, len(a))
+        d = Taylor._mul(Taylor._weights(i, a) * a[i], q[:-1]) if len(a) > 1 else a[:0]
+        y = np.zeros(np.broadcast(a, y0).shape)
+        y[0] = y0
+        y[1:] = d / Taylor._weights(i, a)
+        return y
+
+    ### Elementary Functions ###
+    def __add__(self, other):
+        """
+        Compute the addition of two Taylor polynomials or of one Taylor polynomial and one real number.
+
+        Parameters
+        ----------
+        other : Taylor, Scalar
+            Input number which is added to a Taylor polynomial.
+
+        Returns
+        -------
+        Taylor
+            The method returns the value of adding two Taylor polynomials or one Taylor polynomial and one real number.
+
+        Raises
+        ------
+        TypeError
+            This method raises a `TypeError` if the type of input number 'other' is not supported.
+
+        """
+        if isinstance(other, Taylor):
+            # taylor
+            a, b = Taylor._align(self.coefficients, other.coefficients)
+            return Taylor._new(a + b)
+        # check if other is of a supported type
+        if not isinstance(other, self._supported_scalars):
+            raise TypeError(f"Unsupported type '{type(other)}'")
+        # scalar
+        return Taylor._new(self.coefficients + Taylor._constant(other, self.coefficients))
+
+    def __radd__(self, other):
+        """
+        Overload the addition function to compute the addition of a real number and a Taylor polynomial.
+
+        Parameters
+        ----------
+        other : Scalar
+            Input number to which a Taylor polynomial is added.
+
+        Returns
+        -------
+        Taylor
+            The method returns the value of the addition.
+
+        """
+        return self.__add__(other)
+
+    def __sub__(self, other):
+        """
+        Compute the subtraction of 'other' from a Taylor polynomial.
+
+        Parameters
+        ----------
+        other : Taylor, Scalar
+            Input number which is subtracted from a Taylor polynomial.
+
+        Returns
+        -------
+        Taylor
+            The method returns the resulting value of subtraction.
+
+        Raises
+        ------
+        TypeError
+            This method raises a `TypeError` if the type of input number other is not supported.
+
+        """
+        if isinstance(other, Taylor):
+            # taylor
+            a, b = Taylor._align(self.coefficients, other.coefficients)
+            return Taylor._new(a - b)
+        # check if other is of a supported type
+        if not isinstance(other, self._supported_scalars):
+            raise TypeError(f"Unsupported type '{type(other)}'")
+        # scalar
+        return Taylor._new(self.coefficients - Taylor._constant(other, self.coefficients))
+
+    def __rsub__(self, other):
+        """
+        Compute the subtraction of a Taylor polynomial from 'other'.
+
+        Parameters
+        ----------
+        other : Scalar
+            Input number from which a Taylor polynomial is subtracted.
+
+        Returns
+        -------
+        Taylor
+            The method returns the resulting value of subtraction.
+
+        """
+        return -self + other
+
+    def __mul__(self, other):
+        """
+        Compute the multiplication of two Taylor polynomials or of one Taylor polynomial and one real number.
+
+        Parameters
+        ----------
+        other : Taylor, Scalar
+            Input number which is multiplied with a Taylor polynomial.
+
+        Returns
+        -------
+        Taylor
+            The method returns the value of the multiplication.
+
+        Raises
+        ------
+        TypeError
+            This method raises a `TypeError` if the type of input number other is not supported.
+
+        """
+        if isinstance(other, Taylor):
+            # taylor
+            return Taylor._new(Taylor._mul(self.coefficients, other.coefficients))
+        # check if other is of a supported type
+        if not isinstance(other, self._supported_scalars):
+            raise TypeError(f"Unsupported type '{type(other)}'")
+        # scalar
+        return Taylor._new(self.coefficients * other)
+
+    def __rmul__(self, other):
+        """
+        Overload the multiplication function to compute the multiplication of a real number and a Taylor polynomial.
+
+        Parameters
+        ----------
+        other : Scalar
+            Input number which is multiplied with a Taylor polynomial.
+
+        Returns
+        -------
+        Taylor
+            The method returns the value of the multiplication.
+
+        """
+        return self.__mul__(other)
+
+    def __truediv__(self, other):
+        """
+        Compute the division of a Taylor polynomial by 'other'.
+
+        Parameters
+        ----------
+        other : Taylor, Scalar
+            Input number which divides a Taylor polynomial.
+
+        Returns
+        -------
+        Taylor
+            The method returns the value of the division.
+
+        Raises
+        ------
+        TypeError
+            This method raises a `TypeError` if the type of input number other is not supported.
+
+        """
+        if isinstance(other, Taylor):
+            # taylor
+            return Taylor._new(Taylor._div(self.coefficients, other.coefficients))
+        # check if other is of a supported type
+        if not isinstance(other, self._supported_scalars):
+            raise TypeError(f"Unsupported type '{type(other)}'")
+        # scalar
+        return Taylor._new(self.coefficients / other)
+
+    def __rtruediv__(self, other):
+        """
+        Compute the division of 'other' by a Taylor polynomial.
+
+        Parameters
+        ----------
+        other : Scalar
+            Input number which is divided by a Taylor polynomial.
+
+        Returns
+        -------
+        Taylor
+            The method returns the value of the division.
+
+        Raises
+        ------
+        TypeError
+            This method raises a `TypeError` if the type of input number other is not supported.
+
+        """
+        # check if other is of a supported type
+        if not isinstance(other, self._supported_scalars):
+            raise TypeError(f"Unsupported type '{type(other)}'")
+        return Taylor._new(Taylor._div(Taylor._constant(other, self.coefficients), self.coefficients))
+
+    def __neg__(self):
+        """
+        Compute the negation of one Taylor polynomial.
+
+        Returns
+        -------
+        Taylor
+            The method returns the value of the negation of one Taylor polynomial.
+
+        """
+        return Taylor._new(-self.coefficients)
+
+    def __pow__(self, other):
+        """
+        Compute the exponentiation of raising one Taylor polynomial to the power of another Taylor polynomial or of one real number.
+
+        Parameters
+        ----------
+        other : Taylor, Scalar
+            Input exponent to which the base Taylor polynomial will be raised.
+
+        Returns
+        -------
+        Taylor
+            The method returns the value of the exponentiation.
+
+        Raises
+        ------
+        TypeError
+            This method raises a `TypeError` if the type of input exponent other is not supported.
+
+        """
+        if isinstance(other, Taylor):
+            # taylor
+            return Taylor._new(Taylor._exp(Taylor._mul(other.coefficients, Taylor._log(self.coefficients))))
+        # check if other is of supported type
+        if not isinstance(other, self._supported_scalars):
+            raise TypeError(f"Unsupported type '{type(other)}'")
+        # scalar
+        return Taylor._new(Taylor._pow(self.coefficients, other))
+
+    def __rpow__(self, other):
+        """
+        Compute the exponentiation of raising a real number to the power of a Taylor polynomial.
+
+        Parameters
+        ----------
+        other : Scalar
+            Input base which will be raised to the power of a Taylor polynomial.
+
+        Returns
+        -------
+        Taylor
+            The method returns the value of the exponentiation.
+
+        Raises
+        ------
+        TypeError
+            This method raises a `TypeError` if the type of input base other is not supported.
+
+        """
+        # check if other is of supported type
+        if not isinstance(other, self._supported_scalars):
+            raise TypeError(f"Unsupported type '{type(other)}'")
+        return Taylor._new(Taylor._exp(self.coefficients * np.log(other)))
+
+    ### Comparison Operators ###
+    def __lt__(self, other):
+        """
+        Compare whether the real part of a Taylor polynomial is less than a real number or the real part of another Taylor polynomial.
+
+        Parameters
+        ----------
+        other : Taylor, Scalar
+            Input number which is compared to a Taylor polynomial.
+
+        Returns
+        -------
+        bool
+            The method returns the result of the comparison of the real parts.
+
+        """
+        if isinstance(other, Taylor):
+            return self.real < other.real
+        return self.real < other
+
+    def __le__(self, other):
+        """
+        Compare whether the real part of a Taylor polynomial is less than or equal to a real number or the real part of another Taylor polynomial.
+
+        Parameters
+        ----------
+        other : Taylor, Scalar
+            Input number which is compared to a Taylor polynomial.
+
+        Returns
+        -------
+        bool
+            The method returns the result of the comparison of the real parts.
+
+        """
+        if isinstance(other, Taylor):
+            return self.real <= other.real
+        return self.real <= other
+
+    def __gt__(self, other):
+        """
+        Compare whether the real part of a Taylor polynomial is greater than a real number or the real part of another Taylor polynomial.
+
+        Parameters
+        ----------
+        other : Taylor, Scalar
+            Input number which is compared to a Taylor polynomial.
+
+        Returns
+        -------
+        bool
+            The method returns the result of the comparison of the real parts.
+
+        """
+        if isinstance(other, Taylor):
+            return self.real > other.real
+        return self.real > other
+
+    def __ge__(self, other):
+        """
+        Compare whether the real part of a Taylor polynomial is greater than or equal to a real number or the real part of another Taylor polynomial.
+
+        Parameters
+        ----------
+        other : Taylor, Scalar
+            Input number which is compared to a Taylor polynomial.
+
+        Returns
+        -------
+        bool
+            The method returns the result of the comparison of the real parts.
+
+        """
+        if isinstance(other, Taylor):
+            return self.real >= other.real
+        return self.real >= other
+
+    ### Square Root Function ###
+    def sqrt(self):
+        """
+        Compute the square root of one Taylor polynomial.
+
+        Returns
+        -------
+        Taylor
+            The method returns the square root of one Taylor polynomial.
+
+        Raises
+        ------
+        ValueError
+            This method raises a `ValueError` if the real part of the Taylor polynomial is less than zero.
+
+        """
+        # check that the real part of the polynomial is greater than or equal to 0.
+        if self._any(self.real < 0):
+            raise ValueError("Cannot square root: real part of Taylor polynomial is lesser than 0.")
+        return Taylor._new(Taylor._pow(self.coefficients, 1/2))
+
+    ### Exponential Function ###
+    def exp(self):
+        """
+        Compute the exponentiation of raising the natural number to the power of one Taylor polynomial.
+
+        Returns
+        -------
+        Taylor
+            The method returns the value of raising the natural number to the power of one Taylor polynomial.
+
+        """
+        return Taylor._new(Taylor._exp(self.coefficients))
+
+    ### Logarithmic Function ###
+    def log(self, base=np.e):
+        """
+        Compute the logarithm to find the power to which the input base must be raised to yield the given Taylor polynomial.
+
+        Parameters
+        ----------
+        base : Scalar
+            Input base which is raised to yield a given Taylor polynomial.
+            Defaults to the natural logarithm.
+
+        Returns
+        -------
+        Taylor
+            The method returns the value of the logarithm.
+
+        Raises
+        ------
+        TypeError
+            This method raises a `TypeError` if the type of input base number is not supported.
+
+        ValueError
+            This method raises a `ValueError` if the real part of the Taylor polynomial or the value of input base is less than zero.
+
+        """
+        # check if base is of supported type
+        if not isinstance(base, self._supported_scalars):
+            raise TypeError(f"Unsupported base type '{type(base)}'")
+        # check that the base is above 0.
+        if base <= 0:
+            raise ValueError("Cannot log: Base is lesser than or equal to 0.")
+        # check that the real part of the polynomial is above 0.
+        if self._any(self.real <= 0):
+            raise ValueError("Cannot log: Real part of the Taylor polynomial is lesser than or equal to 0.")
+        return Taylor._new(Taylor._log(self.coefficients) / np.log(base))
+
+    ### Logistic Function ###
+    def standard_logistic(self):
+        """
+        Compute the value of the standard logistic function with the given Taylor polynomial as input parameter.
+
+        Returns
+        -------
+        Taylor
+            The method returns the value of the standard logistic function with the given Taylor polynomial as input parameter.
+
+        """
+        return 1 / (1 + Taylor.exp(-self))
+
+    ### Trigonometric Functions ###
+    def sin(self):
+        """
+        Compute the value of the sine function with the given Taylor polynomial as input parameter.
+
+        Returns
+        -------
+        Taylor
+            The method returns the value of the sine function with the given Taylor polynomial as input parameter.
+
+        """
+        return Taylor._new(Taylor._sin_cos(self.coefficients)[0])
+
+    def cos(self):
+        """
+        Compute the value of the cosine function with the given Taylor polynomial as input parameter.
+
+        Returns
+        -------
+        Taylor
+            The method returns the value of the cosine function with the given Taylor polynomial as input parameter.
+
+        """
+        return Taylor._new(Taylor._sin_cos(self.coefficients)[1])
+
+    def tan(self):
+        """
+        Compute the value of the tangent function with the given Taylor polynomial as input parameter.
+
+        Returns
+        -------
+        Taylor
+            The method returns the value of the tangent function with the given Taylor polynomial as input parameter.
+
+        """
+        s, c = Taylor._sin_cos(self.coefficients)
+        return Taylor._new(Taylor._div(s, c))
+
+    ### Inverse Trigonometric Functions ###
+    def arcsin(self):
+        """
+        Compute the value of the arcsine function with the given Taylor polynomial as input parameter.
+
+        Returns
+        -------
+        Taylor
+            The method returns the value of the arcsine function with the given Taylor polynomial as input parameter.
+
+        Raises
+        ------
+        ValueError
+            This method raises a `ValueError` if the real part of the Taylor polynomial is smaller than -1 or greater than 1.
+
+        """
+        # check that the real part of the polynomial is between -1 and 1.
+        if self._any((self.real >= 1) | (self.real <= -1)):
+            raise ValueError("Cannot arcsin: Real part of Taylor polynomial is not between -1 and 1.")
+        a = self.coefficients
+        q = Taylor._pow(Taylor._constant(1, a) - Taylor._mul(a, a), -1/2)
+        return Taylor._new(Taylor._integrate(np.arcsin(a[0]), a, q))
+
+    def arccos(self):
+        """
+        Compute the value of the arccosine function with the given Taylor polynomial as input parameter.
+
+        Returns
+        -------
+        Taylor
+            The method returns the value of the arccosine function with the given Taylor polynomial as input parameter.
+
+        Raises
+        ------
+        ValueError
+            This method raises a `ValueError` if the real part of the Taylor polynomial is smaller than -1 or greater than 1.
+
+        """
+        # check that the real part of the polynomial is between -1 and 1.
+        if self._any((self.real >= 1) | (self.real <= -1)):
+            raise ValueError("Cannot arccos: Real part of Taylor polynomial is not between -1 and 1.")
+        a = self.coefficients
+        q = -Taylor._pow(Taylor._constant(1, a) - Taylor._mul(a, a), -1/2)
+        return Taylor._new(Taylor._integrate(np.arccos(a[0]), a, q))
+
+    def arctan(self):
+        """
+        Compute the value of the arctangent function with the given Taylor polynomial as input parameter.
+
+        Returns
+        -------
+        Taylor
+            The method returns the value of the arctangent function with the given Taylor polynomial as input parameter.
+
+        """
+        a = self.coefficients
+        one = Taylor._constant(1, a)
+        q = Taylor._div(one, one + Taylor._mul(a, a))
+        return Taylor._new(Taylor._integrate(np.arctan(a[0]), a, q))
+
+    ### Hyperbolic Functions ###
+    def sinh(self):
+        """
+        Compute the value of the hyperbolic sine function with the given Taylor polynomial as input parameter.
+
+        Returns
+        -------
+        Taylor
+            The method returns the value of the hyperbolic sine function with the given Taylor polynomial as input parameter.
+
+        """
+        return Taylor._new(Taylor._sin_cos(self.coefficients, sign = 1)[0])
+
+    def cosh(self):
+        """
+        Compute the value of the hyperbolic cosine function with the given Taylor polynomial as input parameter.
+
+        Returns
+        -------
+        Taylor
+            The method returns the value of the hyperbolic cosine function with the given Taylor polynomial as input parameter.
+
+        """
+        return Taylor._new(Taylor._sin_cos(self.coefficients, sign = 1)[1])
+
+    def tanh(self):
+        """
+        Compute the value of the hyperbolic tangent function with the given Taylor polynomial as input parameter.
+
+        Returns
+        -------
+        Taylor
+            The method returns the value of the hyperbolic tangent function with the given Taylor polynomial as input parameter.
+
+        """
+        s, c = Taylor._sin_cos(self.coefficients, sign = 1)
+        return Taylor._new(Taylor._div(s, c))
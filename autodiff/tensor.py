@@ -0,0 +1,321 @@
+# File       : tensor.py
+# Description: Array-valued nodes for reverse mode, whose local gradients are
+#              vector-Jacobian products that handle broadcasting, sums and
+#              dot products
+import numpy as np
+
+from autodiff.node import Node
+
+class Tensor(Node):
+    """Node holding a NumPy array, so that a vector model is made of a handful of nodes."""
+
+    __slots__ = ()
+
+    # numpy defers the operators between arrays and tensors to the reflected methods of the tensor
+    __array_ufunc__ = None
+
+    _supported_scalars = (int, float, np.ndarray)
+
+    @property
+    def shape(self):
+        """
+        Shape of the value of the tensor.
+        """
+        return np.shape(self.val)
+
+    @property
+    def gradients(self):
+        """
+        Local gradients of a tensor.
+
+        Every local gradient is a vector-Jacobian product that the backward sweep multiplies with the adjoint
+        of the tensor. The partials of elementwise operations are reduced to the shape of the operand they were
+        broadcast from.
+        """
+        gradients = self._gradients
+        if gradients is not None:
+            return gradients
+
+        if self.op in _VJPS:
+            args = [operand.val if isinstance(operand, Node) else operand for operand in self.operands]
+            gradients = tuple((operand, _VJP(vjp, args)) for operand, vjp in zip(self.operands, _VJPS[self.op])
+                if isinstance(operand, Node))
+        else:
+            gradients = tuple((child, _VJP(_elementwise, (partial, np.shape(child.val))))
+                for child, partial in self._local_gradients(self.val, self.op, self.operands))
+        self._gradients = gradients
+        return gradients
+
+    ### Reflected Operators ###
+    # a node on the left of a tensor defers to these methods, so that the result is a tensor
+    def __radd__(self, other):
+        """
+        Compute the addition of 'other' and a tensor.
+
+        Parameters
+        ----------
+        other : Node, Constant
+            Input object to which the tensor is added.
+
+        Returns
+        -------
+        Tensor
+            The method returns a new tensor resulting from the addition.
+
+        """
+        return self.__add__(other)
+
+    def __rsub__(self, other):
+        """
+        Compute the subtraction of a tensor from 'other'.
+
+        Parameters
+        ----------
+        other : Node, Constant
+            Input object from which the tensor is subtracted.
+
+        Returns
+        -------
+        Tensor
+            The method returns a new tensor resulting from the subtraction.
+
+        """
+        if isinstance(other, Node):
+            return self.__class__(other.val - self.val, None, "sub", (other, self))
+        return super().__rsub__(other)
+
+    def __rmul__(self, other):
+        """
+        Compute the multiplication of 'other' and a tensor.
+
+        Parameters
+        ----------
+        other : Node, Constant
+            Input object which is multiplied with the tensor.
+
+        Returns
+        -------
+        Tensor
+            The method returns a new tensor resulting from the multiplication.
+
+        """
+        return self.__mul__(other)
+
+    def __rtruediv__(self, other):
+        """
+        Compute the division of 'other' by a tensor.
+
+        Parameters
+        ----------
+        other : Node, Constant
+            Input object which is divided by the tensor.
+
+        Returns
+        -------
+        Tensor
+            The method returns a new tensor resulting from the division.
+
+        """
+        if isinstance(other, Node):
+            return self.__class__(other.val / self.val, None, "truediv", (other, self))
+        return super().__rtruediv__(other)
+
+    def __rpow__(self, other):
+        """
+        Compute the exponentiation of raising 'other' to the power of a tensor.
+
+        Parameters
+        ----------
+        other : Node, Constant
+            Input object which is raised to the power of the tensor.
+
+        Returns
+        -------
+        Tensor
+            The method returns a new tensor resulting from the exponentiation.
+
+        """
+        if isinstance(other, Node):
+            return self.__class__(other.val ** self.val, None, "pow", (other, self))
+        return super().__rpow__(other)
+
+    ### Reductions and Products ###
+    def sum(self, axis=None):
+        """
+        Compute the sum of the elements of a tensor.
+
+        Parameters
+        ----------
+        axis : None, integer or tuple of integers
+            Axis or axes along which the elements are summed. Defaults to all of them.
+
+        Returns
+        -------
+        Tensor
+            The method returns a new tensor holding the sum.
+
+        """
+        return self.__class__(np.sum(self.val, axis = axis), None, "sum", (self, axis))
+
+    def dot(self, other):
+        """
+        Compute the dot product of a tensor with another tensor, a node or an array.
+
+        Parameters
+        ----------
+        other : Tensor, Node, numpy.ndarray
+            Vector or matrix multiplied with the tensor.
+
+        Returns
+        -------
+        Tensor
+            The method returns a new tensor holding the dot product.
+
+        Raises
+        ------
+        TypeError
+            This method raises a `TypeError` if the type of input other is not supported.
+
+        ValueError
+            This method raises a `ValueError` if an operand does not have 1 or 2 dimensions.
+
+        """
+        return self._dot(self, other)
+
+    def __matmul__(self, other):
+        """
+        Compute the matrix product of a tensor and 'other', see `dot`.
+        """
+        return self._dot(self, other)
+
+    def __rmatmul__(self, other):
+        """
+        Compute the matrix product of 'other' and a tensor, see `dot`.
+        """
+        return self._dot(other, self)
+
+    @classmethod
+    def _dot(cls, a, b):
+        """
+        Compute the dot product of 'a' and 'b', one of which is a tensor.
+        """
+        # check if the operands are of supported type
+        for operand in (a, b):
+            if not isinstance(operand, cls._supported_operands):
+                raise TypeError(f"Unsupported type '{type(operand)}'")
+        a_val = a.val if isinstance(a, Node) else a
+        b_val = b.val if isinstance(b, Node) else b
+        # check that the operands are vectors or matrices
+        if np.ndim(a_val) not in (1, 2) or np.ndim(b_val) not in (1, 2):
+            raise ValueError("Cannot dot: operands must have 1 or 2 dimensions.")
+        return cls(np.dot(a_val, b_val), None, "dot", (a, b))
+
+    def __getitem__(self, index):
+        """
+        Select elements of a tensor.
+
+        Parameters
+        ----------
+        index : integer, slice, tuple or numpy.ndarray
+            Index of the elements, as for a NumPy array.
+
+        Returns
+        -------
+        Tensor
+            The method returns a new tensor holding the selected elements.
+
+        """
+        return self.__class__(self.val[index], None, "getitem", (self, index))
+
+
+Tensor._supported_operands = (*Tensor._supported_scalars, Node)
+
+
+class _VJP:
+    """Local gradient of a tensor operation, applied to an adjoint by multiplying it from the left."""
+
+    __slots__ = ("fn", "args")
+
+    # numpy defers the product with an adjoint array to __rmul__
+    __array_ufunc__ = None
+
+    def __init__(self, fn, args):
+        self.fn = fn
+        self.args = args
+
+    def __rmul__(self, adjoint):
+        return self.fn(adjoint, *self.args)
+
+
+def _unbroadcast(g, shape):
+    """
+    Reduce the adjoint 'g' of a broadcast result to the adjoint of an operand of shape 'shape'.
+    """
+    g = np.broadcast_to(g, np.broadcast_shapes(np.shape(g), shape))
+    # sum over the leading axes added by broadcasting
+    while g.ndim > len(shape):
+        g = g.sum(axis = 0)
+    # sum over the axes along which the operand was stretched
+    for axis, size in enumerate(shape):
+        if size == 1 and g.shape[axis] != 1:
+            g = g.sum(axis = axis, keepdims = True)
+    return g
+
+
+def _elementwise(adjoint, partial, shape):
+    """
+    Vector-Jacobian product of an elementwise operation with local partial 'partial'.
+    """
+    return _unbroadcast(adjoint * partial, shape)
+
+
+def _sum_vjp(adjoint, a, axis):
+    """
+    Vector-Jacobian product of a sum, which spreads the adjoint over the summed elements.
+    """
+    if axis is not None:
+        adjoint = np.expand_dims(adjoint, axis)
+    return np.broadcast_to(adjoint, np.shape(a))
+
+
+def _as_matrices(adjoint, a, b):
+    """
+    Promote the operands and the adjoint of a dot product of vectors or matrices to matrices.
+    """
+    a2 = np.reshape(a, (1, -1)) if np.ndim(a) == 1 else np.asarray(a)
+    b2 = np.reshape(b, (-1, 1)) if np.ndim(b) == 1 else np.asarray(b)
+    return np.reshape(adjoint, (a2.shape[0], b2.shape[1])), a2, b2
+
+
+def _dot_vjp_a(adjoint, a, b):
+    """
+    Vector-Jacobian product of a dot product with respect to its first operand.
+    """
+    adjoint, a2, b2 = _as_matrices(adjoint, a, b)
+    return np.reshape(adjoint @ b2.T, np.shape(a))
+
+
+def _dot_vjp_b(adjoint, a, b):
+    """
+    Vector-Jacobian product of a dot product with respect to its second operand.
+    """
+    adjoint, a2, b2 = _as_matrices(adjoint, a, b)
+    return np.reshape(a2.T @ adjoint, np.shape(b))
+
+
+def _getitem_vjp(adjoint, a, index):
+    """
+    Vector-Jacobian product of a selection, which scatters the adjoint back to the selected elements.
+    """
+    g = np.zeros(np.shape(a))
+    np.add.at(g, index, adjoint)
+    return g
+
+
+# Vector-Jacobian products of the operations that are not elementwise, one per operand.
+# Every product takes the adjoint of the result followed by the values of all operands.
+_VJPS = {
+    "sum": (_sum_vjp,),
+    "dot": (_dot_vjp_a, _dot_vjp_b),
+    "getitem": (_getitem_vjp,),
+}
@@ -0,0 +1,575 @@
+# File       : trace.py
+# Description: Tracing compiler that records the operations of a function once
+#              on symbolic Tracer operands and emits straight-line NumPy code
+#              computing its value(s) and derivative(s)
+import keyword
+import marshal
+from collections import OrderedDict
+
+import numpy as np
+
+from autodiff.ad import AD
+from autodiff.diskcache import KernelCache, kernel_key
+
+# value and local partial derivative templates of every operation, where {0} and {1}
+# are the operands and {r} is the result; None marks an operand that is always a constant
+_RULES = {
+    "add": ("{0} + {1}", ("1", "1")),
+    "sub": ("{0} - {1}", ("1", "-1")),
+    "mul": ("{0} * {1}", ("{1}", "{0}")),
+    "truediv": ("{0} / {1}", ("1 / {1}", "-{0} / {1} ** 2")),
+    "pow": ("{0} ** {1}", ("{1} * {0} ** ({1} - 1)", "{r} * np.log({0})")),
+    "neg": ("-{0}", ("-1",)),
+    "sqrt": ("{0} ** 0.5", ("0.5 / {r}",)),
+    "exp": ("np.exp({0})", ("{r}",)),
+    "log": ("np.log({0}) / np.log({1})", ("1 / (np.log({1}) * {0})", None)),
+    "standard_logistic": ("1 / (1 + np.exp(-{0}))", ("{r} * (1 - {r})",)),
+    "sin": ("np.sin({0})", ("np.cos({0})",)),
+    "cos": ("np.cos({0})", ("-np.sin({0})",)),
+    "tan": ("np.tan({0})", ("1 / np.cos({0}) ** 2",)),
+    "arcsin": ("np.arcsin({0})", ("1 / np.sqrt(1 - {0} ** 2)",)),
+    "arccos": ("np.arccos({0})", ("-1 / np.sqrt(1 - {0} ** 2)",)),
+    "arctan": ("np.arctan({0})", ("1 / ({0} ** 2 + 1)",)),
+    "sinh": ("np.sinh({0})", ("np.cosh({0})",)),
+    "cosh": ("np.cosh({0})", ("np.sinh({0})",)),
+    "tanh": ("np.tanh({0})", ("1 - {r} ** 2",)),
+}
+
+class Graph:
+    """Operations recorded while tracing, in the order they were executed."""
+
+    def __init__(self):
+        """
+        Initialize an empty graph.
+        """
+        # every operation is a tuple of (`opcode`, `operands`), where operands are Tracers or constants;
+        # inputs are recorded with the opcode "input" and their position in 'x' as single operand
+        self.ops = []
+
+    def record(self, op, operands):
+        """
+        Append an operation to the graph.
+
+        Parameters
+        ----------
+        op : string
+            Opcode of the operation.
+
+        operands : tuple
+            Operands of the operation.
+
+        Returns
+        -------
+        Tracer
+            The method returns a tracer standing for the result of the operation.
+
+        """
+        self.ops.append((op, operands))
+        return Tracer(self, len(self.ops) - 1)
+
+class Tracer:
+    """Symbolic operand recording the operations applied to it on a Graph."""
+
+    __slots__ = ("graph", "index")
+
+    _supported_scalars = (int, float)
+
+    def __init__(self, graph, index):
+        """
+        Initialize a tracer for the result of an operation of a graph.
+
+        Parameters
+        ----------
+        graph : Graph
+            Graph the operation is recorded on.
+
+        index : integer
+            Position of the operation in the graph.
+
+        """
+        self.graph = graph
+        self.index = index
+
+    def _record(self, op, *operands):
+        """
+        Record an operation on the graph after checking the type of its operands.
+        """
+        for operand in operands:
+            if not isinstance(operand, self._supported_operands):
+                raise TypeError(f"Unsupported type '{type(operand)}'")
+        return self.graph.record(op, operands)
+
+    ### Elementary Functions ###
+    def __add__(self, other):
+        """
+        Record the addition of a tracer and another tracer or a constant.
+        """
+        return self._record("add", self, other)
+
+    def __radd__(self, other):
+        """
+        Record the addition of a constant and a tracer.
+        """
+        return self._record("add", other, self)
+
+    def __sub__(self, other):
+        """
+        Record the subtraction of another tracer or a constant from a tracer.
+        """
+        return self._record("sub", self, other)
+
+    def __rsub__(self, other):
+        """
+        Record the subtraction of a tracer from a constant.
+        """
+        return self._record("sub", other, self)
+
+    def __mul__(self, other):
+        """
+        Record the multiplication of a tracer and another tracer or a constant.
+        """
+        return self._record("mul", self, other)
+
+    def __rmul__(self, other):
+        """
+        Record the multiplication of a constant and a tracer.
+        """
+        return self._record("mul", other, self)
+
+    def __truediv__(self, other):
+        """
+        Record the division of a tracer by another tracer or a constant.
+        """
+        return self._record("truediv", self, other)
+
+    def __rtruediv__(self, other):
+        """
+        Record the division of a constant by a tracer.
+        """
+        return self._record("truediv", other, self)
+
+    def __neg__(self):
+        """
+        Record the negation of a tracer.
+        """
+        return self._record("neg", self)
+
+    def __pow__(self, other):
+        """
+        Record raising a tracer to the power of another tracer or a constant.
+        """
+        return self._record("pow", self, other)
+
+    def __rpow__(self, other):
+        """
+        Record raising a constant to the power of a tracer.
+        """
+        return self._record("pow", other, self)
+
+    ### Square Root Function ###
+    def sqrt(self):
+        """
+        Record the square root of a tracer.
+        """
+        return self._record("sqrt", self)
+
+    ### Exponential Function ###
+    def exp(self):
+        """
+        Record the exponential of a tracer.
+        """
+        return self._record("exp", self)
+
+    ### Logarithmic Function ###
+    def log(self, base):
+        """
+        Record the logarithm of a tracer to the constant base 'base'.
+
+        Raises
+        ------
+        TypeError
+            This method raises a `TypeError` if the type of input base number is not supported.
+
+        ValueError
+            This method raises a `ValueError` if the value of input base is less than or equal to zero.
+
+        """
+        # check if base is of supported type
+        if not isinstance(base, self._supported_scalars):
+            raise TypeError(f"Unsupported base type '{type(base)}'")
+        # check that the base is above 0.
+        if base <= 0:
+            raise ValueError("Cannot log: Base is less than or equal to 0.")
+        return self._record("log", self, base)
+
+    ### Logistic Function ###
+    def standard_logistic(self):
+        """
+        Record the standard logistic function of a tracer.
+        """
+        return self._record("standard_logistic", self)
+
+    ### Trigonometric Functions ###
+    def sin(self):
+        """
+        Record the sine of a tracer.
+        """
+        return self._record("sin", self)
+
+    def cos(self):
+        """
+        Record the cosine of a tracer.
+        """
+        return self._record("cos", self)
+
+    def tan(self):
+        """
+        Record the tangent of a tracer.
+        """
+        return self._record("tan", self)
+
+    ### Inverse Trigonometric Functions ###
+    def arcsin(self):
+        """
+        Record the arcsine of a tracer.
+        """
+        return self._record("arcsin", self)
+
+    def arccos(self):
+        """
+        Record the arccosine of a tracer.
+        """
+        return self._record("arccos", self)
+
+    def arctan(self):
+        """
+        Record the arctangent of a tracer.
+        """
+        return self._record("arctan", self)
+
+    ### Hyperbolic Functions ###
+    def sinh(self):
+        """
+        Record the hyperbolic sine of a tracer.
+        """
+        return self._record("sinh", self)
+
+    def cosh(self):
+        """
+        Record the hyperbolic cosine of a tracer.
+        """
+        return self._record("cosh", self)
+
+    def tanh(self):
+        """
+        Record the hyperbolic tangent of a tracer.
+        """
+        return self._record("tanh", self)
+
+# operand types accepted by the operations, built once instead of on every call
+Tracer._supported_operands = (*Tracer._supported_scalars, Tracer)
+
+class CompiledFunction:
+    """Straight-line NumPy function computing the value(s) and derivative(s) of traced function(s)."""
+
+    def __init__(self, graph, outputs, n, jacobian):
+        """
+        Emit and compile the code of a traced graph.
+
+        Parameters
+        ----------
+        graph : Graph
+            Graph recorded while tracing.
+
+        outputs : list
+            Tracer (or constant) returned by every traced function.
+
+        n : integer
+            Number of inputs.
+
+        jacobian : boolean
+            True if multiple functions were traced.
+
+        """
+        self.graph = graph
+        self.outputs = outputs
+        self.n = n
+        self.jacobian = jacobian
+        self.source = self._emit()
+        self.function = self._compile(self.source)
+
+    @classmethod
+    def from_source(cls, source, n, jacobian, code=None):
+        """
+        Compile a function from source code emitted by a previous trace, without tracing again.
+
+        Parameters
+        ----------
+        source : string
+            Source code of the function, as in the `source` attribute of a compiled function.
+
+        n : integer
+            Number of inputs.
+
+        jacobian : boolean
+            True if multiple functions were traced.
+
+        code : code object or None
+            Bytecode compiled from 'source', which is compiled again if None.
+
+        Returns
+        -------
+        CompiledFunction
+            The method returns a compiled function without a graph.
+
+        """
+        compiled = cls.__new__(cls)
+        compiled.graph = None
+        compiled.outputs = None
+        compiled.n = n
+        compiled.jacobian = jacobian
+        compiled.source = source
+        compiled.function = cls._compile(source, code)
+        return compiled
+
+    @staticmethod
+    def _compile(source, code=None):
+        """
+        Execute the source code (or its bytecode) of a compiled function and return the function.
+        """
+        if code is None:
+            code = compile(source, "<autodiff.trace>", "exec")
+        namespace = {"np": np}
+        exec(code, namespace)
+        return namespace["compiled"]
+
+    def __call__(self, x):
+        """
+        Compute the value(s) and the derivative(s) of the traced function(s) at input 'x'.
+
+        Parameters
+        ----------
+        x : Vector.
+            The point at which the value(s) and derivative(s) of the function(s) are evaluated.
+
+        Returns
+        -------
+        f(x) and f'(x)
+            For one function, the method returns the value as a float and the gradient as an array of shape (n,).
+            For k functions, the method returns the values as an array of shape (k,) and the Jacobian as an array of shape (k, n).
+
+        Raises
+        ------
+        TypeError
+            This method raises a `TypeError` if the type of input 'x' is not supported.
+
+        ValueError
+            This method also raises a `ValueError` if the dimension of input 'x' is not matched with the function(s).
+
+        """
+        # check that x is of supported type
+        if not isinstance(x, AD._supported_vectors):
+            raise TypeError(f"Unsupported type '{type(x)}'")
+
+        # check that x is 1-dimensional and has one value per input
+        if np.shape(x) != (self.n,):
+            raise ValueError(f"Input variables should be a 1-dimensional vector of length {self.n}.")
+
+        return self.function(x)
+
+    def module_source(self, name="compiled", inputs=None):
+        """
+        Emit the source code of a standalone module defining the compiled function.
+
+        The module only depends on NumPy, so it can be imported where autodiff is not installed.
+
+        Parameters
+        ----------
+        name : string
+            Name of the function defined by the module.
+
+        inputs : array-like
+            Names of the inputs, listed in the docstring of the module.
+
+        Returns
+        -------
+        string
+            The method returns the source code of the module.
+
+        """
+        # check that the name can be defined and does not shadow the names used by the module
+        if not isinstance(name, str) or not name.isidentifier() or keyword.iskeyword(name) or name in ("np", "x"):
+            raise ValueError(f"'{name}' is not a valid function name.")
+
+        inputs = ", ".join(str(input) for input in inputs) if inputs is not None else f"{self.n} values"
+        outputs = "an array of shape (k,) and the Jacobian as an array of shape (k, n)" if self.jacobian \
+            else "a float and the gradient as an array of shape (n,)"
+        header = [
+            '"""',
+            "Value and derivative(s) of a function, generated by autodiff.",
+            "",
+            f"{name}(x) takes a vector 'x' holding the inputs ({inputs}) and returns the value(s) as",
+            f"{outputs}. Domain errors are not checked and result in nan.",
+            '"""',
+            "import numpy as np",
+            "",
+            "",
+        ]
+        return "\n".join(header) + self.source.replace("def compiled(x):", f"def {name}(x):", 1)
+
+    @staticmethod
+    def _name(operand):
+        """
+        Name of the variable holding a tracer, or the literal of a constant.
+        """
+        if isinstance(operand, Tracer):
+            return f"v{operand.index}"
+        value = float(operand)
+        # infinities and nan have no literal
+        return f"({value!r})" if np.isfinite(value) else f"float('{value!r}')"
+
+    def _emit(self):
+        """
+        Emit the source code of the forward pass and of one backward sweep per output.
+        """
+        lines = ["def compiled(x):"]
+
+        # forward pass
+        for i, (op, operands) in enumerate(self.graph.ops):
+            if op == "input":
+                lines.append(f"    v{i} = x[{operands[0]}]")
+            else:
+                names = [self._name(operand) for operand in operands]
+                lines.append(f"    v{i} = " + _RULES[op][0].format(*names, r=f"v{i}"))
+
+        # inputs are the first operations of the graph
+        inputs = [i for i, (op, _) in enumerate(self.graph.ops) if op == "input"]
+
+        # backward sweeps; the operations are already in topological order
+        rows = []
+        for k, output in enumerate(self.outputs):
+            if not isinstance(output, Tracer):
+                rows.append(["0.0"] * self.n)
+                continue
+
+            lines.append(f"    g{output.index} = 1.0")
+            assigned = {output.index}
+            for i in range(output.index, -1, -1):
+                op, operands = self.graph.ops[i]
+                if i not in assigned or op == "input":
+                    continue
+                names = [self._name(operand) for operand in operands]
+                for operand, partial in zip(operands, _RULES[op][1]):
+                    if not isinstance(operand, Tracer):
+                        continue
+                    partial = partial.format(*names, r=f"v{i}")
+                    if partial == "1":
+                        contribution = f"g{i}"
+                    elif partial == "-1":
+                        contribution = f"-g{i}"
+                    else:
+                        contribution = f"g{i} * ({partial})"
+                    j = operand.index
+                    if j in assigned:
+                        lines.append(f"    g{j} = g{j} + {contribution}")
+                    else:
+                        lines.append(f"    g{j} = {contribution}")
+                        assigned.add(j)
+
+            # keep the gradient of this output before the next sweep reuses the names
+            row = [f"g{i}" if i in assigned else "0.0" for i in inputs]
+            lines.append(f"    row{k} = [{', '.join(row)}]")
+            rows.append(f"row{k}")
+
+        values = [self._name(output) for output in self.outputs]
+        rows = [row if isinstance(row, str) else f"[{', '.join(row)}]" for row in rows]
+        if self.jacobian:
+            lines.append(f"    return np.array([{', '.join(values)}], dtype=float), np.array([{', '.join(rows)}], dtype=float)")
+        else:
+            lines.append(f"    return float({values[0]}), np.array({rows[0]}, dtype=float)")
+        return "\n".join(lines) + "\n"
+
+# compiled functions of recently traced (functions, inputs) pairs, keyed by `kernel_key`
+_cache = OrderedDict()
+_cache_size = 128
+
+def trace(f, inputs=[], cache=None):
+    """
+    Record the operations of the function(s) 'f' once and compile them into straight-line NumPy code.
+
+    The function(s) are run on Tracer operands, so their control flow must not depend on the
+    values of the inputs. Domain errors (e.g. the square root of a negative number) are not
+    checked by the compiled code and result in nan.
+
+    Parameters
+    ----------
+    f : array-like
+        Input with one or multiple functions.
+
+    inputs : array-like
+        List of input variables.
+
+    cache : KernelCache, string or None
+        Cache on disk, or the directory of a cache, in which the compiled code is looked up before
+        tracing and stored after tracing, so that new processes do not trace 'f' again. The code is
+        keyed by a hash of the bytecode, constants and closures of 'f' and of the inputs (see `kernel_key`;
+        functions referring to values that cannot be hashed are not cached), and holds the
+        bytecode of the compiled code, so that it is not compiled again either.
+
+    Returns
+    -------
+    CompiledFunction
+        The method returns a function computing the value(s) and derivative(s) of 'f' at a point.
+        Compiled functions are cached in memory by the same key as on disk, so changing a value read
+        by 'f' traces it again.
+
+    Raises
+    ------
+    TypeError
+        This method raises a `TypeError` if 'f' or 'inputs' are not supported.
+
+    ValueError
+        This method raises a `ValueError` if an argument of 'f' is not in 'inputs'.
+
+    """
+    # validate the function(s) and the inputs, and find the inputs passed to every function
+    ad = AD(f, inputs)
+    functions = list(ad.f) if ad.jacobian else [ad.f]
+    columns = ad._columns if ad.jacobian else [list(range(ad.n))]
+
+    # the constants read by the function(s) are part of the compiled code, so it is keyed by their content;
+    # function(s) that refer to values without a stable hash are traced again on every call
+    key = kernel_key(f, inputs)
+    if key is not None and key in _cache:
+        _cache.move_to_end(key)
+        return _cache[key]
+
+    compiled = None
+    if cache is not None and key is not None:
+        if not isinstance(cache, KernelCache):
+            cache = KernelCache(cache)
+        data = cache.get(key)
+        if data is not None:
+            try:
+                source, code = marshal.loads(data)
+                compiled = CompiledFunction.from_source(source, ad.n, ad.jacobian, code)
+            except Exception:
+                # a kernel that cannot be compiled, e.g. written by an incompatible version, is traced again
+                compiled = None
+
+    if compiled is None:
+        graph = Graph()
+        tracers = [graph.record("input", (i,)) for i in range(ad.n)]
+        outputs = [function(*[tracers[i] for i in function_columns]) for function, function_columns in zip(functions, columns)]
+        compiled = CompiledFunction(graph, outputs, ad.n, ad.jacobian)
+        if cache is not None and key is not None:
+            # compiling the code takes longer than tracing, so its bytecode is stored with it
+            code = compile(compiled.source, "<autodiff.trace>", "exec")
+            cache.put(key, marshal.dumps((compiled.source, code)))
+
+    if key is not None:
+        _cache[key] = compiled
+        # evict the least recently used function
+        if len(_cache) > _cache_size:
+            _cache.popitem(last = False)
+    return compiled
@@ -0,0 +1,114 @@
+# File       : bench_modes.py
+# Description: airspeed velocity (asv) benchmarks comparing the latency and
+#              memory of ForwardMode and ReverseMode as the number of inputs,
+#              the number of outputs and the depth of the graph grow.
+#              Run with `asv run` or `asv continuous main HEAD` from the repository root.
+from functools import partial
+
+import numpy as np
+
+from autodiff.ad import AD
+from autodiff.forwardmode import ForwardMode
+from autodiff.reversemode import ReverseMode
+
+MODES = {"forward": ForwardMode, "reverse": ReverseMode, "tape": partial(ReverseMode, tape = True),
+         "static": partial(ReverseMode, static = True)}
+
+def make_function(args, body):
+    """
+    Build a function with named arguments 'args' returning the expression 'body'.
+    """
+    return eval(f"lambda {', '.join(args)}: {body}", {"AD": AD})
+
+class InputDimension:
+    """Scalar function of n inputs."""
+
+    params = (list(MODES), [1, 10, 100, 400])
+    param_names = ["mode", "n"]
+
+    def setup(self, mode, n):
+        inputs = [f"x{i}" for i in range(n)]
+        body = " + ".join(f"AD.sin(x{i}) * x{(i + 1) % n}" for i in range(n))
+        self.ad = MODES[mode](make_function(inputs, body), inputs, cache_size = 0)
+        self.x = np.linspace(0.1, 1, n)
+
+    def time_get_results(self, mode, n):
+        self.ad.get_results(self.x)
+
+    def peakmem_get_results(self, mode, n):
+        self.ad.get_results(self.x)
+
+class OutputCount:
+    """m functions of 10 inputs each."""
+
+    params = (list(MODES), [1, 10, 100])
+    param_names = ["mode", "m"]
+
+    def setup(self, mode, m):
+        inputs = [f"x{i}" for i in range(10)]
+        functions = [make_function(inputs, " + ".join(f"AD.exp(x{i}) * {k + 1}" for i in range(10))) for k in range(m)]
+        self.ad = MODES[mode](functions, inputs, cache_size = 0)
+        self.x = np.linspace(0.1, 1, 10)
+
+    def time_get_results(self, mode, m):
+        self.ad.get_results(self.x)
+
+    def peakmem_get_results(self, mode, m):
+        self.ad.get_results(self.x)
+
+class GraphDepth:
+    """Chain of elementary functions of increasing depth."""
+
+    params = (list(MODES), [10, 100, 1000, 10000])
+    param_names = ["mode", "depth"]
+
+    def setup(self, mode, depth):
+        def f(x, y):
+            z = x
+            for _ in range(depth):
+                z = AD.sin(z) * y + 0.5
+            return z
+        self.ad = MODES[mode](f, ["x", "y"], cache_size = 0)
+        self.x = [0.3, 0.7]
+
+    def time_get_results(self, mode, depth):
+        self.ad.get_results(self.x)
+
+    def peakmem_get_results(self, mode, depth):
+        self.ad.get_results(self.x)
+
+class SharedSubexpression:
+    """Repeated squaring, where every intermediate result is used twice."""
+
+    params = (list(MODES), [10, 30, 100, 1000])
+    param_names = ["mode", "depth"]
+
+    def setup(self, mode, depth):
+        def f(x):
+            z = x
+            for _ in range(depth):
+                z = z * z
+            return z
+        self.ad = MODES[mode](f, ["x"], cache_size = 0)
+        self.x = [1.0]
+
+    def time_get_results(self, mode, depth):
+        self.ad.get_results(self.x)
+
+class Batch:
+    """Scalar function of 10 inputs evaluated at a batch of points."""
+
+    params = (list(MODES), [1, 100, 10000])
+    param_names = ["mode", "points"]
+
+    def setup(self, mode, points):
+        inputs = [f"x{i}" for i in range(10)]
+        body = " + ".join(f"AD.sin(x{i}) * x{(i + 1) % 10}" for i in range(10))
+        self.ad = MODES[mode](make_function(inputs, body), inputs, cache_size = 0)
+        self.X = np.random.default_rng(0).uniform(0, 1, (points, 10))
+
+    def time_get_results_batch(self, mode, points):
+        self.ad.get_results_batch(self.X)
+
+    def peakmem_get_results_batch(self, mode, points):
+        self.ad.get_results_batch(self.X)
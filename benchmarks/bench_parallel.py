@@ -0,0 +1,67 @@
+# File       : bench_parallel.py
+# Description: airspeed velocity (asv) benchmarks of the scaling of
+#              ForwardMode.get_results and get_results_batch_parallel over
+#              the workers of a process pool.
+#              Run with `asv run --bench bench_parallel` from the repository root.
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from autodiff.ad import AD
+from autodiff.forwardmode import ForwardMode
+
+def expensive(x, y, z):
+    """
+    Function whose evaluation is dominated by Python-level operator overhead.
+    """
+    w = x
+    for _ in range(2000):
+        w = AD.sin(w) * y + AD.cos(z) / 3
+    return w
+
+class ProcessPool:
+    """Jacobian of 32 expensive functions of 3 inputs."""
+
+    params = sorted({1, 2, 4, os.cpu_count() or 1})
+    param_names = ["workers"]
+    timeout = 300
+
+    def setup(self, workers):
+        self.executor = ProcessPoolExecutor(max_workers = workers)
+        self.fm = ForwardMode([expensive] * 32, ["x", "y", "z"], cache_size = 0, executor = self.executor, workers = workers)
+        self.x = np.array([0.3, 0.7, 0.2])
+        # start the workers before timing
+        self.fm.get_results(self.x)
+
+    def teardown(self, workers):
+        self.executor.shutdown()
+
+    def time_get_results(self, workers):
+        self.fm.get_results(self.x)
+
+def cheap(x, y):
+    """
+    Function cheap enough that the cost of moving the results back matters.
+    """
+    return AD.sin(x) * y + AD.exp(y) / x
+
+class SharedMemoryBatch:
+    """Batch of one million points of a cheap function."""
+
+    params = sorted({1, 2, 4, os.cpu_count() or 1})
+    param_names = ["workers"]
+    timeout = 300
+
+    def setup(self, workers):
+        self.executor = ProcessPoolExecutor(max_workers = workers)
+        self.fm = ForwardMode(cheap, ["x", "y"], cache_size = 0)
+        self.X = np.random.default_rng(0).uniform(0.5, 1, (1000000, 2))
+        # start the workers before timing
+        self.fm.get_results_batch_parallel(self.X[:100], self.executor)
+
+    def teardown(self, workers):
+        self.executor.shutdown()
+
+    def time_get_results_batch_parallel(self, workers):
+        self.fm.get_results_batch_parallel(self.X, self.executor)
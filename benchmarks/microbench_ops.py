@@ -0,0 +1,67 @@
+# File       : microbench_ops.py
+# Description: Microbenchmark of the allocation size and per-operation latency
+#              of Dual and Node operators and elementary functions.
+#              Run with `python benchmarks/microbench_ops.py` from the repository root.
+import os
+import sys
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from autodiff.ad import AD
+from autodiff.dual import Dual
+from autodiff.node import Node
+
+def allocation_size(cls, *args, count=10000):
+    """
+    Measure the average number of bytes allocated per instance of 'cls'.
+    """
+    tracemalloc.start()
+    start = tracemalloc.take_snapshot()
+    instances = [cls(*args) for _ in range(count)]
+    end = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in end.compare_to(start, "filename"))
+    # discount the list holding the instances
+    return (size - sys.getsizeof(instances)) / count
+
+def latency(statement, namespace, number=100000):
+    """
+    Measure the best per-call latency of 'statement' in nanoseconds.
+    """
+    timer = timeit.Timer(statement, globals=namespace)
+    return min(timer.repeat(repeat=5, number=number)) / number * 1e9
+
+def main():
+    print(f"{'allocation':<24}{'bytes':>10}")
+    print(f"{'Dual':<24}{allocation_size(Dual, 1.5, 1.0):>10.1f}")
+    print(f"{'Node':<24}{allocation_size(Node, 1.5):>10.1f}")
+    print()
+
+    namespace = {
+        "AD": AD,
+        "a": Dual(0.5, 1.0), "b": Dual(0.25, 0.0),
+        "p": Node(0.5), "q": Node(0.25),
+    }
+    statements = [
+        ("__add__", "a + b", "p + q"),
+        ("__add__ scalar", "a + 2.0", "p + 2.0"),
+        ("__mul__", "a * b", "p * q"),
+        ("__mul__ scalar", "a * 2.0", "p * 2.0"),
+        ("__pow__", "a ** b", "p ** q"),
+        ("__pow__ scalar", "a ** 2", "p ** 2"),
+        ("sqrt", "AD.sqrt(a)", "AD.sqrt(p)"),
+        ("exp", "AD.exp(a)", "AD.exp(p)"),
+        ("log", "AD.log(a, 2)", "AD.log(p, 2)"),
+        ("sin", "AD.sin(a)", "AD.sin(p)"),
+        ("arcsin", "AD.arcsin(a)", "AD.arcsin(p)"),
+        ("tanh", "AD.tanh(a)", "AD.tanh(p)"),
+        ("standard_logistic", "AD.standard_logistic(a)", "AD.standard_logistic(p)"),
+    ]
+    print(f"{'operation':<24}{'Dual ns':>10}{'Node ns':>10}")
+    for name, dual_statement, node_statement in statements:
+        print(f"{name:<24}{latency(dual_statement, namespace):>10.0f}{latency(node_statement, namespace):>10.0f}")
+
+if __name__ == "__main__":
+    main()
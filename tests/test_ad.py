@@ -3,11 +3,19 @@
 #              differentiation class.
 
 import pytest
+import numpy as np
 
 # import names to test
 from autodiff.dual import Dual
 from autodiff.ad import AD
 
+# functions evaluated by worker processes must be defined at the top level of a module
+def parallel_f1(x, y):
+    return AD.sin(x) * y + AD.exp(y)
+
+def parallel_f2(y):
+    return y ** 3
+
 class TestAD():
     """Test class for automatic differentiation class"""
 
@@ -130,3 +138,198 @@ class TestAD():
         assert ad2.get_function() == [f1, f2]
 
     
+
+    def test_cached_arguments(self):
+        # Test that the function arguments and the input positions passed to
+        # every function are computed once at initialization.
+        f1 = lambda x: 2 * AD.sin(x) + 10
+        f2 = lambda x, z: x * z
+        f3 = lambda y: y ** 2
+
+        ad = AD([f1, f2, f3], ["x", "y", "z"])
+        assert ad._function_args == [["x"], ["x", "z"], ["y"]]
+        assert ad._columns == [[0], [0, 2], [1]]
+
+        ad = AD(f2, ["x", "z"])
+        assert ad._function_args == [["x", "z"]]
+        assert ad._columns == [[0, 1]]
+
+    def test_no_reflection_on_evaluation(self, monkeypatch):
+        # Test that evaluating the functions does not inspect them again.
+        import inspect
+        from autodiff.forwardmode import ForwardMode
+        from autodiff.reversemode import ReverseMode
+
+        f1 = lambda x: 2 * AD.sin(x) + 10
+        f2 = lambda x, z: x * z
+        fm = ForwardMode([f1, f2], ["x", "z"])
+        rm = ReverseMode([f1, f2], ["x", "z"])
+
+        def fail(f):
+            raise AssertionError("inspect.getfullargspec called during evaluation")
+        monkeypatch.setattr(inspect, "getfullargspec", fail)
+
+        assert np.allclose(list(fm.get_f([1, 2])), list(rm.get_f([1, 2])))
+        assert np.allclose(fm.get_results_batch([[1, 2]])[1], rm.get_results_batch([[1, 2]])[1])
+
+    def test_cached_results(self):
+        # Test that get_f and get_f_prime share one evaluation per point.
+        from autodiff.forwardmode import ForwardMode
+        from autodiff.reversemode import ReverseMode
+
+        calls = []
+        def f(x, y):
+            calls.append(1)
+            return x * y + AD.sin(x)
+
+        for mode in [ForwardMode, ReverseMode]:
+            calls.clear()
+            ad = mode(f, ["x", "y"], cache_size=2)
+            assert ad.get_f([1, 2]) == 2 + np.sin(1)
+            assert np.all(ad.get_f_prime([1, 2]) == np.array([2 + np.cos(1), 1]))
+            # reverse mode evaluates values without their graphs, so the derivatives evaluate the point again
+            assert len(calls) == (1 if mode is ForwardMode else 2)
+            calls.clear()
+            ad.get_f([1, 2])
+            ad.get_f_prime([1, 2])
+            assert len(calls) == 0
+
+            # the least recently used point is evicted
+            ad.get_f([2, 2])
+            ad.get_f([1, 2])
+            ad.get_f([3, 2])
+            assert len(calls) == 2
+            ad.get_f([1, 2])
+            assert len(calls) == 2
+            ad.get_f([2, 2])
+            assert len(calls) == 3
+
+            # explicit invalidation
+            ad.clear_cache()
+            ad.get_f([1, 2])
+            assert len(calls) == 4
+
+            # changing the returned results does not change the memoized results
+            g = ad.get_f_prime([1, 2])
+            g *= 100
+            assert np.all(ad.get_f_prime([1, 2]) == np.array([2 + np.cos(1), 1]))
+            value, grad = ad.value_and_grad([1, 2])
+            grad[0] = 0
+            assert np.all(ad.value_and_grad([1, 2])[1] == np.array([2 + np.cos(1), 1]))
+
+            # points made of 0-dimensional arrays share the key of the numbers
+            calls.clear()
+            assert ad.get_f([np.array(1.0), np.array(2.0)]) == 2 + np.sin(1)
+            assert np.all(ad.get_f_prime([np.array(1.0), np.array(2.0)]) == np.array([2 + np.cos(1), 1]))
+            assert len(calls) == 0
+
+            # disabled cache
+            calls.clear()
+            ad = mode(f, ["x", "y"], cache_size=0)
+            ad.get_f([1, 2])
+            ad.get_f_prime([1, 2])
+            assert len(calls) == 2
+
+    def test_value_and_grad(self):
+        # Test that value_and_grad returns float arrays.
+        from autodiff.forwardmode import ForwardMode
+        from autodiff.reversemode import ReverseMode
+
+        f1 = lambda x, y: x * y + AD.sin(x)
+        f2 = lambda y: y ** 2
+
+        for mode in [ForwardMode, ReverseMode]:
+            value, grad = mode(f1, ["x", "y"]).value_and_grad([1, 2])
+            assert value == 2 + np.sin(1)
+            assert grad.dtype == float
+            assert np.allclose(grad, [2 + np.cos(1), 1])
+
+            values, jacobian = mode([f1, f2], ["x", "y"]).value_and_grad([1, 2])
+            assert values.dtype == float and values.shape == (2,)
+            assert jacobian.dtype == float and jacobian.shape == (2, 2)
+            assert np.allclose(jacobian, [[2 + np.cos(1), 1], [0, 4]])
+
+            with pytest.raises(TypeError):
+                mode(f1, ["x", "y"]).value_and_grad(1)
+
+    def test_auto(self):
+        # Test that the engine is chosen from the shape of the Jacobian or
+        # from a trial evaluation.
+        from autodiff.forwardmode import ForwardMode
+        from autodiff.reversemode import ReverseMode
+
+        f1 = lambda x, y, z: x * y * z
+        f2 = lambda x: AD.sin(x)
+        f3 = lambda y: AD.exp(y)
+
+        # more inputs than functions
+        assert isinstance(AD.auto(f1, ["x", "y", "z"]), ReverseMode)
+        assert isinstance(AD.auto([f1, f2], ["x", "y", "z"]), ReverseMode)
+
+        # at most as many inputs as functions
+        assert isinstance(AD.auto(f2, ["x"]), ForwardMode)
+        assert isinstance(AD.auto([f2, f3], ["x", "y"]), ForwardMode)
+
+        # trial evaluation, whose result is reused
+        ad = AD.auto([f1, f2, f3], ["x", "y", "z"], x=[1, 2, 3])
+        assert isinstance(ad, (ForwardMode, ReverseMode))
+        assert (1, 2, 3) in ad._cache
+        assert np.allclose(list(ad.get_f([1, 2, 3])), [6, np.sin(1), np.exp(2)])
+
+        # the inputs are validated
+        with pytest.raises(ValueError):
+            AD.auto(f1, ["x", "y"])
+
+    def test_get_results_batch_parallel(self):
+        # Test that worker processes writing into shared memory give the
+        # same results as get_results_batch.
+        import pickle
+        from concurrent.futures import ProcessPoolExecutor
+        from autodiff.forwardmode import ForwardMode
+        from autodiff.reversemode import ReverseMode
+
+        X = np.random.default_rng(0).uniform(0, 1, (101, 2))
+        with ProcessPoolExecutor(max_workers = 2) as executor:
+            for mode in [ForwardMode, ReverseMode]:
+                for f in [parallel_f1, [parallel_f1, parallel_f2]]:
+                    ad = mode(f, ["x", "y"])
+                    vals, gradients = ad.get_results_batch_parallel(X, executor, chunks = 7)
+                    expected_vals, expected_gradients = ad.get_results_batch(X)
+                    assert vals.shape == expected_vals.shape
+                    assert gradients.shape == expected_gradients.shape
+                    assert np.allclose(vals, expected_vals)
+                    assert np.allclose(gradients, expected_gradients)
+
+            # engines holding static graphs can be sent to the workers
+            rm = ReverseMode(parallel_f1, ["x", "y"], static = True)
+            rm.get_results(X[0])
+            assert rm._graphs
+            vals, gradients = rm.get_results_batch_parallel(X[:3], executor)
+            assert np.allclose(gradients, rm.get_results_batch(X[:3])[1])
+            assert pickle.loads(pickle.dumps(rm))._graphs == {}
+
+            # engines holding an executor can be sent to the workers
+            fm = ForwardMode(parallel_f1, ["x", "y"], executor = executor)
+            assert np.allclose(fm.get_results_batch_parallel(X[:3], executor)[0], fm.get_results_batch(X[:3])[0])
+
+        # default executor
+        vals, gradients = ReverseMode(parallel_f1, ["x", "y"]).get_results_batch_parallel(X[:5])
+        assert gradients.shape == (5, 2)
+
+        # the memoized results are not pickled
+        ad = ForwardMode(parallel_f1, ["x", "y"])
+        ad.get_f([1, 2])
+        assert len(pickle.loads(pickle.dumps(ad))._cache) == 0
+
+        with pytest.raises(TypeError):
+            ad.get_results_batch_parallel(1)
+        with pytest.raises(ValueError):
+            ad.get_results_batch_parallel([1, 2])
+
+        # importing the library does not load the modules of worker processes
+        import subprocess
+        import sys
+        modules = subprocess.run([sys.executable, "-c", "import sys, autodiff; "
+            "print('multiprocessing.shared_memory' in sys.modules, 'concurrent.futures.process' in sys.modules)"],
+            capture_output = True, text = True, check = True).stdout
+        assert modules.split() == ["False", "False"]
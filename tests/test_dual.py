@@ -17,6 +17,7 @@ class TestDual():
         d = Dual(1, 2)
         assert d.real == 1
         assert d.dual == 2
+        assert not hasattr(d, "__dict__")
 
     def test_addition(self):
         # Test that the implementation only supports addition for mixed
@@ -371,3 +372,30 @@ class TestDual():
         c = AD.tanh(a)
         assert c.real == (np.exp(1) - np.exp(-1)) / 2 * ((np.exp(1) + np.exp(-1)) / 2) ** -1
         assert c.dual == ((np.exp(1) - np.exp(-1)) / 2) * ((np.exp(1) * 2 + np.exp(-1) * -2) / 2 * -1 * (((np.exp(1) + np.exp(-1)) / 2) ** (-1 -1))) + ((np.exp(1) * 2 - np.exp(-1) * -2) / 2) * (((np.exp(1) + np.exp(-1)) / 2) ** -1)
+
+    def test_vector_dual(self):
+        # Test that a vector of tangents in the dual part is propagated
+        # component-wise through the operators and elementary functions.
+        a = Dual(2, np.array([1.0, 0.0]))
+        b = Dual(3, np.array([0.0, 1.0]))
+
+        c = a * b + AD.sin(a)
+        assert c.real == 2 * 3 + np.sin(2)
+        assert np.all(c.dual == np.array([3 + np.cos(2), 2]))
+
+        c = a ** b
+        assert c.real == 2 ** 3
+        assert np.all(c.dual == np.array([3 * 2 ** 2, np.log(2) * 2 ** 3]))
+
+    def test_comparison(self):
+        # Test that dual numbers are compared by their real parts.
+        a = Dual(1, 2)
+        b = Dual(3, -4)
+        assert a < b and a <= b and b > a and b >= a
+        assert a < 2 and a <= 1 and a > 0 and a >= 1
+        assert not a > b
+
+        # numpy functions call the methods of dual numbers
+        c = np.log(a)
+        assert c.real == 0
+        assert c.dual == 2
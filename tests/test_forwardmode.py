@@ -2,6 +2,8 @@
 # Description: Test cases for testing the initialization of an automatic
 #              differentiation class.
 
+import os
+
 import pytest
 import numpy as np
 
@@ -9,6 +11,13 @@ import numpy as np
 from autodiff.ad import AD
 from autodiff.forwardmode import ForwardMode
 
+# functions evaluated by worker processes must be defined at the top level of a module
+def parallel_f1(x, y):
+    return AD.sin(x) * y + AD.exp(y)
+
+def parallel_f2(y):
+    return y ** 3
+
 class TestForwardMode():
     """Test class for forward mode class"""
 
@@ -185,3 +194,197 @@ class TestForwardMode():
         # User passed in an empty list
         with pytest.raises(TypeError):
             fm1.get_results([])
+
+    def test_get_values_vector_mode(self):
+        # Test that the full gradient of a function with many inputs is
+        # computed in a single evaluation of the function.
+        calls = []
+        inputs = [f"x{i}" for i in range(20)]
+
+        def f(*args):
+            calls.append(1)
+            z = 0
+            for i, arg in enumerate(args):
+                z = z + (i + 1) * arg ** 2
+            return z
+
+        fm = ForwardMode(f, inputs)
+        x = np.arange(20, dtype=float)
+        f_x, f_prime_x = fm.get_results(x)
+        assert len(calls) == 1
+        assert f_x == np.sum(np.arange(1, 21) * x ** 2)
+        assert np.all(f_prime_x == 2 * np.arange(1, 21) * x)
+
+    def test_iter_jacobian(self):
+        # Test that the columns of the Jacobian are streamed in blocks.
+        f1 = lambda x, y: AD.sin(x) * y ** 3 + AD.sqrt(AD.exp(y)) / x
+        f2 = lambda y, z: AD.log(y, 2) + AD.arcsin(y / 3) * z
+        f3 = lambda x: 2
+        x = [0.7, 1.3, 0.4]
+        _, jacobian = ForwardMode([f1, f2], ["x", "y", "z"]).get_results(x)
+        expected = np.vstack([np.array(list(jacobian), dtype = float), np.zeros(3)])
+
+        fm = ForwardMode([f1, f2, f3], ["x", "y", "z"])
+        for block_size in [1, 2, 3, 5]:
+            blocks = list(fm.iter_jacobian(x, block_size))
+            assert [start for start, _ in blocks] == list(range(0, 3, block_size))
+            assert np.allclose(np.hstack([columns for _, columns in blocks]), expected)
+
+        # one function yields blocks of its gradient
+        f4 = lambda x, y, z: f1(x, y) + z
+        blocks = list(ForwardMode(f4, ["x", "y", "z"]).iter_jacobian(np.array(x), 2))
+        assert [columns.shape for _, columns in blocks] == [(2,), (1,)]
+        assert np.allclose(np.concatenate([columns for _, columns in blocks]), expected[0] + [0, 0, 1])
+
+        with pytest.raises(TypeError):
+            next(fm.iter_jacobian(1))
+        with pytest.raises(TypeError):
+            next(fm.iter_jacobian(x, "2"))
+        with pytest.raises(ValueError):
+            next(fm.iter_jacobian(x, 0))
+        with pytest.raises(ValueError):
+            next(fm.iter_jacobian([1, 2]))
+
+    def test_jvp(self):
+        # Test that Jacobian-vector products match the Jacobian.
+        f1 = lambda x, y: AD.sin(x) * y ** 3 + AD.sqrt(AD.exp(y)) / x
+        f2 = lambda y: AD.log(y, 2) + AD.arcsin(y / 3)
+        f3 = lambda x: 2
+        x = [0.7, 1.3]
+
+        vals, jacobian = ForwardMode([f1, f2], ["x", "y"]).get_results(x)
+        f_x, product = ForwardMode([f1, f2, f3], ["x", "y"]).jvp(x, np.array([2, -1]))
+        assert np.allclose(f_x, [vals[0], vals[1], 2])
+        assert np.allclose(product, [jacobian[0] @ [2, -1], jacobian[1] @ [2, -1], 0])
+
+        # one function
+        fm = ForwardMode(f1, ["x", "y"])
+        f_x, f_prime_x = fm.get_results(x)
+        val, product = fm.jvp(x, [1, 0.5])
+        assert np.isclose(val, f_x)
+        assert np.isclose(product, f_prime_x @ [1, 0.5])
+
+        with pytest.raises(TypeError):
+            fm.jvp(x, 1)
+        with pytest.raises(ValueError):
+            fm.jvp(x, [1])
+        with pytest.raises(ValueError):
+            fm.jvp([1], [1, 2])
+        with pytest.raises(TypeError, match = "for input elements"):
+            fm.jvp(["a", 2.0], [1, 0.5])
+        with pytest.raises(TypeError, match = "for input elements"):
+            fm.jvp(x, [None, 0.5])
+
+    def test_get_results_batch(self):
+        # Test that a batch of points gives the same results as evaluating
+        # every point separately.
+        f1 = lambda x, y: AD.sin(x) * y + AD.sqrt(AD.exp(y)) / x
+        f2 = lambda y: AD.arcsin(y / 10) + 2
+        X = np.array([[0.5, 1.0], [1.0, 2.0], [1.5, 3.0], [2.0, 4.0]])
+
+        # Single function
+        fm = ForwardMode(f1, ["x", "y"])
+        f_X, f_prime_X = fm.get_results_batch(X)
+        assert f_X.shape == (4,)
+        assert f_prime_X.shape == (4, 2)
+        for i, x in enumerate(X):
+            f_x, f_prime_x = fm.get_results(x)
+            assert f_X[i] == pytest.approx(f_x)
+            assert np.allclose(f_prime_X[i], list(f_prime_x))
+
+        # Multiple functions, different arguments
+        fm = ForwardMode([f1, f2], ["x", "y"])
+        f_X, f_prime_X = fm.get_results_batch(X)
+        assert f_X.shape == (4, 2)
+        assert f_prime_X.shape == (4, 2, 2)
+        for i, x in enumerate(X):
+            f_x, f_prime_x = fm.get_results(x)
+            assert np.allclose(f_X[i], list(f_x))
+            assert np.allclose(f_prime_X[i], np.array(list(f_prime_x), dtype = float))
+
+        # User input is not of supported type
+        with pytest.raises(TypeError):
+            fm.get_results_batch(1)
+
+        # User input is not 2-dimensional
+        with pytest.raises(ValueError):
+            fm.get_results_batch([1, 2])
+
+    def test_get_sparse_results(self):
+        # Test that the compressed sparse Jacobian matches the dense one.
+        pytest.importorskip("scipy")
+        f1 = lambda x, y: AD.sin(x) * y
+        f2 = lambda y, z: AD.exp(y) / z
+        f3 = lambda z: z ** 3
+        f4 = lambda x: 2 * x
+
+        fm = ForwardMode([f1, f2, f3, f4], ["x", "y", "z"])
+        values, jacobian = fm.get_sparse_results([1.0, 2.0, 3.0])
+        f_x, f_prime_x = fm.get_results([1.0, 2.0, 3.0])
+        assert jacobian.shape == (4, 3)
+        assert jacobian.nnz == 6
+        assert np.allclose(values, list(f_x))
+        assert np.allclose(jacobian.toarray(), np.array(list(f_prime_x), dtype = float))
+
+        # single function
+        fm = ForwardMode(f1, ["x", "y"])
+        values, jacobian = fm.get_sparse_results([1.0, 2.0])
+        assert np.allclose(values, [2 * np.sin(1)])
+        assert np.allclose(jacobian.toarray(), [[2 * np.cos(1), np.sin(1)]])
+
+        # function that does not depend on its inputs
+        fm = ForwardMode([f1, lambda z: 5], ["x", "y", "z"])
+        values, jacobian = fm.get_sparse_results([1.0, 2.0, 3.0])
+        assert np.allclose(values, [2 * np.sin(1), 5])
+        assert np.allclose(jacobian.toarray(), [[2 * np.cos(1), np.sin(1), 0], [0, 0, 0]])
+
+        # incorrect inputs
+        with pytest.raises(TypeError):
+            fm.get_sparse_results(1)
+        with pytest.raises(ValueError):
+            fm.get_sparse_results([1.0])
+
+    def test_get_results_executor(self):
+        # Test that distributing the evaluation over an executor gives the
+        # same results as the serial evaluation.
+        from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+        x = [0.5, 2.0]
+
+        with ProcessPoolExecutor(max_workers = 2) as executor:
+            for f in [parallel_f1, [parallel_f1, parallel_f2]]:
+                f_x, f_prime_x = ForwardMode(f, ["x", "y"]).get_results(x)
+                fm = ForwardMode(f, ["x", "y"], executor = executor)
+                parallel_f_x, parallel_f_prime_x = fm.get_results(x)
+                assert np.allclose(np.array(f_x, dtype = float), np.array(parallel_f_x, dtype = float))
+                assert np.allclose(np.array(list(f_prime_x), dtype = float), np.array(list(parallel_f_prime_x), dtype = float))
+
+        # threads do not need picklable functions
+        with ThreadPoolExecutor(max_workers = 2) as executor:
+            fm = ForwardMode([lambda x: x ** 2, lambda x, y: x * y], ["x", "y"], executor = executor)
+            f_x, f_prime_x = fm.get_results([3, 4])
+            assert np.all(f_x == [9, 12])
+            assert np.all(f_prime_x[0] == [6, 0])
+            assert np.all(f_prime_x[1] == [4, 3])
+
+        # a single function is only split when it has more inputs than there are workers
+        class CountingExecutor(ThreadPoolExecutor):
+            def map(self, fn, *iterables, **kwargs):
+                blocks = list(iterables[-1])
+                tasks.append(len(blocks))
+                return super().map(fn, *iterables[:-1], blocks, **kwargs)
+
+        f = lambda x, y, z: x * y * AD.sin(z)
+        expected = ForwardMode(f, ["x", "y", "z"]).get_results([1, 2, 3])
+        for workers, blocks in [(2, [2]), (3, []), (8, [])]:
+            tasks = []
+            with CountingExecutor(max_workers = workers) as executor:
+                f_x, f_prime_x = ForwardMode(f, ["x", "y", "z"], executor = executor, workers = workers).get_results([1, 2, 3])
+            assert tasks == blocks
+            assert np.isclose(f_x, expected[0]) and np.allclose(f_prime_x, expected[1])
+
+        # the number of workers defaults to the number of processors
+        assert ForwardMode(f, ["x", "y", "z"]).workers == (os.cpu_count() or 1)
+        with pytest.raises(TypeError):
+            ForwardMode(f, ["x", "y", "z"], workers = 2.0)
+        with pytest.raises(ValueError):
+            ForwardMode(f, ["x", "y", "z"], workers = 0)
@@ -17,6 +17,7 @@ class TestNode():
         d = Node(1)
         assert d.val == 1
         assert d.gradients == ()
+        assert not hasattr(d, "__dict__")
 
     def test_addition(self):
         # Test that the implementation only supports addition for mixed
@@ -379,3 +380,43 @@ class TestNode():
         c = AD.tanh(a)
         assert c.val == np.tanh(1)
         assert c.gradients == ((a, 1/np.cosh(1)**2),)
+
+    def test_array_values(self):
+        # Test that nodes holding arrays evaluate a batch of points and that
+        # domain checks apply to every element.
+        a = Node(np.array([0.25, 0.5]))
+        c = AD.sqrt(a) * a
+        assert np.all(c.val == np.array([0.125, 0.5 ** 1.5]))
+        assert np.all(c.gradients[0][1] == a.val)
+
+        with pytest.raises(ValueError):
+            AD.sqrt(Node(np.array([1.0, -1.0])))
+        with pytest.raises(ValueError):
+            AD.arcsin(Node(np.array([0.0, 1.0])))
+
+    def test_lazy_gradients(self):
+        # Test that the local gradients of an operation are only computed when
+        # they are first accessed, and then kept.
+        a = Node(2)
+        b = Node(3)
+        c = AD.standard_logistic(a) * b
+        assert c.op == "mul" and c.operands[1] is b
+        assert c._gradients is None
+        d = c.operands[0]
+        assert d._gradients is None
+
+        gradients = c.gradients
+        assert gradients == ((d, 3), (b, d.val))
+        assert c.gradients is gradients
+        # the operands are not differentiated until they are reached themselves
+        assert d._gradients is None
+        assert d.gradients == ((a, d.val * (1 - d.val)),)
+
+        # constant operands have no local gradient
+        c = 2 ** a
+        assert c.operands == (2, a)
+        assert c.gradients == ((a, 4 * np.log(2)),)
+
+        # leaves and explicit gradients are kept as given
+        assert a.gradients == ()
+        assert Node(1, ((a, 5),)).gradients == ((a, 5),)
@@ -2,11 +2,16 @@
 # Description: Test cases for testing the initialization of an automatic
 #              differentiation class.
 
+import importlib.util
+import os
+import stat
+
 import pytest
 import numpy as np
 
 # import names to test
 from autodiff.ad import AD
+from autodiff.node import Node
 from autodiff.reversemode import ReverseMode
 
 class TestReverseMode():
@@ -186,3 +191,398 @@ class TestReverseMode():
         # User passed in an empty list
         with pytest.raises(TypeError):
             rm1.get_results([])
+
+    def test_get_gradients_shared_subexpressions(self):
+        # Test that shared subexpressions are visited once and that deep
+        # graphs do not hit the recursion limit.
+        def f(x):
+            # 60 levels of y = y * y would have 2^60 paths to x
+            y = x
+            for _ in range(60):
+                y = y * y
+            return y
+
+        rm = ReverseMode(f, ["x"])
+        f_x, f_prime_x = rm.get_results([1.0])
+        assert f_x == 1.0
+        assert f_prime_x[0] == 2.0 ** 60
+
+        def g(x):
+            y = x
+            for _ in range(100000):
+                y = y + 1
+            return y
+
+        rm = ReverseMode(g, ["x"])
+        g_x, g_prime_x = rm.get_results([1])
+        assert g_x == 100001
+        assert g_prime_x[0] == 1
+
+        # the output node is its own leaf
+        rm = ReverseMode(lambda x: x, ["x"])
+        assert rm.get_f_prime([3])[0] == 1
+
+    def test_get_results_batch(self):
+        # Test that a batch of points gives the same results as evaluating
+        # every point separately.
+        f1 = lambda x, y: AD.sin(x) * y + AD.sqrt(AD.exp(y)) / x
+        f2 = lambda y: AD.arcsin(y / 10) + 2
+        X = np.array([[0.5, 1.0], [1.0, 2.0], [1.5, 3.0], [2.0, 4.0]])
+
+        # Single function
+        rm = ReverseMode(f1, ["x", "y"])
+        f_X, f_prime_X = rm.get_results_batch(X)
+        assert f_X.shape == (4,)
+        assert f_prime_X.shape == (4, 2)
+        for i, x in enumerate(X):
+            f_x, f_prime_x = rm.get_results(x)
+            assert f_X[i] == pytest.approx(f_x)
+            assert np.allclose(f_prime_X[i], list(f_prime_x))
+
+        # Multiple functions, different arguments
+        rm = ReverseMode([f1, f2], ["x", "y"])
+        f_X, f_prime_X = rm.get_results_batch(X)
+        assert f_X.shape == (4, 2)
+        assert f_prime_X.shape == (4, 2, 2)
+        for i, x in enumerate(X):
+            f_x, f_prime_x = rm.get_results(x)
+            assert np.allclose(f_X[i], list(f_x))
+            assert np.allclose(f_prime_X[i], np.array(list(f_prime_x), dtype = float))
+
+        # User input is not of supported type
+        with pytest.raises(TypeError):
+            rm.get_results_batch(1)
+
+        # User input is not 2-dimensional
+        with pytest.raises(ValueError):
+            rm.get_results_batch([1, 2])
+
+    def test_hessian(self):
+        # Test that Hessians and Hessian-vector products are computed by
+        # nesting dual numbers inside nodes.
+        f1 = lambda x, y: AD.sin(x) * y ** 3 + AD.sqrt(AD.exp(y)) / x + x ** y
+        f2 = lambda y: AD.log(y, 2) + AD.arcsin(y / 3)
+        f3 = lambda x, y: 3 * x + y
+        x, y = 0.7, 1.3
+
+        h_xx = -np.sin(x) * y ** 3 + 2 * np.exp(y / 2) / x ** 3 + y * (y - 1) * x ** (y - 2)
+        h_xy = 3 * np.cos(x) * y ** 2 - np.exp(y / 2) / (2 * x ** 2) + x ** (y - 1) * (1 + y * np.log(x))
+        h_yy = 6 * np.sin(x) * y + np.exp(y / 2) / (4 * x) + x ** y * np.log(x) ** 2
+        expected = np.array([[h_xx, h_xy], [h_xy, h_yy]])
+
+        rm = ReverseMode(f1, ["x", "y"])
+        assert np.allclose(rm.hessian([x, y]), expected)
+        assert np.allclose(rm.hvp([x, y], [1, -2]), expected @ [1, -2])
+
+        # multiple functions, different arguments
+        rm = ReverseMode([f1, f2, f3], ["x", "y"])
+        g_yy = -1 / (np.log(2) * y ** 2) + y / 27 / (1 - y ** 2 / 9) ** 1.5
+        hessians = rm.hessian([x, y])
+        assert hessians.shape == (3, 2, 2)
+        assert np.allclose(hessians[0], expected)
+        assert np.allclose(hessians[1], [[0, 0], [0, g_yy]])
+        assert np.all(hessians[2] == 0)
+        assert np.allclose(rm.hvp([x, y], [1, -2]), [expected @ [1, -2], [0, -2 * g_yy], [0, 0]])
+
+        # incorrect inputs
+        with pytest.raises(TypeError):
+            rm.hessian(1)
+        with pytest.raises(ValueError):
+            rm.hessian([1])
+        with pytest.raises(ValueError):
+            rm.hvp([x, y], [1])
+
+    def test_vjp(self):
+        # Test that vector-Jacobian products match the Jacobian.
+        f1 = lambda x, y: AD.sin(x) * y ** 3 + AD.sqrt(AD.exp(y)) / x
+        f2 = lambda y: AD.log(y, 2) + AD.arcsin(y / 3)
+        f3 = lambda x: 2
+        x = [0.7, 1.3]
+
+        vals, jacobian = ReverseMode([f1, f2], ["x", "y"]).get_results(x)
+        jacobian = np.array(list(jacobian), dtype = float)
+        f_x, product = ReverseMode([f1, f2, f3], ["x", "y"]).vjp(x, [2, -1, 5])
+        assert np.allclose(f_x, [vals[0], vals[1], 2])
+        assert np.allclose(product, np.array([2, -1]) @ jacobian)
+
+        # one function
+        rm = ReverseMode(f1, ["x", "y"])
+        f_x, f_prime_x = rm.get_results(x)
+        val, product = rm.vjp(np.array(x), [0.5])
+        assert np.isclose(val, f_x)
+        assert np.allclose(product, 0.5 * np.array(f_prime_x, dtype = float))
+
+        with pytest.raises(TypeError):
+            rm.vjp(x, 0.5)
+        with pytest.raises(ValueError):
+            rm.vjp(x, [1, 2])
+        with pytest.raises(ValueError):
+            rm.vjp([1], [1])
+        with pytest.raises(TypeError, match = "for input elements"):
+            rm.vjp(x, ["a"])
+        with pytest.raises(TypeError, match = "for input elements"):
+            rm.vjp(["a", 2.0], [1])
+
+    def test_iter_jacobian(self):
+        # Test that the rows of the Jacobian are streamed in blocks.
+        f1 = lambda x, y: AD.sin(x) * y ** 3 + AD.sqrt(AD.exp(y)) / x
+        f2 = lambda y: AD.log(y, 2) + AD.arcsin(y / 3)
+        f3 = lambda x: 2
+        f4 = lambda x, y: x * y
+        x = [0.7, 1.3]
+        _, jacobian = ReverseMode([f1, f2, f4], ["x", "y"]).get_results(x)
+        expected = np.array(list(jacobian), dtype = float)
+        expected = np.insert(expected, 2, 0, axis = 0)
+
+        rm = ReverseMode([f1, f2, f3, f4], ["x", "y"])
+        for block_size in [1, 3, 4, 10]:
+            blocks = list(rm.iter_jacobian(x, block_size))
+            assert [start for start, _ in blocks] == list(range(0, 4, block_size))
+            assert np.allclose(np.concatenate([rows for _, rows in blocks]), expected)
+
+        # one function has a single row
+        blocks = list(ReverseMode(f1, ["x", "y"]).iter_jacobian(x))
+        assert len(blocks) == 1 and blocks[0][0] == 0
+        assert np.allclose(blocks[0][1], expected[0])
+
+        with pytest.raises(TypeError):
+            next(rm.iter_jacobian(x, 1.5))
+        with pytest.raises(ValueError):
+            next(rm.iter_jacobian(x, 0))
+        with pytest.raises(ValueError):
+            next(rm.iter_jacobian([1]))
+
+    def test_get_results_fused(self):
+        # Test that a single backward sweep over shared input nodes gives the
+        # same Jacobian as one sweep per function.
+        f1 = lambda x, y: AD.sin(x) * y + AD.sqrt(AD.exp(y)) / x
+        f2 = lambda y: AD.arcsin(y / 10) + 2
+        f3 = lambda x, y: x
+        f4 = lambda x, y: x
+
+        rm = ReverseMode([f1, f2, f3, f4], ["x", "y"])
+        fused = ReverseMode([f1, f2, f3, f4], ["x", "y"], fused=True)
+        f_x, f_prime_x = rm.get_results([0.7, 1.3])
+        fused_f_x, fused_f_prime_x = fused.get_results([0.7, 1.3])
+        assert np.allclose(list(f_x), list(fused_f_x))
+        assert np.allclose(np.array(list(f_prime_x), dtype = float), np.array(list(fused_f_prime_x), dtype = float))
+
+        # the graphs of all functions are ordered together
+        a = Node(1)
+        b = a * 2
+        c = b + a
+        order = ReverseMode.topological_order(c, b)
+        assert order.index(c) < order.index(b) < order.index(a)
+        assert len(order) == 3
+
+    def test_get_results_static(self):
+        # Test that re-evaluating a static graph in place gives the same results
+        # as building a new graph at every point.
+        f1 = lambda x, y: AD.sin(x) * y + AD.sqrt(AD.exp(y)) / x - 2 ** x + AD.log(y, 2) * (3 - x)
+        f2 = lambda y: AD.arcsin(y / 10) + AD.standard_logistic(-y) ** 2
+        f3 = lambda x, y: x
+
+        for f in [f1, [f1, f2, f3]]:
+            rm = ReverseMode(f, ["x", "y"], cache_size = 0)
+            static = ReverseMode(f, ["x", "y"], cache_size = 0, static = True)
+            for x in [[0.7, 1.3], [1.5, 0.2], [-0.4, 2.5]]:
+                f_x, f_prime_x = rm.get_results(x)
+                static_f_x, static_f_prime_x = static.get_results(x)
+                assert np.allclose(np.array(f_x, dtype = float), np.array(static_f_x, dtype = float))
+                assert np.allclose(np.array(list(f_prime_x), dtype = float), np.array(list(static_f_prime_x), dtype = float))
+
+        # the graph is built once and its nodes are updated in place
+        rm = ReverseMode(f1, ["x", "y"], static = True)
+        rm.get_results([0.7, 1.3])
+        graph = rm._graphs[0]
+        output = graph.output
+        assert np.isclose(rm.get_f([1.5, 0.2]), ReverseMode(f1, ["x", "y"]).get_f([1.5, 0.2]))
+        assert rm._graphs[0] is graph and graph.output is output
+        assert graph.output.val == rm.get_f([1.5, 0.2])
+
+        # operations that do not reach the output are not re-evaluated
+        def f4(x):
+            AD.exp(x) + 1
+            return x * 2
+        rm = ReverseMode(f4, ["x"], static = True)
+        rm.get_results([1])
+        assert len(rm._graphs[0].nodes) == 1
+        assert rm.get_f_prime([3])[0] == 2
+
+        # the domain of the operations is checked at every point
+        rm = ReverseMode(f2, ["y"], static = True)
+        rm.get_results([0.5])
+        with pytest.raises(ValueError):
+            rm.get_results([11])
+
+        # repeated operations are merged and constant operations are folded
+        def f5(x, y):
+            a = AD.sin(x) * AD.sin(x) + x * y + y * x
+            b = AD.exp(x * 0 + 1) * (y * 1) / 1 - 0
+            return a + b
+        rm = ReverseMode(f5, ["x", "y"], static = True)
+        ref = ReverseMode(f5, ["x", "y"])
+        for x in [[0.3, 1.2], [-1.1, 0.4]]:
+            f_x, f_prime_x = rm.get_results(x)
+            ref_f_x, ref_f_prime_x = ref.get_results(x)
+            assert np.isclose(f_x, ref_f_x)
+            assert np.allclose(np.array(list(f_prime_x), dtype = float), np.array(list(ref_f_prime_x), dtype = float))
+        # sin(x), sin(x)^2, x * y, 2 x y, a, e * y, a + b
+        assert [node.op for node in rm._graphs[0].nodes] == ["sin", "mul", "mul", "add", "add", "mul", "add"]
+
+        # functions simplified to a constant or to an input
+        for f, val, gradients in [(lambda x: x * 0, 0, [0]), (lambda x: 1 * x / 1, 2, [1]), (lambda x: 3, 3, [0])]:
+            rm = ReverseMode(f, ["x"], static = True)
+            f_x, f_prime_x = rm.get_results([2])
+            assert f_x == val and list(f_prime_x) == gradients
+            assert rm._graphs[0].nodes == []
+
+        # a static graph cannot be recorded on a tape
+        with pytest.raises(ValueError):
+            ReverseMode(f1, ["x", "y"], static = True, tape = True)
+        with pytest.raises(ValueError):
+            ReverseMode([f1, f2], ["x", "y"], static = True, fused = True)
+
+    def test_get_f_lazy(self, monkeypatch):
+        # Test that get_f does not differentiate the function and only
+        # memoizes its values, so that no graph outlives the call.
+        calls = []
+        def f(x, y):
+            calls.append(1)
+            return AD.sin(x) * y + AD.exp(y)
+
+        sweeps = []
+        get_gradients = ReverseMode.get_gradients
+        monkeypatch.setattr(ReverseMode, "get_gradients", staticmethod(lambda node: sweeps.append(1) or get_gradients(node)))
+
+        for functions in [f, [f, lambda y: y * 2]]:
+            expected_f_x, expected_f_prime_x = ReverseMode(functions, ["x", "y"]).get_results([0.5, 2])
+            calls.clear()
+            sweeps.clear()
+            rm = ReverseMode(functions, ["x", "y"])
+            assert np.allclose(rm.get_f([0.5, 2]), np.array(expected_f_x, dtype = float))
+            assert np.allclose(rm.get_f([0.5, 2]), np.array(expected_f_x, dtype = float))
+            assert len(calls) == 1 and len(sweeps) == 0
+            assert not hasattr(rm, "_pending")
+
+            # the derivatives evaluate the point again and replace its memoized values
+            assert np.allclose(np.array(list(rm.get_f_prime([0.5, 2])), dtype = float), np.array(list(expected_f_prime_x), dtype = float))
+            assert len(calls) == 2
+            rm.get_f([0.5, 2])
+            rm.get_f_prime([0.5, 2])
+            assert len(calls) == 2
+
+        # the value of a static graph is updated without its local gradients
+        rm = ReverseMode(f, ["x", "y"], static = True)
+        rm.get_results([0.5, 2])
+        assert np.isclose(rm.get_f([1, 3]), np.sin(1) * 3 + np.exp(3))
+        assert rm._graphs[0].output._gradients is None
+        assert np.allclose(rm.get_f_prime([1, 3]), [np.cos(1) * 3, np.sin(1) + np.exp(3)])
+
+    def test_codegen(self, tmp_path):
+        # Test that the generated module computes the same results without autodiff.
+        f1 = lambda x, y: AD.sin(x) * y + AD.sqrt(AD.exp(y)) / x - 2 ** x + AD.log(y, 2) * (3 - x)
+        f2 = lambda y: AD.tanh(y) * float("inf")
+        for f in [f1, [f1, f2]]:
+            path = tmp_path / "kernel.py"
+            source = ReverseMode.codegen(f, ["x", "y"], path = str(path), name = "kernel")
+            assert path.read_text() == source
+            assert "import autodiff" not in source and "from autodiff" not in source
+
+            spec = importlib.util.spec_from_file_location("kernel", path)
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            for x in [[0.7, 1.3], [1.5, 0.2]]:
+                val, gradients = module.kernel(np.array(x))
+                f_x, f_prime_x = ReverseMode(f, ["x", "y"]).get_results(x)
+                assert np.allclose(val, np.array(f_x, dtype = float))
+                assert np.allclose(gradients, np.array(list(f_prime_x), dtype = float))
+
+        # the module is only returned without a path
+        assert "def value_and_grad(x):" in ReverseMode.codegen(f1, ["x", "y"])
+
+        # the module holds the current values of the constants read by the function
+        a = 1.5
+        g = lambda x: a * x
+        assert "1.5" in ReverseMode.codegen(g, ["x"])
+        a = 2.5
+        source = ReverseMode.codegen(g, ["x"])
+        assert "2.5" in source and "1.5" not in source
+
+        # the module is readable as allowed by the umask
+        umask = os.umask(0o022)
+        try:
+            ReverseMode.codegen(f1, ["x", "y"], path = str(tmp_path / "shared.py"))
+        finally:
+            os.umask(umask)
+        assert stat.S_IMODE(os.stat(tmp_path / "shared.py").st_mode) == 0o644
+
+        for name in ["not a name", "import", "np", "x"]:
+            with pytest.raises(ValueError):
+                ReverseMode.codegen(f1, ["x", "y"], name = name)
+        with pytest.raises(ValueError):
+            ReverseMode.codegen(f1, ["x"])
+
+    def test_checkpoint(self):
+        # Test that checkpointed segments give the same derivatives as the
+        # full graph and are only recomputed by the backward sweep.
+        calls = []
+        def segment(x, y):
+            calls.append(1)
+            return AD.sin(x) * y, y ** 2 + 1, 3
+
+        checkpointed = ReverseMode.checkpoint(segment)
+        f = lambda x, y: (lambda a, b, c: a * b + c * x)(*segment(x, y))
+        g = lambda x, y: (lambda a, b, c: a * b + c * x)(*checkpointed(x, y))
+
+        f_x, f_prime_x = ReverseMode(f, ["x", "y"]).get_results([0.5, 2])
+        calls.clear()
+        g_x, g_prime_x = ReverseMode(g, ["x", "y"]).get_results([0.5, 2])
+        assert np.isclose(f_x, g_x)
+        assert np.allclose(f_prime_x, g_prime_x)
+        assert len(calls) == 2
+
+        # the segment is not recomputed without a backward sweep
+        calls.clear()
+        rm = ReverseMode(g, ["x", "y"])
+        assert np.isclose(rm.get_f([0.5, 2]), f_x)
+        assert len(calls) == 1
+
+        # batches of points
+        X = np.array([[0.5, 2], [1, 3]])
+        assert np.allclose(ReverseMode(g, ["x", "y"]).get_results_batch(X)[1], ReverseMode(f, ["x", "y"]).get_results_batch(X)[1])
+
+        # the operations of a tape or a static graph cannot be recomputed
+        with pytest.raises(TypeError):
+            ReverseMode(g, ["x", "y"], tape = True).get_results([0.5, 2])
+        with pytest.raises(TypeError):
+            ReverseMode(g, ["x", "y"], static = True).get_results([0.5, 2])
+
+    def test_checkpoint_loop(self):
+        # Test that the binomial schedule gives the same derivatives as
+        # applying every step on the full graph.
+        step = lambda x, v: (x + 0.1 * v, v - 0.1 * AD.sin(x))
+        def integrate(x, v, steps):
+            for _ in range(steps):
+                x, v = step(x, v)
+            return x
+
+        for steps in [0, 1, 2, 7, 50, 200]:
+            f_x, f_prime_x = ReverseMode(lambda x, v: integrate(x, v, steps) * 1, ["x", "v"]).get_results([0.3, 0.1])
+            for snapshots in [1, 2, 5]:
+                loop = ReverseMode.checkpoint_loop(step, steps, snapshots)
+                g_x, g_prime_x = ReverseMode(lambda x, v: loop(x, v)[0] * 1, ["x", "v"]).get_results([0.3, 0.1])
+                assert np.isclose(f_x, g_x)
+                assert np.allclose(f_prime_x, g_prime_x)
+
+        # a single state
+        loop = ReverseMode.checkpoint_loop(lambda x: AD.cos(x), 30, 3)
+        f = lambda x: AD.cos(x)
+        for _ in range(29):
+            f = (lambda g: lambda x: AD.cos(g(x)))(f)
+        assert np.allclose(ReverseMode(loop, ["x"]).get_results([1])[1], ReverseMode(f, ["x"]).get_results([1])[1])
+
+        with pytest.raises(ValueError):
+            ReverseMode.checkpoint_loop(step, -1)
+        with pytest.raises(ValueError):
+            ReverseMode.checkpoint_loop(step, 10, 0)
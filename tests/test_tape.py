@@ -0,0 +1,70 @@
+# File       : test_tape.py
+# Description: Test cases for testing the array-backed tape used by
+#              reverse mode
+
+import pytest
+import numpy as np
+
+# import names to test
+from autodiff.ad import AD
+from autodiff.reversemode import ReverseMode
+from autodiff.tape import Tape, TapeNode
+
+class TestTape():
+    """Test class for the tape"""
+
+    def test_record(self):
+        # Test that operations are recorded on the tape arrays.
+        tape = Tape()
+        a = tape.variable(2)
+        b = tape.variable(3)
+        c = a * b
+
+        assert isinstance(c, TapeNode)
+        assert len(tape) == 3
+        assert c.val == 6
+        assert c.index == 2
+        assert np.all(tape.parents[2] == [a.index, b.index])
+        assert np.all(tape.partials[2] == [3, 2])
+
+        # constants do not create parents
+        d = 2 * a
+        assert np.all(tape.parents[d.index] == [a.index, -1])
+
+    def test_grow(self):
+        # Test that the tape grows past its initial capacity.
+        tape = Tape(capacity=2)
+        a = tape.variable(1)
+        z = a
+        for _ in range(100):
+            z = z + a
+        assert len(tape) == 101
+        assert z.val == 101
+        assert tape.get_gradients(z)[a.index] == 101
+
+    def test_get_gradients(self):
+        # Test that the backward sweep matches the node based implementation.
+        tape = Tape()
+        x = tape.variable(0.5)
+        y = tape.variable(2.0)
+        z = AD.sin(x * y) + AD.exp(x) / y - y ** 2
+        adjoints = tape.get_gradients(z)
+        assert adjoints[x.index] == pytest.approx(y.val * np.cos(1) + np.exp(0.5) / 2)
+        assert adjoints[y.index] == pytest.approx(x.val * np.cos(1) - np.exp(0.5) / 4 - 4)
+
+        # nodes from another tape are rejected
+        with pytest.raises(TypeError):
+            Tape().get_gradients(z)
+
+    def test_reverse_mode(self):
+        # Test that reverse mode gives the same results with and without a tape.
+        f1 = lambda x: 2 * AD.sin(x) + 10
+        f4 = lambda x, y: 5 ** AD.cos(y) + x
+        f5 = lambda x, y: AD.arctan(x) + 10 * y
+
+        for f, x in [(f1, [1]), (f4, [1, 2]), ([f1, f4, f5], [1, 2])]:
+            inputs = ["x", "y"][:len(x)]
+            f_x, f_prime_x = ReverseMode(f, inputs).get_results(x)
+            tape_f_x, tape_f_prime_x = ReverseMode(f, inputs, tape=True).get_results(x)
+            assert np.allclose(np.array(f_x, dtype=float), np.array(tape_f_x, dtype=float))
+            assert np.allclose(np.array(list(f_prime_x), dtype=float), np.array(list(tape_f_prime_x), dtype=float))
@@ -0,0 +1,168 @@
+# File       : test_taylor.py
+# Description: Test cases for testing the higher order derivatives of Taylor
+#              polynomials through elementary operations and functions
+
+import pytest
+import numpy as np
+from math import factorial
+
+# import names to test
+from autodiff.ad import AD
+from autodiff.dual import Dual
+from autodiff.forwardmode import ForwardMode
+from autodiff.taylor import Taylor
+
+class TestTaylor():
+    """Test class for Taylor polynomials"""
+
+    def test_init(self):
+        # Test that Taylor polynomials are initialized correctly.
+        t = Taylor(2, 3)
+        assert np.all(t.coefficients == [2, 1, 0, 0])
+        assert t.real == 2
+        assert t.order == 3
+        assert not hasattr(t, "__dict__")
+
+        t = Taylor(np.array([1.0, 2.0]), 2, 0.5)
+        assert t.coefficients.shape == (3, 2)
+        assert np.all(t.coefficients[1] == 0.5)
+
+        assert Taylor(1, 0).coefficients.shape == (1,)
+
+        with pytest.raises(TypeError):
+            Taylor(1, 1.5)
+        with pytest.raises(ValueError):
+            Taylor(1, -1)
+
+    def test_arithmetic(self):
+        # Test the derivatives of polynomials and rational functions.
+        x = Taylor(2, 5)
+        assert np.allclose((x ** 3).derivatives(), [8, 12, 12, 6, 0, 0])
+        assert np.allclose((x * x * x).derivatives(), [8, 12, 12, 6, 0, 0])
+        assert np.allclose((3 * x - 1 + x * 2).derivatives(), [9, 5, 0, 0, 0, 0])
+        assert np.allclose((1 - x).derivatives(), [-1, -1, 0, 0, 0, 0])
+        assert np.allclose((-x + 5).derivatives(), [3, -1, 0, 0, 0, 0])
+        assert np.allclose((x / 2).derivatives(), [1, 0.5, 0, 0, 0, 0])
+
+        # d^j/dx^j 1/x = (-1)^j j! / x^(j+1)
+        expected = [(-1) ** j * factorial(j) / 2 ** (j + 1) for j in range(6)]
+        assert np.allclose((1 / x).derivatives(), expected)
+        assert np.allclose((x ** -1).derivatives(), expected)
+        assert np.allclose((x / (x * x)).derivatives(), expected)
+
+        # integer powers are defined at 0
+        assert np.allclose((Taylor(0, 3) ** 2).derivatives(), [0, 0, 2, 0])
+
+        # a^x and x^x
+        assert np.allclose((2 ** Taylor(1, 3)).derivatives(), 2 * np.log(2) ** np.arange(4))
+        y = Taylor(1, 2)
+        assert np.allclose((y ** y).derivatives(), [1, 1, 2])
+
+        # truncation to the lower order
+        assert (Taylor(1, 2) + Taylor(1, 4)).order == 2
+        assert (Taylor(1, 2) * Taylor(1, 4)).order == 2
+
+        for other in ["1", None, [1]]:
+            with pytest.raises(TypeError):
+                x + other
+            with pytest.raises(TypeError):
+                x - other
+            with pytest.raises(TypeError):
+                x * other
+            with pytest.raises(TypeError):
+                x / other
+            with pytest.raises(TypeError):
+                x ** other
+        with pytest.raises(TypeError):
+            "1" / x
+        with pytest.raises(TypeError):
+            "1" ** x
+
+    def test_comparison(self):
+        # Test that Taylor polynomials are compared by their real parts.
+        a = Taylor(1, 2)
+        b = Taylor(2, 2)
+        assert a < b and a <= b and b > a and b >= a
+        assert a < 2 and a <= 1 and a > 0 and a >= 1
+
+    def test_first_order(self):
+        # Test that polynomials of order 1 agree with dual numbers.
+        functions = [AD.sqrt, AD.exp, lambda x: AD.log(x, 2), AD.standard_logistic, AD.sin, AD.cos, AD.tan,
+                     AD.arcsin, AD.arccos, AD.arctan, AD.sinh, AD.cosh, AD.tanh, lambda x: x ** 1.5, lambda x: 3 ** x]
+        for f in functions:
+            d = f(Dual(0.4, 1))
+            t = f(Taylor(0.4, 1))
+            assert np.allclose(t.derivatives(), [d.real, d.dual])
+
+    def test_higher_order(self):
+        # Test higher order derivatives against closed forms and identities.
+        x = Taylor(0.4, 8)
+        j = np.arange(9)
+
+        assert np.allclose(AD.exp(x).derivatives(), np.exp(0.4))
+        assert np.allclose(AD.sin(x).derivatives(), np.sin(0.4 + j * np.pi / 2))
+        assert np.allclose(AD.cos(x).derivatives(), np.cos(0.4 + j * np.pi / 2))
+        assert np.allclose(AD.sinh(x).derivatives()[::2], np.sinh(0.4))
+        assert np.allclose(AD.cosh(x).derivatives()[::2], np.cosh(0.4))
+
+        # d^j/dx^j log(x) = (-1)^(j-1) (j-1)! / x^j
+        expected = [np.log(0.4)] + [(-1) ** (k - 1) * factorial(k - 1) / 0.4 ** k for k in range(1, 9)]
+        assert np.allclose(AD.log(x, np.e).derivatives(), expected)
+
+        # functions composed with their inverses are the identity
+        identity = [0.4, 1, 0, 0, 0, 0, 0, 0, 0]
+        assert np.allclose(AD.sin(AD.arcsin(x)).derivatives(), identity)
+        assert np.allclose(AD.cos(AD.arccos(x)).derivatives(), identity)
+        assert np.allclose(AD.tan(AD.arctan(x)).derivatives(), identity)
+        assert np.allclose(AD.exp(AD.log(x, np.e)).derivatives(), identity)
+        assert np.allclose((AD.sqrt(x) * AD.sqrt(x)).derivatives(), identity)
+        assert np.allclose(AD.tanh(x).derivatives(), (AD.sinh(x) / AD.cosh(x)).derivatives())
+        assert np.allclose((AD.standard_logistic(x) + AD.standard_logistic(-x)).derivatives(), [1, 0, 0, 0, 0, 0, 0, 0, 0])
+
+    def test_batch(self):
+        # Test that polynomials holding arrays differentiate every point at once.
+        x = Taylor(np.array([0.2, 0.4]), 4)
+        batch = AD.sin(x) * AD.exp(x)
+        for i, x0 in enumerate([0.2, 0.4]):
+            assert np.allclose(batch.derivatives()[:, i], (AD.sin(Taylor(x0, 4)) * AD.exp(Taylor(x0, 4))).derivatives())
+
+    def test_domain(self):
+        # Test that the elementary functions check their domain.
+        with pytest.raises(ValueError):
+            AD.sqrt(Taylor(-1, 2))
+        with pytest.raises(ValueError):
+            AD.log(Taylor(0, 2), 2)
+        with pytest.raises(ValueError):
+            AD.log(Taylor(1, 2), -2)
+        with pytest.raises(TypeError):
+            AD.log(Taylor(1, 2), "2")
+        with pytest.raises(ValueError):
+            AD.arcsin(Taylor(1, 2))
+        with pytest.raises(ValueError):
+            AD.arccos(Taylor(np.array([0, -1]), 2))
+
+    def test_get_derivatives(self):
+        # Test the derivatives of the functions of a forward mode class.
+        fm = ForwardMode(lambda x: AD.exp(2 * x), ["x"])
+        assert np.allclose(fm.get_derivatives([0.5], 6), np.exp(1) * 2.0 ** np.arange(7))
+
+        # multiple inputs along a direction
+        f1 = lambda x, y: x * y ** 2
+        f2 = lambda y: 2
+        fm = ForwardMode([f1, f2], ["x", "y"])
+        # along (1, 2): (1 + t)(1 + 2t)^2 = 1 + 5t + 8t^2 + 4t^3
+        derivatives = fm.get_derivatives([1, 1], 4, [1, 2])
+        assert derivatives.shape == (2, 5)
+        assert np.allclose(derivatives[0], [1, 5, 16, 24, 0])
+        assert np.allclose(derivatives[1], [2, 0, 0, 0, 0])
+
+        with pytest.raises(TypeError):
+            fm.get_derivatives(1, 2, [1, 2])
+        with pytest.raises(ValueError):
+            fm.get_derivatives([1], 2, [1, 2])
+        with pytest.raises(ValueError):
+            fm.get_derivatives([1, 1], 2)
+        with pytest.raises(ValueError):
+            fm.get_derivatives([1, 1], 2, [1])
+        with pytest.raises(ValueError):
+            fm.get_derivatives([1, 1], -1, [1, 2])
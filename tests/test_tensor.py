@@ -0,0 +1,115 @@
+# File       : test_tensor.py
+# Description: Test cases for testing the vector-Jacobian products of array-valued
+#              tensor nodes through broadcasting, sums and dot products
+
+import pytest
+import numpy as np
+
+# import names to test
+from autodiff.ad import AD
+from autodiff.node import Node
+from autodiff.reversemode import ReverseMode
+from autodiff.tensor import Tensor
+
+def numerical_gradient(f, x, h=1e-6):
+    # central differences of a scalar function of one array
+    g = np.zeros_like(x)
+    for i in np.ndindex(x.shape):
+        e = np.zeros_like(x)
+        e[i] = h
+        g[i] = (f(x + e) - f(x - e)) / (2 * h)
+    return g
+
+class TestTensor():
+    """Test class for tensor nodes"""
+
+    def test_init(self):
+        # Test that tensors hold arrays and stay tensors through operations.
+        t = Tensor(np.ones((2, 3)))
+        assert t.shape == (2, 3)
+        assert not hasattr(t, "__dict__")
+
+        for z in [t + 1, 1 - t, np.ones(3) * t, np.ones(3) / t, 2 ** t, t @ np.ones(3), np.ones((4, 2)) @ t,
+                  Node(2.0) - t, Node(2.0) / t, Node(2.0) ** t, AD.sin(t), t.sum(), t[0]]:
+            assert isinstance(z, Tensor)
+
+        with pytest.raises(TypeError):
+            t + "1"
+        with pytest.raises(TypeError):
+            t.dot([1, 2, 3])
+        with pytest.raises(ValueError):
+            t.dot(np.ones((3, 1, 1)))
+        with pytest.raises(ValueError):
+            AD.sqrt(Tensor(np.array([1.0, -1.0])))
+
+    def test_elementwise(self):
+        # Test the gradients of elementwise functions and broadcasting.
+        a = Tensor(np.array([[0.1], [0.2], [0.3]]))
+        b = Tensor(np.array([0.4, 0.5, 0.6, 0.7]))
+        c = Node(1.5)
+        z = (AD.sin(a * b) + AD.exp(b / c) - a ** 2).sum()
+        gradients = ReverseMode.get_gradients(z)
+
+        f = lambda a, b, c: np.sum(np.sin(a * b) + np.exp(b / c) - a ** 2)
+        assert np.isclose(z.val, f(a.val, b.val, c.val))
+        assert gradients[a].shape == (3, 1)
+        assert gradients[b].shape == (4,)
+        assert np.allclose(gradients[a], numerical_gradient(lambda x: f(x, b.val, c.val), a.val))
+        assert np.allclose(gradients[b], numerical_gradient(lambda x: f(a.val, x, c.val), b.val))
+        assert np.isclose(gradients[c], numerical_gradient(lambda x: f(a.val, b.val, x), np.array(c.val)))
+
+    def test_sum_dot_getitem(self):
+        # Test the gradients of reductions, dot products and selections.
+        rng = np.random.default_rng(0)
+        A = rng.normal(size = (3, 4))
+        B = rng.normal(size = (4, 2))
+        u = rng.normal(size = 4)
+        v = rng.normal(size = 3)
+
+        cases = [
+            (lambda A: (A.dot(u) * v).sum(), A),
+            (lambda A: (A @ B).sum(axis = 0)[1], A),
+            (lambda u: (v @ A @ u) ** 2, u),
+            (lambda u: (u.dot(u) + u @ B).sum(), u),
+            (lambda A: (A.sum(axis = 1) * v).sum() + A[1, 2] * A[[0, 0], 1].sum(), A),
+        ]
+        for f, x in cases:
+            t = Tensor(x)
+            z = f(t)
+            g = ReverseMode.get_gradients(z)[t]
+            assert g.shape == x.shape
+            assert np.allclose(g, numerical_gradient(lambda y: f(Tensor(y)).val, x))
+
+    def test_get_results_tensor(self):
+        # Test the gradients of a vector model with respect to array inputs.
+        rng = np.random.default_rng(1)
+        X = rng.normal(size = (20, 5))
+        y = rng.normal(size = 20)
+        w = rng.normal(size = 5)
+
+        loss = lambda w, b: ((X @ w + b - y) ** 2).sum()
+        rm = ReverseMode(loss, ["w", "b"])
+        val, (gw, gb) = rm.get_results_tensor([w, 0.5])
+        r = X @ w + 0.5 - y
+        assert np.isclose(val, np.sum(r ** 2))
+        assert np.allclose(gw, 2 * X.T @ r)
+        assert np.isclose(gb, 2 * np.sum(r))
+
+        # multiple functions, padded with zeros for unused inputs
+        f1 = lambda w: AD.tanh(w).sum()
+        f2 = lambda w, b: (w * b).sum()
+        f3 = lambda b: b * 3
+        rm = ReverseMode([f1, f2, f3], ["w", "b"])
+        vals, gradients = rm.get_results_tensor([w, 2.0])
+        assert np.isclose(vals[0], np.sum(np.tanh(w)))
+        assert np.allclose(gradients[0][0], 1 - np.tanh(w) ** 2)
+        assert gradients[0][1] == 0
+        assert np.allclose(gradients[1][0], 2.0)
+        assert np.isclose(gradients[1][1], np.sum(w))
+        assert np.all(gradients[2][0] == 0) and gradients[2][0].shape == (5,)
+        assert gradients[2][1] == 3
+
+        with pytest.raises(TypeError):
+            rm.get_results_tensor(w)
+        with pytest.raises(ValueError):
+            rm.get_results_tensor([w])
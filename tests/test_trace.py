@@ -0,0 +1,165 @@
+# File       : test_trace.py
+# Description: Test cases for testing the tracing compiler
+
+import functools
+
+import pytest
+import numpy as np
+
+# import names to test
+from autodiff.ad import AD
+from autodiff.reversemode import ReverseMode
+from autodiff.diskcache import KernelCache, kernel_key
+from autodiff.trace import trace, Tracer, Graph, _cache
+
+class TestTrace():
+    """Test class for the tracing compiler"""
+
+    def test_record(self):
+        # Test that operations are recorded on the graph in execution order.
+        graph = Graph()
+        x = graph.record("input", (0,))
+        y = 2 - AD.sin(x) * x
+
+        assert isinstance(y, Tracer)
+        assert [op for op, _ in graph.ops] == ["input", "sin", "mul", "sub"]
+        assert graph.ops[3][1] == (2, graph.ops[3][1][1])
+
+        # unsupported operands
+        with pytest.raises(TypeError):
+            x + "1"
+        with pytest.raises(TypeError):
+            AD.log(x, "2")
+        with pytest.raises(ValueError):
+            AD.log(x, 0)
+
+    def test_compiled_results(self):
+        # Test that the compiled function matches reverse mode.
+        f1 = lambda x, y: AD.sin(x) * y + AD.sqrt(AD.exp(y)) / x - 3 ** x + AD.log(y, 2)
+        f2 = lambda x, y: AD.standard_logistic(x * y) + AD.tanh(x) - (2 - x) ** 2 + x ** y
+        f3 = lambda y: AD.arcsin(y / 10) + AD.arccos(y / 10) * AD.arctan(y) / AD.cos(y)
+        f4 = lambda x: AD.sinh(x) - AD.cosh(x) + AD.tan(x) - -x
+        x = [0.7, 1.3]
+
+        for f in [f1, f2, [f1, f2, f3], [f3, f4]]:
+            values, gradients = trace(f, ["x", "y"])(x)
+            expected_values, expected_gradients = ReverseMode(f, ["x", "y"]).get_results(x)
+            assert np.allclose(values, np.array(expected_values, dtype = float))
+            assert np.allclose(gradients, np.array(list(expected_gradients), dtype = float))
+
+        # functions returning an input or a constant
+        values, gradients = trace([lambda x: x, lambda y: 5], ["x", "y"])(x)
+        assert np.all(values == [0.7, 5])
+        assert np.all(gradients == [[1, 0], [0, 0]])
+
+    def test_compiled_code(self):
+        # Test that the compiled function is straight-line NumPy code and is cached.
+        f = lambda x, y: x * y + AD.exp(x)
+        compiled = trace(f, ["x", "y"])
+        assert "Node" not in compiled.source and "Dual" not in compiled.source
+        assert trace(f, ["x", "y"]) is compiled
+        assert trace(f, ["y", "x"]) is not compiled
+
+        # constants read by the function are part of the code, so changing them traces it again
+        a = 1.0
+        h = lambda x: a * AD.sin(x)
+        assert np.isclose(trace(h, ["x"])([0.5])[0], np.sin(0.5))
+        a = 2.0
+        assert np.isclose(trace(h, ["x"])([0.5])[0], 2 * np.sin(0.5))
+
+        # the function is traced once and not run again
+        calls = []
+        def g(x):
+            calls.append(1)
+            return x * x
+        compiled = trace(g, ["x"])
+        compiled([1])
+        compiled([2])
+        assert len(calls) == 1
+
+    def test_incorrect_inputs(self):
+        # Test that the compiled function raises errors for incorrect inputs.
+        f = lambda x, y: x * y
+        compiled = trace(f, ["x", "y"])
+
+        with pytest.raises(TypeError):
+            compiled(1)
+        with pytest.raises(ValueError):
+            compiled([1])
+        with pytest.raises(ValueError):
+            compiled([[1, 2]])
+        with pytest.raises(ValueError):
+            trace(f, ["x", "z"])
+        with pytest.raises(TypeError):
+            trace(0, ["x"])
+
+    def test_disk_cache(self, tmp_path):
+        # Test that compiled functions are stored on disk and loaded without tracing.
+        scale = 3
+        f = lambda x, y: AD.sin(x) * y * scale
+        compiled = trace(f, ["x", "y"], cache = str(tmp_path))
+        assert compiled.graph is not None
+        assert len(list(tmp_path.glob("kernel_*"))) == 1
+
+        # a new process only finds the kernel on disk
+        _cache.clear()
+        loaded = trace(f, ["x", "y"], cache = KernelCache(str(tmp_path)))
+        assert loaded.graph is None and loaded.source == compiled.source
+        val, gradients = loaded([0.5, 2])
+        assert np.isclose(val, np.sin(0.5) * 6)
+        assert np.allclose(gradients, [np.cos(0.5) * 6, np.sin(0.5) * 3])
+
+        # the key depends on the code, the values captured by the function and the inputs
+        key = kernel_key(f, ["x", "y"])
+        assert kernel_key(f, ["x", "y"]) == key
+        assert kernel_key(f, ["y", "x"]) != key
+        assert kernel_key(lambda x, y: AD.cos(x) * y * scale, ["x", "y"]) != key
+        scale = 4
+        assert kernel_key(f, ["x", "y"]) != key
+        scale = 3
+
+        # the argument names decide which inputs every function receives
+        product = lambda x, y: x * y
+        f1 = [lambda x: AD.sin(x), product]
+        f2 = [lambda y: AD.sin(y), product]
+        assert kernel_key(f1, ["x", "y"]) != kernel_key(f2, ["x", "y"])
+        assert kernel_key(lambda x, *, y=1: x * y, ["x"]) != kernel_key(lambda x, *, y=2: x * y, ["x"])
+        trace(f1, ["x", "y"], cache = str(tmp_path / "arguments"))
+        vals, gradients = trace(f2, ["x", "y"], cache = str(tmp_path / "arguments"))([0.5, 1.0])
+        assert np.allclose(vals, [np.sin(1.0), 0.5])
+        assert np.allclose(gradients, [[0, np.cos(1.0)], [1.0, 0.5]])
+
+        # arrays are hashed by their whole content, whose repr is truncated
+        W = np.ones(5000)
+        g = lambda x: x * W[2500]
+        g_key = kernel_key(g, ["x"])
+        W[2500] = 7
+        assert kernel_key(g, ["x"]) != g_key
+
+        # values without a stable content are not cached
+        class Scale:
+            factor = 2
+        scales = [Scale(), pytest, functools.partial(max, 1)]
+        for value in scales:
+            assert kernel_key(lambda x: x * value.factor, ["x"]) is None
+        assert kernel_key(lambda x: AD.sin(x) * np.pi, ["x"]) is not None
+        _cache.clear()
+        h = lambda x: x * scales[0].factor
+        directory = tmp_path / "uncached"
+        assert trace(h, ["x"], cache = str(directory))([1])[0] == 2
+        assert list(directory.glob("kernel_*")) == []
+
+        # kernels that cannot be compiled are traced again
+        _cache.clear()
+        (tmp_path / f"kernel_{key}").write_bytes(b"broken")
+        assert trace(f, ["x", "y"], cache = str(tmp_path)).graph is not None
+        assert (tmp_path / f"kernel_{key}").read_bytes() != b"broken"
+
+        # the least recently used kernels are evicted
+        cache = KernelCache(str(tmp_path / "small"), max_bytes = 10)
+        cache.put("a", b"0123456789")
+        assert cache.get("a") == b"0123456789"
+        cache.put("b", b"0123456789")
+        assert cache.get("a") is None and cache.get("b") == b"0123456789"
+        with pytest.raises(ValueError):
+            KernelCache(str(tmp_path), max_bytes = -1)